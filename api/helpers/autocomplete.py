@@ -0,0 +1,142 @@
+"""In-memory name index of ``GET /cards/autocomplete``.
+
+The oracle names are normalized like ``name_search`` (``unidecode`` then
+lowercase) and kept sorted in the memory of each API process, once per
+name with its most popular oracle. A prefix is looked up by bisection in
+the sorted names, the matches are ranked by EDHREC rank, cards without rank
+last. The suggestions of the prefixes of up to ``PRECOMPUTED_PREFIX``
+characters, which match thousands of names, are ranked when the index is
+built.
+
+The index is rebuilt when the data version changes, see
+``api.helpers.cache.DataSnapshot``.
+"""
+
+import heapq
+from bisect import bisect_left
+from typing import Annotated, Iterable
+
+from fastapi import Depends
+from unidecode import unidecode
+
+from api.helpers.cache import DataSnapshot
+from common.constants import API_AUTOCOMPLETE_MAX
+
+PRECOMPUTED_PREFIX = 2
+# Sorts after any character of the normalized names
+PREFIX_END = "\uffff"
+
+NAME_PROJECTION = {
+    "_id": 0,
+    "oracle_id": 1,
+    "name": 1,
+    "name_search": 1,
+    "edhrec_rank": 1,
+}
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a name like the ``name_search`` field of the ingest."""
+    return unidecode(name).lower()
+
+
+def rank_key(entry: tuple) -> tuple:
+    """Sort key of an index entry, most played first."""
+    name_search, name, oracle_id, edhrec_rank = entry
+    return (edhrec_rank is None, edhrec_rank or 0, name_search)
+
+
+class NameIndex:
+    """Sorted normalized names of the oracle cards."""
+
+    def __init__(
+        self, oracles: Iterable[dict], max_results: int = API_AUTOCOMPLETE_MAX
+    ):
+        """
+        Args:
+            oracles: oracle_cards documents of ``NAME_PROJECTION``
+            max_results: Largest number of suggestions of a lookup
+        """
+        self.max_results = max_results
+
+        best = {}
+        for oracle in oracles:
+            name_search = oracle.get("name_search") or normalize_name(oracle["name"])
+            entry = (
+                name_search,
+                oracle["name"],
+                oracle["oracle_id"],
+                oracle.get("edhrec_rank"),
+            )
+            if name_search not in best or rank_key(entry) < rank_key(best[name_search]):
+                best[name_search] = entry
+
+        self.entries = sorted(best.values())
+        self.keys = [entry[0] for entry in self.entries]
+
+        self.top = {}
+        for entry in sorted(self.entries, key=rank_key):
+            for length in range(1, PRECOMPUTED_PREFIX + 1):
+                if len(entry[0]) < length:
+                    break
+                suggestions = self.top.setdefault(entry[0][:length], [])
+                if len(suggestions) < max_results:
+                    suggestions.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def complete(self, prefix: str, limit: int) -> list[dict]:
+        """Most played cards whose name starts with ``prefix``.
+
+        Args:
+            prefix: Start of the name, normalized here
+            limit: Number of suggestions, at most ``max_results``
+
+        Returns:
+            The ``name``, ``oracle_id`` and ``edhrec_rank`` of each card
+        """
+        prefix = normalize_name(prefix).lstrip()
+        limit = min(limit, self.max_results)
+        if not prefix:
+            return []
+
+        if len(prefix) <= PRECOMPUTED_PREFIX:
+            matches = self.top.get(prefix, [])[:limit]
+        else:
+            start = bisect_left(self.keys, prefix)
+            end = bisect_left(self.keys, prefix + PREFIX_END, start)
+            matches = heapq.nsmallest(limit, self.entries[start:end], key=rank_key)
+
+        return [
+            {"name": name, "oracle_id": oracle_id, "edhrec_rank": edhrec_rank}
+            for _, name, oracle_id, edhrec_rank in matches
+        ]
+
+
+async def load_name_index(oracle_collection) -> NameIndex:
+    """Build the name index from the oracle cards, art series excluded.
+
+    Args:
+        oracle_collection: Async MongoDB oracle_cards collection
+    """
+    return NameIndex(
+        await oracle_collection.find(
+            {"layout": {"$nin": ["art_series"]}}, NAME_PROJECTION
+        ).to_list()
+    )
+
+
+_names = DataSnapshot("autocomplete")
+
+
+def get_name_index() -> DataSnapshot:
+    """Get the name index of this process.
+
+    Returns:
+        DataSnapshot: Shared snapshot of a NameIndex, built on first use.
+    """
+    return _names
+
+
+NameIndexDep = Annotated[DataSnapshot, Depends(get_name_index)]
@@ -0,0 +1,278 @@
+"""Read-through Redis cache of the card responses.
+
+Responses are cached as JSON under ``api:{version}:{route}:{digest}`` keys,
+where the digest covers the normalized parameters of the request and the
+version is the data version bumped by the ingest (``tasks.data_version``)
+once it has written its changes. A new version makes every cached response
+stale at once, older entries expire with their TTL. Responses above
+``API_CACHE_MAX_ENTRY_KB`` are not cached, the memory of the whole cache is
+capped by the ``maxmemory`` policy of the ``cache`` service. The policy is
+``volatile-lru``: only entries with a TTL, every cached response, are
+evicted, never the data version.
+
+Redis is optional: when it cannot be reached the responses are computed as
+without cache, and Redis is not tried again for ``API_CACHE_RETRY_INTERVAL``
+seconds so requests do not wait on its timeouts.
+
+Hits and misses are counted per route and process, see ``/cache/stats``.
+
+Small derived data served on every page load (the set list, the name index
+of the autocomplete) is rather kept in the memory of each process as a
+``DataSnapshot``, reloaded when the data version changes.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from typing import Annotated, Any, Awaitable, Callable, Optional
+
+import redis.asyncio as redis
+from fastapi import Depends
+from redis.exceptions import RedisError
+
+from api.helpers.serialization import encode_json
+from common.constants import (
+    API_CACHE,
+    API_CACHE_MAX_ENTRY_KB,
+    API_CACHE_RETRY_INTERVAL,
+    API_CACHE_TTL,
+    API_CACHE_VERSION_REFRESH,
+    API_SNAPSHOT_REFRESH,
+    DATA_VERSION_KEY,
+    REDIS_URL,
+)
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "api"
+
+
+def cache_params(**params) -> dict:
+    """Normalize request parameters into a cache key source.
+
+    Lists are sorted, the queries treat them as sets, and None values are
+    dropped.
+    """
+    return {
+        name: sorted(value) if isinstance(value, list) else value
+        for name, value in params.items()
+        if value is not None
+    }
+
+
+class ResponseCache:
+    """Read-through cache of JSON responses in Redis."""
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis],
+        ttl: int = API_CACHE_TTL,
+        max_entry_bytes: int = API_CACHE_MAX_ENTRY_KB * 1024,
+        retry_interval: float = API_CACHE_RETRY_INTERVAL,
+        version_refresh: float = API_CACHE_VERSION_REFRESH,
+    ):
+        """
+        Args:
+            client: Async Redis client, None disables the cache
+            ttl: Seconds a response is kept
+            max_entry_bytes: Size above which a response is not cached
+            retry_interval: Seconds Redis is skipped after a failure
+            version_refresh: Seconds the data version is reused
+        """
+        self.client = client
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self.retry_interval = retry_interval
+        self.version_refresh = version_refresh
+
+        self.stats = defaultdict(Counter)
+        self._version = None
+        self._version_read_at = float("-inf")
+        self._down_until = float("-inf")
+
+    @property
+    def available(self) -> bool:
+        """Whether Redis is used, it is skipped for a while after a failure."""
+        return self.client is not None and time.monotonic() >= self._down_until
+
+    def _failed(self, route: str, error: Exception) -> None:
+        self.stats[route]["errors"] += 1
+        self._down_until = time.monotonic() + self.retry_interval
+        logger.warning(f"Response cache disabled for {self.retry_interval}s: {error}")
+
+    async def data_version(self) -> str:
+        """Current data version, read from Redis at most every few seconds."""
+        now = time.monotonic()
+        if now - self._version_read_at >= self.version_refresh:
+            version = await self.client.get(DATA_VERSION_KEY)
+            self._version = version.decode() if version else "0"
+            self._version_read_at = now
+        return self._version
+
+    async def current_data_version(self, route: str) -> Optional[str]:
+        """Data version, None while Redis is not available.
+
+        Args:
+            route: Name of the route the failures are counted for
+        """
+        if not self.available:
+            self.stats[route]["bypassed"] += 1
+            return None
+        try:
+            return await self.data_version()
+        except (RedisError, OSError) as error:
+            self._failed(route, error)
+            return None
+
+    async def get_or_set_json(
+        self,
+        route: str,
+        params: dict,
+        compute: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], bytes] = encode_json,
+    ) -> bytes:
+        """Encoded response of ``route`` for ``params``, computed on a miss.
+
+        A hit is returned as stored, without decoding it.
+
+        Args:
+            route: Name of the route, part of the key and of the stats
+            params: Normalized parameters, see ``cache_params``
+            compute: Coroutine function computing the response
+            encode: Function encoding the computed response to JSON
+
+        Returns:
+            The JSON body of the response
+        """
+        if not self.available:
+            self.stats[route]["bypassed"] += 1
+            return encode(await compute())
+
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True).encode(), usedforsecurity=False
+        ).hexdigest()
+        try:
+            key = f"{KEY_PREFIX}:{await self.data_version()}:{route}:{digest}"
+            cached = await self.client.get(key)
+        except (RedisError, OSError) as error:
+            self._failed(route, error)
+            return encode(await compute())
+
+        if cached is not None:
+            self.stats[route]["hits"] += 1
+            return cached
+
+        self.stats[route]["misses"] += 1
+        encoded = encode(await compute())
+        if len(encoded) > self.max_entry_bytes:
+            self.stats[route]["oversized"] += 1
+            return encoded
+
+        try:
+            await self.client.set(key, encoded, ex=self.ttl)
+        except (RedisError, OSError) as error:
+            self._failed(route, error)
+        return encoded
+
+    def summary(self) -> dict:
+        """Hit and miss counts per route and in total."""
+        total = Counter()
+        for counts in self.stats.values():
+            total.update(counts)
+        lookups = total["hits"] + total["misses"]
+        return {
+            "enabled": self.client is not None,
+            "available": self.available,
+            "data_version": self._version,
+            "hits": total["hits"],
+            "misses": total["misses"],
+            "hit_ratio": total["hits"] / lookups if lookups else None,
+            "routes": {route: dict(counts) for route, counts in self.stats.items()},
+        }
+
+
+class DataSnapshot:
+    """Value loaded from MongoDB, kept in memory until the data changes."""
+
+    def __init__(self, route: str, refresh: float = API_SNAPSHOT_REFRESH):
+        """
+        Args:
+            route: Name of the route the data version reads are counted for
+            refresh: Seconds the value is kept while the data version is
+                unknown
+        """
+        self.route = route
+        self.refresh = refresh
+
+        self.value = None
+        self.version = None
+        self.loaded_at = float("-inf")
+        self.loads = 0
+
+    def is_stale(self, version: Optional[str]) -> bool:
+        """Whether the value must be reloaded at data ``version``."""
+        if self.loads == 0:
+            return True
+        if version is not None:
+            return version != self.version
+        return time.monotonic() - self.loaded_at >= self.refresh
+
+    async def get(self, cache: ResponseCache, load: Callable[[], Awaitable[Any]]):
+        """Value at the current data version, loaded if needed.
+
+        Args:
+            cache: Response cache reading the data version
+            load: Coroutine function loading the value
+        """
+        version = await cache.current_data_version(self.route)
+        if self.is_stale(version):
+            self.value = await load()
+            self.version = version
+            self.loaded_at = time.monotonic()
+            self.loads += 1
+            logger.info(f"Reloaded {self.route} at data version {version}")
+        return self.value
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def open_response_cache() -> ResponseCache:
+    """Create the shared response cache, called on application startup.
+
+    Creating the Redis client does not connect, a missing Redis is only
+    noticed, and bypassed, on the first request. Both connecting and reading
+    time out quickly so requests do not hang on an unreachable Redis.
+    """
+    global _cache
+    if _cache is None:
+        _cache = ResponseCache(
+            redis.Redis.from_url(
+                REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+            if API_CACHE
+            else None
+        )
+    return _cache
+
+
+async def close_response_cache() -> None:
+    """Close the Redis client of the shared cache, on application shutdown."""
+    global _cache
+    if _cache is not None and _cache.client is not None:
+        await _cache.client.aclose()
+    _cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the shared response cache.
+
+    Returns:
+        ResponseCache: Shared cache, opened on first use if needed.
+    """
+    return _cache if _cache is not None else open_response_cache()
+
+
+ResponseCacheDep = Annotated[ResponseCache, Depends(get_response_cache)]
@@ -0,0 +1,106 @@
+"""Card search on the Meilisearch ``cards`` index filled by the ingest.
+
+The index holds the oracle cards (see ``tasks.search_index``), so a hit has
+the same fields as an ``oracle_cards`` document and is shaped for the API by
+``api.helpers.cards_mongo.oracle_card``.
+"""
+
+import json
+from typing import Optional
+
+from api.helpers.cards_mongo import ORACLE_FIELDS
+from common.constants import MEILI_CARDS_INDEX
+
+ATTRIBUTES_TO_RETRIEVE = ["oracle_id", "printings", *ORACLE_FIELDS]
+
+
+def _quote(value: str) -> str:
+    return json.dumps(value)
+
+
+def _in(field: str, values: list[str]) -> str:
+    return f"{field} IN [{', '.join(_quote(value) for value in values)}]"
+
+
+def meili_filter(
+    lang: str,
+    sets: list[str],
+    colors: list[str],
+    color_operator: str,
+    cmc_min: Optional[int],
+    cmc_max: Optional[int],
+    types: list[str],
+    rarities: list[str],
+) -> list:
+    """Meilisearch filter equivalent to the MongoDB search conditions.
+
+    Returns:
+        Filter expressions combined with AND, nested lists are ORed
+    """
+    filters = [f"lang = {_quote(lang)}"]
+    if sets:
+        filters.append(_in("set_names", sets))
+
+    if colors:
+        if color_operator in ("and", "exactly"):
+            filters.extend(f"colors = {_quote(color)}" for color in colors)
+            if color_operator == "exactly":
+                filters.append(f"color_count = {len(colors)}")
+        else:
+            filters.append(_in("colors", colors))
+
+    if cmc_min is not None:
+        filters.append(f"cmc >= {cmc_min}")
+    if cmc_max is not None:
+        filters.append(f"cmc <= {cmc_max}")
+    if types:
+        # Filters on strings are case-insensitive
+        filters.append([f"types = {_quote(card_type)}" for card_type in types])
+    if rarities:
+        filters.append(_in("rarities", rarities))
+    return filters
+
+
+def search_oracle_cards(
+    client,
+    text: str,
+    filters: list,
+    cursor: Optional[str] = None,
+    page_count: int = 10,
+    index_name: str = MEILI_CARDS_INDEX,
+    attributes: list[str] = ATTRIBUTES_TO_RETRIEVE,
+) -> tuple[list[dict], Optional[str]]:
+    """One page of oracle cards matching ``text``.
+
+    Args:
+        client: Meilisearch client
+        text: Search query, typos are tolerated
+        filters: Filter built by ``meili_filter``
+        cursor: Offset of the page, returned by the previous page
+        page_count: Oracle cards per page
+        index_name: Name of the index
+        attributes: Attributes of the hits
+
+    Returns:
+        The oracle cards with their ``score`` and the cursor of the next
+        page, None on the last page
+    """
+    try:
+        offset = max(int(cursor), 0) if cursor else 0
+    except ValueError:
+        # Invalid cursor format, start from the first page
+        offset = 0
+
+    result = client.index(index_name).search(
+        text,
+        {
+            "filter": filters,
+            "offset": offset,
+            "limit": page_count + 1,
+            "attributesToRetrieve": attributes,
+            "showRankingScore": True,
+        },
+    )
+    hits = result["hits"]
+    page = [{**hit, "score": hit.get("_rankingScore")} for hit in hits[:page_count]]
+    return page, str(offset + page_count) if len(hits) > page_count else None
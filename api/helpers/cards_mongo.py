@@ -1,3 +1,6 @@
+# Printings flagged as deleted by a tombstone sync (tasks.sync) are hidden
+NOT_DELETED = {"deleted_at": {"$exists": False}}
+
 CARD_PROJECTION = {
     "_id": 0,
     "id": 1,
@@ -68,19 +71,75 @@ CARD_PROJECTION = {
     "imageXL": "$image_uris.png",
 }
 
-AGGREGATE_CARD = {
-    "_id": "$oracle_id",
-    "name": {"$first": "$name"},
-    "card_text": {"$first": "$oracle_text"},
-    "type_line": {"$first": "$type_line"},
-    "mana_cost": {"$first": "$mana_cost"},
-    "cmc": {"$first": "$cmc"},
-    "colors": {"$first": "$colors"},
-    "rarity": {"$first": "$rarity"},
-    "card_count": {"$sum": 1},
-    "cards": {"$addToSet": "$$ROOT"},
-    "edhrec_rank": {"$max": "$edhrec_rank"},
-    "penny_rank": {"$max": "$penny_rank"},
-    "thumbnail": {"$first": "$thumbnail"},
-    "faces_thumbnails": {"$first": "$faces_thumbnails"},
+# Fields of the oracle_cards documents returned by the API
+ORACLE_FIELDS = (
+    "name",
+    "card_text",
+    "type_line",
+    "mana_cost",
+    "cmc",
+    "colors",
+    "rarity",
+    "edhrec_rank",
+    "penny_rank",
+    "thumbnail",
+    "faces_thumbnails",
+)
+
+ORACLE_PROJECTION = {
+    "_id": 0,
+    "oracle_id": 1,
+    "printings": 1,
+    **{field: 1 for field in ORACLE_FIELDS},
+}
+
+
+# Oracle summaries of /cards/search, the printings are fetched on demand
+SUMMARY_PROJECTION = {
+    "_id": 0,
+    "oracle_id": 1,
+    "card_count": 1,
+    **{field: 1 for field in ORACLE_FIELDS},
 }
+
+
+def oracle_summary(oracle: dict) -> dict:
+    """Shape an oracle card for the API without its printings.
+
+    Args:
+        oracle: oracle_cards document projected with SUMMARY_PROJECTION, or
+            Meilisearch hit with its ``printings`` ids
+
+    Returns:
+        Oracle card keyed by ``_id`` (the oracle id) with its ``card_count``,
+        see ``/cards/oracle/{oracle_id}/printings`` for the printings
+    """
+    result = {
+        "_id": oracle["oracle_id"],
+        **{field: oracle.get(field) for field in ORACLE_FIELDS},
+        "card_count": oracle.get("card_count", len(oracle.get("printings", []))),
+    }
+    if "score" in oracle:
+        result["score"] = oracle["score"]
+    return result
+
+
+def oracle_card(oracle: dict, cards: list[dict]) -> dict:
+    """Shape an oracle_cards document and its printings for the API.
+
+    Args:
+        oracle: oracle_cards document projected with ORACLE_PROJECTION
+        cards: Printings returned with it, projected with CARD_PROJECTION
+
+    Returns:
+        Oracle card keyed by ``_id`` (the oracle id) with its ``cards``
+    """
+    result = {
+        "_id": oracle["oracle_id"],
+        **{field: oracle.get(field) for field in ORACLE_FIELDS},
+        "card_count": len(cards),
+        "cards": cards,
+    }
+    if "score" in oracle:
+        result["score"] = oracle["score"]
+    return result
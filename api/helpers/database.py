@@ -2,59 +2,158 @@
 
 This module provides dependency injection functions for MongoDB connections,
 enabling easy mocking in tests via app.dependency_overrides.
+
+A single ``AsyncMongoClient`` is shared by every request: it is opened by
+the application lifespan (see ``api.main``) and closed on shutdown. Its
+connection pool, timeouts and read preference come from
+``common.constants``. The routes are ``async def`` and await their queries
+on the event loop instead of holding a threadpool worker.
 """
 
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import Depends
-from pymongo import MongoClient
-from pymongo.collection import Collection
-from pymongo.database import Database
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
 
 from common.constants import (
     DATABASE,
+    DATABASE_CONNECT_TIMEOUT_MS,
     DATABASE_HOST,
+    DATABASE_MAX_IDLE_TIME_MS,
+    DATABASE_MAX_POOL_SIZE,
+    DATABASE_MIN_POOL_SIZE,
     DATABASE_PASSWORD,
     DATABASE_PORT,
+    DATABASE_READ_PREFERENCE,
+    DATABASE_SERVER_SELECTION_TIMEOUT_MS,
+    DATABASE_SOCKET_TIMEOUT_MS,
     DATABASE_USER,
 )
 
+_async_client: Optional[AsyncMongoClient] = None
+
+
+def create_async_mongo_client() -> AsyncMongoClient:
+    """Create an async MongoDB client with the configured pool and timeouts.
 
-def get_mongo_client() -> MongoClient:
-    """Get MongoDB client instance.
+    The client connects in the background, creating it does not block.
 
     Returns:
-        MongoClient: Configured MongoDB client connection.
+        AsyncMongoClient: Configured async MongoDB client connection.
     """
-    return MongoClient(
+    uri = (
         f"mongodb://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}"
     )
+    return AsyncMongoClient(
+        uri,
+        maxPoolSize=DATABASE_MAX_POOL_SIZE,
+        minPoolSize=DATABASE_MIN_POOL_SIZE,
+        maxIdleTimeMS=DATABASE_MAX_IDLE_TIME_MS,
+        connectTimeoutMS=DATABASE_CONNECT_TIMEOUT_MS,
+        serverSelectionTimeoutMS=DATABASE_SERVER_SELECTION_TIMEOUT_MS,
+        socketTimeoutMS=DATABASE_SOCKET_TIMEOUT_MS,
+        readPreference=DATABASE_READ_PREFERENCE,
+    )
+
+
+def open_async_mongo_client() -> AsyncMongoClient:
+    """Create the shared async MongoDB client, called on application startup.
+
+    Returns:
+        AsyncMongoClient: The shared client, the existing one if already open.
+    """
+    global _async_client
+    if _async_client is None:
+        _async_client = create_async_mongo_client()
+    return _async_client
+
+
+async def close_async_mongo_client() -> None:
+    """Close the shared async MongoDB client, called on application shutdown."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+def get_async_mongo_client() -> AsyncMongoClient:
+    """Get the shared async MongoDB client instance.
+
+    The client is opened on first use when the application lifespan did not
+    run, e.g. with a ``TestClient`` used outside a ``with`` block.
+
+    Returns:
+        AsyncMongoClient: Shared async MongoDB client connection.
+    """
+    return _async_client if _async_client is not None else open_async_mongo_client()
 
 
-def get_database(client: MongoClient = Depends(get_mongo_client)) -> Database:
-    """Get MongoDB database instance.
+def get_async_database(
+    client: AsyncMongoClient = Depends(get_async_mongo_client),
+) -> AsyncDatabase:
+    """Get async MongoDB database instance.
 
     Args:
-        client: MongoDB client from dependency injection.
+        client: Async MongoDB client from dependency injection.
 
     Returns:
-        Database: MongoDB database instance.
+        AsyncDatabase: Async MongoDB database instance.
     """
     return client[DATABASE]
 
 
-def get_cards_collection(db: Database = Depends(get_database)) -> Collection:
-    """Get cards collection from MongoDB.
+def get_async_cards_collection(
+    db: AsyncDatabase = Depends(get_async_database),
+) -> AsyncCollection:
+    """Get the cards collection for async routes.
 
     Args:
-        db: MongoDB database from dependency injection.
+        db: Async MongoDB database from dependency injection.
 
     Returns:
-        Collection: MongoDB cards collection.
+        AsyncCollection: Async MongoDB cards collection.
     """
     return db["cards"]
 
 
+def get_async_oracle_cards_collection(
+    db: AsyncDatabase = Depends(get_async_database),
+) -> AsyncCollection:
+    """Get the oracle cards collection for async routes.
+
+    One document per oracle and language, maintained by the ingest.
+
+    Args:
+        db: Async MongoDB database from dependency injection.
+
+    Returns:
+        AsyncCollection: Async MongoDB oracle_cards collection.
+    """
+    return db["oracle_cards"]
+
+
+def get_async_sets_collection(
+    db: AsyncDatabase = Depends(get_async_database),
+) -> AsyncCollection:
+    """Get the sets collection for async routes.
+
+    One document per set, maintained by the ingest.
+
+    Args:
+        db: Async MongoDB database from dependency injection.
+
+    Returns:
+        AsyncCollection: Async MongoDB sets collection.
+    """
+    return db["sets"]
+
+
 # Type annotations for use in route handlers
-MongoDatabase = Annotated[Database, Depends(get_database)]
-CardsCollection = Annotated[Collection, Depends(get_cards_collection)]
+AsyncMongoDatabase = Annotated[AsyncDatabase, Depends(get_async_database)]
+AsyncCardsCollection = Annotated[AsyncCollection, Depends(get_async_cards_collection)]
+AsyncOracleCardsCollection = Annotated[
+    AsyncCollection, Depends(get_async_oracle_cards_collection)
+]
+AsyncSetsCollection = Annotated[AsyncCollection, Depends(get_async_sets_collection)]
@@ -0,0 +1,176 @@
+"""Sparse fieldsets of the card routes, selected with ``fields=``.
+
+A grid of cards only needs a few fields of each card (name, thumbnail, mana
+cost). ``fields=name,thumbnail``, or the repeated ``fields=name&fields=
+thumbnail``, narrows the MongoDB projection and the Meilisearch attributes
+to those fields. The key of each document, ``id`` for a printing and ``_id``
+for an oracle card, is always returned. Unknown fields are rejected with a
+422 error.
+
+On the oracle cards returned with their printings (``/cards/{name}``,
+``/cards/resolve``), ``cards`` selects the printings and ``cards.<field>``
+the fields of the printings. The printings are not queried when neither of
+them nor ``card_count`` is selected.
+
+Without ``fields`` the responses are unchanged.
+"""
+
+from typing import Annotated, Iterable, Optional
+
+from fastapi import Depends, HTTPException, Query
+
+from api.helpers.cards_meili import ATTRIBUTES_TO_RETRIEVE
+from api.helpers.cards_mongo import CARD_PROJECTION, ORACLE_FIELDS
+
+PRINTINGS_PREFIX = "cards."
+
+# Fields of the printings
+CARD_FIELDS = tuple(field for field in CARD_PROJECTION if field != "_id")
+# Fields of the oracle summaries of /cards/search
+SUMMARY_FIELDS = (*ORACLE_FIELDS, "card_count")
+# Fields of the oracle cards returned with their printings
+ORACLE_CARD_FIELDS = (
+    *SUMMARY_FIELDS,
+    "cards",
+    *(PRINTINGS_PREFIX + field for field in CARD_FIELDS),
+)
+
+
+def parse_fields(values: list[str], allowed: Iterable[str]) -> Optional[list[str]]:
+    """Fields selected by the ``fields`` query parameters.
+
+    Args:
+        values: Values of the parameters, each a comma separated list
+        allowed: Fields the route can return
+
+    Returns:
+        The sorted fields, None when every field is returned
+
+    Raises:
+        HTTPException: 422 if a field is not in ``allowed``
+    """
+    fields = sorted(
+        {field.strip() for value in values for field in value.split(",")} - {""}
+    )
+    if not fields:
+        return None
+
+    unknown = [field for field in fields if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=422, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return fields
+
+
+def fields_dependency(allowed: tuple[str, ...]):
+    """Dependency parsing the ``fields`` query parameters of a route."""
+
+    def dependency(
+        fields: Annotated[
+            list[str], Query(description=f"Fields to return among {', '.join(allowed)}")
+        ] = [],
+    ) -> Optional[list[str]]:
+        return parse_fields(fields, allowed)
+
+    return dependency
+
+
+CardFieldsDep = Annotated[Optional[list[str]], Depends(fields_dependency(CARD_FIELDS))]
+SummaryFieldsDep = Annotated[
+    Optional[list[str]], Depends(fields_dependency(SUMMARY_FIELDS))
+]
+OracleCardFieldsDep = Annotated[
+    Optional[list[str]], Depends(fields_dependency(ORACLE_CARD_FIELDS))
+]
+
+
+def narrow_projection(
+    projection: dict, fields: Optional[Iterable[str]], required: Iterable[str] = ()
+) -> dict:
+    """Keep the selected and ``required`` fields of a projection.
+
+    Args:
+        projection: Projection returning every field
+        fields: Selected fields, None for all
+        required: Fields the query needs besides the selected ones
+    """
+    if fields is None:
+        return projection
+    keep = {*fields, *required}
+    return {
+        name: value
+        for name, value in projection.items()
+        if name == "_id" or name in keep
+    }
+
+
+def pick_fields(
+    document: dict, fields: Optional[Iterable[str]], keep: Iterable[str] = ()
+) -> dict:
+    """Keep the selected fields and the ``keep`` keys of a document."""
+    if fields is None:
+        return document
+    selected = {*fields, *keep}
+    return {name: value for name, value in document.items() if name in selected}
+
+
+def printing_fields(fields: Optional[list[str]]) -> Optional[list[str]]:
+    """Fields of the printings selected on an oracle card.
+
+    Returns:
+        The ``cards.<field>`` fields without their prefix, None for every
+        field of the printings
+    """
+    if fields is None:
+        return None
+    selected = [
+        field.removeprefix(PRINTINGS_PREFIX)
+        for field in fields
+        if field.startswith(PRINTINGS_PREFIX)
+    ]
+    if selected or "cards" not in fields:
+        return selected
+    return None
+
+
+def includes_printings(fields: Optional[list[str]]) -> bool:
+    """Whether the printings are returned with the oracle cards."""
+    return fields is None or "cards" in fields or bool(printing_fields(fields))
+
+
+def needs_printings(fields: Optional[list[str]]) -> bool:
+    """Whether the printings must be queried, to return or count them."""
+    return includes_printings(fields) or "card_count" in fields
+
+
+def pick_oracle_card(card: dict, fields: Optional[list[str]]) -> dict:
+    """Narrow an oracle card and its printings to the selected fields.
+
+    Args:
+        card: Oracle card shaped by ``oracle_card`` or ``oracle_summary``
+        fields: Fields of ``ORACLE_CARD_FIELDS`` or ``SUMMARY_FIELDS``
+    """
+    if fields is None:
+        return card
+    keep = ["_id", "score"]
+    if includes_printings(fields):
+        keep.append("cards")
+    card = pick_fields(card, fields, keep)
+    if "cards" in card:
+        card["cards"] = [
+            pick_fields(printing, printing_fields(fields), keep=["id"])
+            for printing in card["cards"]
+        ]
+    return card
+
+
+def meili_attributes(fields: Optional[list[str]]) -> list[str]:
+    """Attributes of the Meilisearch hits for the selected summary fields."""
+    if fields is None:
+        return ATTRIBUTES_TO_RETRIEVE
+    attributes = ["oracle_id", *(field for field in fields if field in ORACLE_FIELDS)]
+    if "card_count" in fields:
+        # Counted from the printing ids, see oracle_summary
+        attributes.append("printings")
+    return attributes
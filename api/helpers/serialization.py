@@ -0,0 +1,84 @@
+"""JSON encoding of the card responses.
+
+FastAPI runs the values returned by a route through ``jsonable_encoder``,
+which walks the whole response in Python, then through the stdlib ``json``.
+The card routes return the documents of the MongoDB driver as they are,
+which only hold JSON types, so the routes listed in ``API_FAST_JSON_ROUTES``
+encode them straight with orjson and return the encoded ``Response`` that
+FastAPI sends unchanged. The other routes, and every route of an
+environment without orjson, are encoded like FastAPI does.
+
+Responses served from the response cache are sent as stored in Redis,
+without being decoded and encoded again.
+"""
+
+import json
+from functools import partial
+from typing import Any, Awaitable, Callable
+
+from bson import ObjectId
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from common.constants import API_FAST_JSON_ROUTES
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode the values orjson does not support, e.g. pydantic models."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    return jsonable_encoder(value)
+
+
+def encode_json(content: Any, fast: bool = False) -> bytes:
+    """Encode a response body.
+
+    Args:
+        content: JSON compatible response
+        fast: Encode with orjson if installed, rather than like FastAPI
+
+    Returns:
+        The UTF-8 JSON body
+    """
+    if fast and orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def uses_fast_json(route: str) -> bool:
+    """Whether the responses of ``route`` are encoded with orjson."""
+    return orjson is not None and route in API_FAST_JSON_ROUTES
+
+
+def json_response(route: str, content: Any) -> Response:
+    """Response of ``route`` encoded as configured for it."""
+    return Response(
+        encode_json(content, uses_fast_json(route)), media_type="application/json"
+    )
+
+
+async def cached_json_response(
+    cache, route: str, params: dict, compute: Callable[[], Awaitable[Any]]
+) -> Response:
+    """Response of ``route`` read through the response cache.
+
+    Args:
+        cache: Response cache, see ``api.helpers.cache.ResponseCache``
+        route: Name of the route
+        params: Normalized parameters, see ``cache_params``
+        compute: Coroutine function computing the response on a miss
+    """
+    body = await cache.get_or_set_json(
+        route, params, compute, partial(encode_json, fast=uses_fast_json(route))
+    )
+    return Response(body, media_type="application/json")
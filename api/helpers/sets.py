@@ -0,0 +1,123 @@
+"""In-memory set list served by ``GET /sets``.
+
+The ``sets`` collection holds one document per set and is maintained by the
+ingest (``tasks.sets``). Each API process keeps it in memory together with
+the encoded responses and their ETag, and reloads it once the data version
+bumped by the ingest changes (see ``api.helpers.cache.DataSnapshot``), or
+every ``API_SNAPSHOT_REFRESH`` seconds while Redis cannot be reached.
+Clients sending the ETag back in ``If-None-Match`` get an empty
+``304 Not Modified``.
+
+Until an ingest has built the ``sets`` collection, the list is grouped from
+the cards collection.
+"""
+
+import hashlib
+import json
+from typing import Annotated, Optional
+
+from fastapi import Depends, Response
+from fastapi.encoders import jsonable_encoder
+
+from api.helpers.cache import DataSnapshot
+from common.sets import SETS_PIPELINE
+
+SET_FIELDS = ["code", "name", "released_at", "set_type", "card_count"]
+
+
+async def load_sets(sets_collection, cards_collection) -> list[dict]:
+    """Set documents, newest first.
+
+    Args:
+        sets_collection: Async collection of the set documents
+        cards_collection: Async cards collection, grouped if there are none
+
+    Returns:
+        One dict of ``SET_FIELDS`` per set
+    """
+    sets = await sets_collection.find({}).to_list()
+    if not sets:
+        cursor = await cards_collection.aggregate(SETS_PIPELINE)
+        sets = [
+            {**group, "code": group["_id"]}
+            async for group in cursor
+            if group["_id"] is not None
+        ]
+    sets = [{field: card_set.get(field) for field in SET_FIELDS} for card_set in sets]
+    return sorted(
+        sets,
+        key=lambda card_set: (card_set["released_at"] or "", card_set["code"]),
+        reverse=True,
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header holds ``etag``, weak or not."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class SetsSnapshot:
+    """Set list with its encoded responses."""
+
+    def __init__(self, sets: list[dict]):
+        """
+        Args:
+            sets: Set documents, see ``load_sets``
+        """
+        self.sets = sets
+
+        names = sorted(
+            {card_set["name"] for card_set in sets if card_set["name"]}, reverse=True
+        )
+        self.bodies = {
+            False: json.dumps({"sets": names}).encode(),
+            True: json.dumps(
+                {"sets": names, "details": jsonable_encoder(sets)}
+            ).encode(),
+        }
+        self.etags = {
+            details: '"{}"'.format(
+                hashlib.sha1(body, usedforsecurity=False).hexdigest()
+            )
+            for details, body in self.bodies.items()
+        }
+
+    def response(self, details: bool, if_none_match: Optional[str]) -> Response:
+        """JSON response, or 304 when the client already holds it.
+
+        Args:
+            details: Include the metadata of each set
+            if_none_match: ``If-None-Match`` header of the request
+        """
+        headers = {"ETag": self.etags[details], "Cache-Control": "no-cache"}
+        if etag_matches(if_none_match, self.etags[details]):
+            return Response(status_code=304, headers=headers)
+        return Response(
+            self.bodies[details], media_type="application/json", headers=headers
+        )
+
+
+async def load_snapshot(sets_collection, cards_collection) -> SetsSnapshot:
+    """Load the set list with its encoded responses, see ``load_sets``."""
+    return SetsSnapshot(await load_sets(sets_collection, cards_collection))
+
+
+_catalog = DataSnapshot("sets")
+
+
+def get_sets_catalog() -> DataSnapshot:
+    """Get the set list of this process.
+
+    Returns:
+        DataSnapshot: Shared snapshot of a SetsSnapshot, loaded on first use.
+    """
+    return _catalog
+
+
+SetsCatalogDep = Annotated[DataSnapshot, Depends(get_sets_catalog)]
@@ -1,10 +1,25 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from api.router import base, cards, dnd_rules, mtg_rules, ocr, sets
+from api.helpers.cache import close_response_cache, open_response_cache
+from api.helpers.database import close_async_mongo_client, open_async_mongo_client
+from api.router import base, cache, cards, dnd_rules, mtg_rules, ocr, sets
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    open_async_mongo_client()
+    open_response_cache()
+    yield
+    await close_async_mongo_client()
+    await close_response_cache()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(base.router)
+app.include_router(cache.router)
 app.include_router(sets.router)
 app.include_router(cards.router)
 app.include_router(dnd_rules.router)
@@ -0,0 +1,21 @@
+from fastapi.routing import APIRouter
+
+from api.helpers.cache import ResponseCacheDep
+
+router = APIRouter()
+
+
+@router.get("/cache/stats")
+def get_cache_stats(cache: ResponseCacheDep) -> dict:
+    """Get the hit and miss counts of the response cache.
+
+    Counts are kept per API process since its start.
+
+    Args:
+        cache: Response cache (injected dependency)
+
+    Returns:
+        Whether the cache is enabled and reachable, the data version in use
+        and the hits and misses in total and per route.
+    """
+    return cache.summary()
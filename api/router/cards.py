@@ -1,12 +1,43 @@
+import re
+from functools import partial
 from typing import Annotated, Optional
 
 from fastapi import HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.routing import APIRouter
-from pydantic import AnyUrl
+from pydantic import AnyUrl, BaseModel, Field
 from unidecode import unidecode
 
-from api.helpers.cards_mongo import AGGREGATE_CARD, CARD_PROJECTION
-from api.helpers.database import CardsCollection
+from api.depedencies.embedding import MeilisearchClient
+from api.helpers.autocomplete import NameIndexDep, load_name_index, normalize_name
+from api.helpers.cache import ResponseCacheDep, cache_params
+from api.helpers.cards_meili import meili_filter, search_oracle_cards
+from api.helpers.cards_mongo import (
+    CARD_PROJECTION,
+    NOT_DELETED,
+    ORACLE_PROJECTION,
+    SUMMARY_PROJECTION,
+    oracle_card,
+    oracle_summary,
+)
+from api.helpers.database import AsyncCardsCollection, AsyncOracleCardsCollection
+from api.helpers.fields import (
+    CardFieldsDep,
+    OracleCardFieldsDep,
+    SummaryFieldsDep,
+    meili_attributes,
+    narrow_projection,
+    needs_printings,
+    pick_fields,
+    pick_oracle_card,
+    printing_fields,
+)
+from api.helpers.serialization import cached_json_response, json_response
+from common.constants import (
+    API_AUTOCOMPLETE_MAX,
+    API_RESOLVE_MAX_LINES,
+    CARDS_SEARCH_BACKEND,
+)
 from common.scyfall_models import PrintedCard
 
 router = APIRouter()
@@ -30,54 +61,282 @@ class OracleCard:
     cards: list[Card]
 
 
+class CardLine(BaseModel):
+    """Line of a deck list, as parsed by the Streamlit app."""
+
+    name: str
+    count: Optional[int] = None
+    set: Optional[str] = None
+    num: Optional[str] = None
+
+
+class ResolveRequest(BaseModel):
+    cards: list[CardLine] = Field(max_length=API_RESOLVE_MAX_LINES)
+    lang: str = "en"
+
+
 # Removed CardFilter BaseModel - using individual Annotated parameters instead
 
+# Oracle fields needed to pick the oracle card of a deck list line
+RESOLVE_ORACLE_PROJECTION = {
+    **ORACLE_PROJECTION,
+    "name_search": 1,
+    "sets": 1,
+    "released_at": 1,
+}
+RESOLVE_CARD_PROJECTION = {**CARD_PROJECTION, "collector_number": 1}
+
+# Fields the queries need whatever the fields selected with ``fields=``
+ORACLE_KEYS = ("oracle_id", "printings")
+PRINTING_KEYS = ("id", "oracle_id")
+# Fields of the cursor of the printings pages
+PAGE_KEYS = ("id", "released_at")
+
+
+async def printings_by_oracle(
+    collection,
+    oracles: list[dict],
+    filters: Optional[dict] = None,
+    projection: dict = CARD_PROJECTION,
+) -> dict[str, list[dict]]:
+    """Fetch the printings of several oracle cards in a single query.
+
+    Args:
+        collection: Async MongoDB cards collection
+        oracles: oracle_cards documents with their ``printings`` ids
+        filters: Extra conditions on the printings
+        projection: Fields of the printings
+
+    Returns:
+        Printings by oracle id, newest first
+    """
+    ids = [card_id for oracle in oracles for card_id in oracle.get("printings", [])]
+    printings = {oracle["oracle_id"]: [] for oracle in oracles}
+    if not ids:
+        return printings
+
+    async for card in collection.find(
+        {"id": {"$in": ids}, **NOT_DELETED, **(filters or {})}, projection
+    ).sort("released_at", -1):
+        printings.setdefault(card.get("oracle_id"), []).append(card)
+    return printings
+
+
+@router.get("/cards/autocomplete")
+async def autocomplete_card_name(
+    oracle_collection: AsyncOracleCardsCollection,
+    cache: ResponseCacheDep,
+    names: NameIndexDep,
+    q: Annotated[str, Query(min_length=1)],
+    limit: Annotated[int, Query(ge=1, le=API_AUTOCOMPLETE_MAX)] = 10,
+):
+    """Suggest card names starting with ``q``, most played first.
+
+    Served from the in-memory name index, see ``api.helpers.autocomplete``.
+
+    Args:
+        oracle_collection: Async MongoDB oracle_cards collection (injected
+            dependency)
+        cache: Response cache reading the data version (injected dependency)
+        names: In-memory name index (injected dependency)
+        q: Start of the card name, case and accents are ignored
+        limit: Number of suggestions
+
+    Returns:
+        The ``name``, ``oracle_id`` and ``edhrec_rank`` of the suggested cards
+    """
+    index = await names.get(cache, partial(load_name_index, oracle_collection))
+    return {"cards": index.complete(q, limit)}
+
 
 @router.get("/cards/{name}")
-def search_card_by_name(
+async def search_card_by_name(
     name: str,
-    collection: CardsCollection,
+    collection: AsyncCardsCollection,
+    oracle_collection: AsyncOracleCardsCollection,
+    cache: ResponseCacheDep,
+    fields: OracleCardFieldsDep,
     lang: str = "en",
     set: Optional[str] = None,
 ):
     search_name = unidecode(name).lower()
-    results = [
-        card
-        for card in collection.aggregate(
-            [
-                {
-                    "$match": {
-                        "name_search": {
-                            "$regex": f"^{search_name}",
-                        },
-                    }
-                },
-                {"$project": CARD_PROJECTION},
-                {"$sort": {"released_at": -1}},
-                {
-                    "$match": {
-                        "lang": {"$eq": lang},
-                        "layout": {
-                            "$nin": ["art_series"],
-                        },
-                        "set": ({"$eq": set.lower()} if set else {"$exists": True}),
-                    }
-                },
-                {"$group": AGGREGATE_CARD},
-            ]
+    set = set.lower() if set else None
+    query = {
+        "name_search": {"$regex": f"^{re.escape(search_name)}"},
+        "lang": lang,
+        "layout": {"$nin": ["art_series"]},
+    }
+    if set:
+        query["sets"] = set
+
+    async def load():
+        oracles = (
+            await oracle_collection.find(
+                query, narrow_projection(ORACLE_PROJECTION, fields, ORACLE_KEYS)
+            )
+            .sort("released_at", -1)
+            .limit(1)
+            .to_list()
         )
+        if not oracles:
+            return None
+
+        oracle = oracles[0]
+        cards = []
+        if needs_printings(fields):
+            printings = await printings_by_oracle(
+                collection,
+                [oracle],
+                {"set": set} if set else None,
+                narrow_projection(
+                    CARD_PROJECTION, printing_fields(fields), PRINTING_KEYS
+                ),
+            )
+            cards = printings[oracle["oracle_id"]]
+        return pick_oracle_card(oracle_card(oracle, cards), fields)
+
+    return await cached_json_response(
+        cache,
+        "name",
+        cache_params(name=search_name, lang=lang, set=set, fields=fields),
+        load,
+    )
+
+
+@router.post("/cards/resolve")
+async def resolve_deck_list(
+    request: ResolveRequest,
+    collection: AsyncCardsCollection,
+    oracle_collection: AsyncOracleCardsCollection,
+    fields: OracleCardFieldsDep,
+):
+    """Resolve every line of a deck list at once.
+
+    Each line is matched like ``/cards/{name}``, the printings are narrowed
+    to its set and collector number when given.
+
+    Args:
+        request: Parsed deck list lines and their language
+        collection: Async MongoDB cards collection (injected dependency)
+        oracle_collection: Async MongoDB oracle_cards collection (injected
+            dependency)
+        fields: Fields of the cards, all by default
+
+    Returns:
+        The ``results`` of the lines in order, each with its ``card`` (None
+        when not found), and the names of the ``missing`` lines
+    """
+    return json_response(
+        "resolve",
+        await resolve_card_lines(
+            collection, oracle_collection, request.cards, request.lang, fields
+        ),
+    )
+
+
+async def resolve_card_lines(
+    collection,
+    oracle_collection,
+    lines: list[CardLine],
+    lang: str,
+    fields: Optional[list[str]] = None,
+) -> dict:
+    """Match deck list lines with two oracle queries and one printing query.
+
+    The names are first looked up exactly, with ``$in`` on ``name_search``.
+    The names left are looked up as prefixes, e.g. the front face of a
+    double-faced card, and get their most recent matching oracle.
+
+    Returns:
+        See ``resolve_deck_list``
+    """
+    keys = [
+        (normalize_name(line.name).strip(), line.set.lower() if line.set else None)
+        for line in lines
     ]
+    names = {name for name, _ in keys if name}
+    oracle_projection = narrow_projection(
+        RESOLVE_ORACLE_PROJECTION,
+        fields,
+        (*ORACLE_KEYS, "name_search", "sets", "released_at"),
+    )
+    base_query = {"lang": lang, "layout": {"$nin": ["art_series"]}}
+    candidates = await oracle_collection.find(
+        {"name_search": {"$in": sorted(names)}, **base_query},
+        oracle_projection,
+    ).to_list()
+    prefixes = sorted(names - {oracle["name_search"] for oracle in candidates})
+    if prefixes:
+        candidates += await oracle_collection.find(
+            {
+                "$or": [
+                    {"name_search": {"$regex": f"^{re.escape(prefix)}"}}
+                    for prefix in prefixes
+                ],
+                **base_query,
+            },
+            oracle_projection,
+        ).to_list()
+
+    def best_oracle(name: str, set_code: Optional[str]) -> Optional[dict]:
+        if not name:
+            return None
+        matches = [
+            oracle for oracle in candidates if oracle["name_search"] == name
+        ] or [oracle for oracle in candidates if oracle["name_search"].startswith(name)]
+        if set_code:
+            matches = [
+                oracle for oracle in matches if set_code in oracle.get("sets", [])
+            ]
+        return max(
+            matches, key=lambda oracle: oracle.get("released_at") or "", default=None
+        )
 
-    if len(results) == 0:
-        return None
+    chosen = [best_oracle(name, set_code) for name, set_code in keys]
+    printings = {}
+    if needs_printings(fields):
+        printings = await printings_by_oracle(
+            collection,
+            list({oracle["oracle_id"]: oracle for oracle in chosen if oracle}.values()),
+            projection=narrow_projection(
+                RESOLVE_CARD_PROJECTION,
+                printing_fields(fields),
+                (*PRINTING_KEYS, "set", "collector_number"),
+            ),
+        )
 
-    return results[0]
+    results = []
+    for line, (_, set_code), oracle in zip(lines, keys, chosen):
+        card = None
+        if oracle is not None:
+            cards = printings.get(oracle["oracle_id"], [])
+            if set_code:
+                cards = [
+                    printing for printing in cards if printing.get("set") == set_code
+                ]
+            if line.num:
+                # Deck sites do not always write collector numbers the same way
+                cards = [
+                    printing
+                    for printing in cards
+                    if printing.get("collector_number") == line.num
+                ] or cards
+            card = pick_oracle_card(oracle_card(oracle, cards), fields)
+        results.append({**line.model_dump(), "card": card})
+
+    return {
+        "results": results,
+        "missing": [result["name"] for result in results if result["card"] is None],
+    }
 
 
 @router.get("/cards/search/{text}")
-def search_card_by_text(
+async def search_card_by_text(
     text: str,
-    collection: CardsCollection,
+    oracle_collection: AsyncOracleCardsCollection,
+    search_client: MeilisearchClient,
+    cache: ResponseCacheDep,
+    fields: SummaryFieldsDep,
     lang: str = "en",
     cursor: Optional[str] = None,
     page_count: int = 10,
@@ -89,7 +348,90 @@ def search_card_by_text(
     types: Annotated[list[str], Query()] = [],
     rarities: Annotated[list[str], Query()] = [],
 ):
-    # Build match conditions
+    filters = {
+        "sets": sets,
+        "colors": colors,
+        "color_operator": color_operator,
+        "cmc_min": cmc_min,
+        "cmc_max": cmc_max,
+        "types": types,
+        "rarities": rarities,
+    }
+    return await cached_json_response(
+        cache,
+        "search",
+        cache_params(
+            text=" ".join(text.lower().split()),
+            lang=lang,
+            cursor=cursor,
+            page_count=page_count,
+            backend=CARDS_SEARCH_BACKEND,
+            fields=fields,
+            **filters,
+        ),
+        partial(
+            find_cards_by_text,
+            oracle_collection,
+            search_client,
+            text,
+            lang,
+            cursor,
+            page_count,
+            **filters,
+            fields=fields,
+        ),
+    )
+
+
+async def find_cards_by_text(
+    oracle_collection,
+    search_client,
+    text: str,
+    lang: str,
+    cursor: Optional[str],
+    page_count: int,
+    sets: list[str],
+    colors: list[str],
+    color_operator: str,
+    cmc_min: Optional[int],
+    cmc_max: Optional[int],
+    types: list[str],
+    rarities: list[str],
+    fields: Optional[list[str]] = None,
+) -> dict:
+    """One page of the oracle cards matching ``text`` and the filters.
+
+    The summaries are narrowed to ``fields`` when given, see
+    ``api.helpers.fields``.
+
+    Returns:
+        The oracle summaries (``cards``) of the page, the ``cursor`` of the
+        next page and whether there is one (``has_more``). The printings are
+        fetched on demand, see ``/cards/oracle/{oracle_id}/printings``.
+    """
+
+    if CARDS_SEARCH_BACKEND == "meilisearch":
+        # The Meilisearch client is blocking, keep it off the event loop
+        page, next_cursor = await run_in_threadpool(
+            search_oracle_cards,
+            search_client,
+            text,
+            meili_filter(
+                lang, sets, colors, color_operator, cmc_min, cmc_max, types, rarities
+            ),
+            cursor,
+            page_count,
+            attributes=meili_attributes(fields),
+        )
+        return {
+            "cards": [
+                pick_oracle_card(oracle_summary(oracle), fields) for oracle in page
+            ],
+            "cursor": next_cursor,
+            "has_more": next_cursor is not None,
+        }
+
+    # Build match conditions on the oracle cards
     match_conditions = {
         "$text": {
             "$search": text,
@@ -101,7 +443,7 @@ def search_card_by_text(
 
     # Add set filter
     if sets:
-        match_conditions["set_name"] = {"$in": sets}
+        match_conditions["set_names"] = {"$in": sets}
 
     # Add color filter
     if colors:
@@ -135,16 +477,20 @@ def search_card_by_text(
 
     # Add rarity filter
     if rarities:
-        match_conditions["rarity"] = {"$in": rarities}
+        match_conditions["rarities"] = {"$in": rarities}
 
-    # Build aggregation pipeline
+    # Build aggregation pipeline, no grouping needed on the oracle cards
     pipeline = [
         {"$match": match_conditions},
-        {"$project": {"score": 1, **CARD_PROJECTION}},
-        {"$group": {"score": {"$max": "$score"}, **AGGREGATE_CARD}},
         {
-            "$sort": {"score": -1, "_id": 1}
-        },  # Sort by score DESC, then _id ASC for consistency
+            "$project": {
+                "score": {"$meta": "textScore"},
+                **narrow_projection(SUMMARY_PROJECTION, fields, ["oracle_id"]),
+            }
+        },
+        {
+            "$sort": {"score": -1, "oracle_id": 1}
+        },  # Sort by score DESC, then oracle_id ASC for consistency
     ]
 
     # Add cursor filter if provided
@@ -153,7 +499,7 @@ def search_card_by_text(
         try:
             cursor_score, cursor_id = cursor.split(":", 1)
             cursor_score = float(cursor_score)
-            # Match documents with score < cursor_score OR (score == cursor_score AND _id > cursor_id)
+            # Match documents with score < cursor_score OR (score == cursor_score AND oracle_id > cursor_id)
             pipeline.append(
                 {
                     "$match": {
@@ -162,7 +508,7 @@ def search_card_by_text(
                             {
                                 "$and": [
                                     {"score": cursor_score},
-                                    {"_id": {"$gt": cursor_id}},
+                                    {"oracle_id": {"$gt": cursor_id}},
                                 ]
                             },
                         ]
@@ -177,13 +523,14 @@ def search_card_by_text(
     pipeline.append({"$limit": page_count + 1})
 
     # Execute aggregation
-    results = list(collection.aggregate(pipeline))
+    results = await (await oracle_collection.aggregate(pipeline)).to_list()
+    page = results[:page_count]
 
     # Build pagination result
     result = {
-        "cards": results[:page_count],
+        "cards": [pick_oracle_card(oracle_summary(oracle), fields) for oracle in page],
         "cursor": (
-            f"{results[-2]['score']}:{results[-2]['_id']}"
+            f"{results[-2]['score']}:{results[-2]['oracle_id']}"
             if len(results) > page_count
             else None
         ),
@@ -194,12 +541,19 @@ def search_card_by_text(
 
 
 @router.get("/cards/id/{scryfall_id}")
-def get_card_by_scryfall_id(scryfall_id: str, collection: CardsCollection):
+async def get_card_by_scryfall_id(
+    scryfall_id: str,
+    collection: AsyncCardsCollection,
+    cache: ResponseCacheDep,
+    fields: CardFieldsDep,
+):
     """Get a specific MTG card printing by Scryfall ID.
 
     Args:
         scryfall_id: Unique Scryfall UUID for a specific card printing
-        collection: MongoDB cards collection (injected dependency)
+        collection: Async MongoDB cards collection (injected dependency)
+        cache: Response cache (injected dependency)
+        fields: Fields of the card, all by default
 
     Returns:
         Card data including image_uris and all metadata
@@ -208,24 +562,39 @@ def get_card_by_scryfall_id(scryfall_id: str, collection: CardsCollection):
         HTTPException: 404 if card not found
     """
 
-    # Query MongoDB for card by Scryfall ID
-    card = collection.find_one({"id": scryfall_id}, CARD_PROJECTION)
-
-    if card is None:
-        raise HTTPException(
-            status_code=404, detail=f"Card with ID {scryfall_id} not found"
+    async def load():
+        # Query MongoDB for card by Scryfall ID
+        card = await collection.find_one(
+            {"id": scryfall_id, **NOT_DELETED},
+            narrow_projection(CARD_PROJECTION, fields, ["id"]),
         )
 
-    return card
+        if card is None:
+            raise HTTPException(
+                status_code=404, detail=f"Card with ID {scryfall_id} not found"
+            )
+
+        return card
+
+    return await cached_json_response(
+        cache, "id", cache_params(id=scryfall_id, fields=fields), load
+    )
 
 
 @router.get("/cards/oracle/{oracle_id}")
-def get_cards_by_oracle_id(oracle_id: str, collection: CardsCollection):
+async def get_cards_by_oracle_id(
+    oracle_id: str,
+    collection: AsyncCardsCollection,
+    cache: ResponseCacheDep,
+    fields: CardFieldsDep,
+):
     """Get all printings of a card by Oracle ID.
 
     Args:
         oracle_id: Oracle UUID representing the card concept (non-unique)
-        collection: MongoDB cards collection (injected dependency)
+        collection: Async MongoDB cards collection (injected dependency)
+        cache: Response cache (injected dependency)
+        fields: Fields of the printings, all by default
 
     Returns:
         List of all card printings sharing this oracle_id
@@ -234,16 +603,117 @@ def get_cards_by_oracle_id(oracle_id: str, collection: CardsCollection):
         HTTPException: 404 if no cards found with this oracle_id
     """
 
-    # Query MongoDB for all cards with this Oracle ID
-    cards = list(
-        collection.find({"oracle_id": oracle_id}, CARD_PROJECTION).sort(
-            "released_at", -1
+    async def load():
+        # Query MongoDB for all cards with this Oracle ID
+        cards = (
+            await collection.find(
+                {"oracle_id": oracle_id, **NOT_DELETED},
+                narrow_projection(CARD_PROJECTION, fields, ["id"]),
+            )
+            .sort("released_at", -1)
+            .to_list()
         )
+
+        if not cards:
+            raise HTTPException(
+                status_code=404, detail=f"No cards found with Oracle ID {oracle_id}"
+            )
+
+        return cards
+
+    return await cached_json_response(
+        cache, "oracle", cache_params(oracle_id=oracle_id, fields=fields), load
     )
 
-    if not cards:
-        raise HTTPException(
-            status_code=404, detail=f"No cards found with Oracle ID {oracle_id}"
-        )
 
-    return cards
+def printings_cursor(card: dict) -> str:
+    """Cursor ``"released_at|id"`` of the last printing of a page.
+
+    The date is left empty when the printing has none.
+    """
+    return f"{card.get('released_at') or ''}|{card['id']}"
+
+
+def printings_after(cursor: str) -> list[dict]:
+    """Conditions, ORed, of the printings after ``cursor``.
+
+    The printings are sorted newest first then by id, those without
+    ``released_at`` come last as MongoDB sorts null below any date.
+    """
+    released_at, _, card_id = cursor.partition("|")
+    if not released_at:
+        return [{"released_at": None, "id": {"$gt": card_id}}]
+    return [
+        {"released_at": {"$lt": released_at}},
+        {"released_at": released_at, "id": {"$gt": card_id}},
+        {"released_at": None},
+    ]
+
+
+@router.get("/cards/oracle/{oracle_id}/printings")
+async def get_oracle_printings(
+    oracle_id: str,
+    collection: AsyncCardsCollection,
+    cache: ResponseCacheDep,
+    fields: CardFieldsDep,
+    lang: Optional[str] = None,
+    set: Optional[str] = None,
+    cursor: Optional[str] = None,
+    page_count: Annotated[int, Query(ge=1, le=100)] = 20,
+):
+    """Get one page of the printings of a card, newest first.
+
+    Args:
+        oracle_id: Oracle UUID representing the card concept
+        collection: Async MongoDB cards collection (injected dependency)
+        cache: Response cache (injected dependency)
+        fields: Fields of the printings, all by default
+        lang: Language of the printings, all by default
+        set: Set code of the printings, all by default
+        cursor: Position of the page, returned by the previous page
+        page_count: Printings per page
+
+    Returns:
+        The printings (``cards``) of the page, the ``cursor`` of the next
+        page and whether there is one (``has_more``)
+    """
+    set = set.lower() if set else None
+
+    async def load():
+        query = {"oracle_id": oracle_id, **NOT_DELETED}
+        if lang:
+            query["lang"] = lang
+        if set:
+            query["set"] = set
+        if cursor:
+            query["$or"] = printings_after(cursor)
+
+        cards = (
+            await collection.find(
+                query, narrow_projection(CARD_PROJECTION, fields, PAGE_KEYS)
+            )
+            .sort([("released_at", -1), ("id", 1)])
+            .limit(page_count + 1)
+            .to_list()
+        )
+        page = cards[:page_count]
+        has_more = len(cards) > page_count
+        return {
+            "cards": [pick_fields(card, fields, keep=["id"]) for card in page],
+            "cursor": printings_cursor(page[-1]) if has_more else None,
+            "has_more": has_more,
+        }
+
+    return await cached_json_response(
+        cache,
+        "printings",
+        cache_params(
+            oracle_id=oracle_id,
+            lang=lang,
+            set=set,
+            cursor=cursor,
+            page_count=page_count,
+            fields=fields,
+        ),
+        load,
+    )
@@ -1,37 +1,57 @@
+from functools import partial
+from typing import Optional
+
+from fastapi import Header, Response
 from fastapi.routing import APIRouter
 from pydantic import BaseModel
 
-from api.helpers.database import CardsCollection
+from api.helpers.cache import ResponseCacheDep
+from api.helpers.database import AsyncCardsCollection, AsyncSetsCollection
+from api.helpers.sets import SetsCatalogDep, load_snapshot
 
 router = APIRouter()
 
 
-class Sets(BaseModel):
-    sets: list[str]
+class SetDetails(BaseModel):
+    code: str
+    name: Optional[str] = None
+    released_at: Optional[str] = None
+    set_type: Optional[str] = None
+    card_count: int
 
 
-@router.get("/sets")
-def get_sets(collection: CardsCollection) -> Sets:
+class Sets(BaseModel):
+    sets: list[str]
+    details: Optional[list[SetDetails]] = None
+
+
+@router.get("/sets", response_model=Sets)
+async def get_sets(
+    sets_collection: AsyncSetsCollection,
+    collection: AsyncCardsCollection,
+    cache: ResponseCacheDep,
+    catalog: SetsCatalogDep,
+    details: bool = False,
+    if_none_match: Optional[str] = Header(None),
+) -> Response:
     """Get all unique MTG set names.
 
+    Served from the in-memory set list, with an ETag: a request whose
+    ``If-None-Match`` holds it gets an empty 304 response.
+
     Args:
-        collection: MongoDB cards collection (injected dependency)
+        sets_collection: Async MongoDB sets collection (injected dependency)
+        collection: Async MongoDB cards collection (injected dependency)
+        cache: Response cache reading the data version (injected dependency)
+        catalog: In-memory set list (injected dependency)
+        details: Also return the code, release date, type and card count of
+            each set, newest first
+        if_none_match: ETag of the list held by the client
 
     Returns:
         Sets object containing list of unique set names.
     """
-    sets = [
-        card_set["_id"]
-        for card_set in collection.aggregate(
-            [
-                {
-                    "$group": {
-                        "_id": "$set_name",
-                    }
-                },
-                {"$sort": {"_id": -1}},
-            ]
-        )
-    ]
-
-    return {"sets": sets}
+    snapshot = await catalog.get(
+        cache, partial(load_snapshot, sets_collection, collection)
+    )
+    return snapshot.response(details, if_none_match)
@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pandas as pd
 import streamlit as st
-from utils.api import all_sets, search_cards
+from utils.api import all_sets, get_printings, search_cards
 
 # Page configuration
 st.set_page_config(
@@ -338,10 +338,14 @@ def show_card_details(card):
 
         st.divider()
 
-        # All printings
-        if card.get("cards"):
-            with st.expander(f"View All {len(card['cards'])} Printings"):
-                for printing in card["cards"]:
+        # All printings, fetched on demand
+        result = get_printings(card["_id"]) if card.get("_id") else {"cards": []}
+        printings = result["cards"]
+        if result.get("error"):
+            st.error(f"Could not load every printing: {result['error']}")
+        if printings:
+            with st.expander(f"View All {len(printings)} Printings"):
+                for printing in printings:
                     print_col1, print_col2 = st.columns([1, 3])
                     with print_col1:
                         if printing.get("image_uris", {}).get("small"):
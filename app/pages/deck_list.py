@@ -1,7 +1,9 @@
 import streamlit as st
-from requests import get
+from requests import RequestException, post
 from utils.parse_cards import CardSearch, parse_deck_string
 
+from common.constants import API_RESOLVE_MAX_LINES
+
 st.set_page_config(
     page_title="MTG Deck list",
     page_icon="👋",
@@ -18,23 +20,22 @@ st.info(
 
 
 @st.cache_data
-def get_card(info: CardSearch):
-    map_to_params = {
-        "set": "set",
-        "num": "collector_number",
-        # "special": "special",
-        # "foil": "foil",
-    }
-    card = get(
-        f"http://api:8000/cards/{info['name']}",
-        params={
-            map_to_params[key]: info[key]
-            for key in info
-            if key in map_to_params and info[key]
-        },
-    ).json()
-    # st.json(card)
-    return card
+def resolve_cards(deck: list[CardSearch]) -> list[dict]:
+    """Resolve every line of the deck list, API_RESOLVE_MAX_LINES per request.
+
+    Raises:
+        RequestException: If the API cannot be reached or answers an error
+    """
+    results = []
+    for start in range(0, len(deck), API_RESOLVE_MAX_LINES):
+        response = post(
+            "http://api:8000/cards/resolve",
+            json={"cards": deck[start : start + API_RESOLVE_MAX_LINES]},
+            timeout=30,
+        )
+        response.raise_for_status()
+        results.extend(response.json()["results"])
+    return results
 
 
 deck_list = st.text_area("Deck list")
@@ -46,7 +47,13 @@ if not deck_list:
 deck = parse_deck_string(deck_list)["deck_list"]
 
 
-card_list = [(card_info, get_card(card_info)) for card_info in deck]
+try:
+    results = resolve_cards(deck)
+except RequestException as error:
+    st.error(f"Could not resolve the deck list: {error}")
+    st.stop()
+
+card_list = [(card_info, result["card"]) for card_info, result in zip(deck, results)]
 
 missing_cards = [card_info["name"] for card_info, card in card_list if not card]
 if missing_cards:
@@ -4,6 +4,7 @@ from typing import Optional
 import streamlit as st
 import streamlit_shadcn_ui as ui
 from requests import get
+from utils.api import get_printings
 
 st.set_page_config(
     page_title="Magic the Gathening cards",
@@ -36,16 +37,14 @@ def reduce_count(acc, value):
     return acc
 
 
-@st.cache_data
-def get_sets(oracle_card):
-    return reduce(reduce_count, [card["set_name"] for card in oracle_card["cards"]], {})
+def get_sets(printings):
+    return reduce(reduce_count, [card["set_name"] for card in printings], {})
 
 
-@st.cache_data
-def get_set_cards(oracle_card, selected_set):
+def get_set_cards(printings, selected_set):
     return [
         card
-        for card in oracle_card["cards"]
+        for card in printings
         if not selected_set or card["set_name"] == selected_set[0]
     ]
 
@@ -89,48 +88,60 @@ for oracle_card in st.session_state["cards"]:
             title="Version count",
             key=rf"version-count-{oracle_card['name']}",
         )
+    selected_set = selected_lang = selected_year = None
+    year_cards = []
     with sets:
-        # select set
-        sets = get_sets(oracle_card)
-        selected_set = st.selectbox(
-            "Select set",
-            list(sets.items()),
-            format_func=lambda x: f"{x[0]} ({x[1]})",
-            key=rf"select-set-{oracle_card['name']}",
-            index=None,
-        )
-        # Set cards
-        set_cards = get_set_cards(oracle_card, selected_set)
-        langs = reduce(reduce_count, [card["lang"] for card in set_cards], {})
-        selected_lang = st.selectbox(
-            "Select language",
-            list(langs.items()),
-            format_func=lambda x: f"{x[0]} ({x[1]})",
-            key=rf"select-lang-{oracle_card['name']}",
-            index=None,
-        )
-        # Lang cards
-        lang_cards = [
-            card
-            for card in set_cards
-            if not selected_lang or card["lang"] == selected_lang[0]
-        ]
-        years = reduce(
-            reduce_count, [card["released_at"][:4] for card in lang_cards], {}
-        )
-        selected_year = st.selectbox(
-            "Select year",
-            list(years.items()),
-            format_func=lambda x: f"{x[0]} ({x[1]})",
-            key=rf"select-year-{oracle_card['name']}",
-            index=None,
-        )
-        # Year cards
-        year_cards = [
-            card
-            for card in lang_cards
-            if not selected_year or card["released_at"][:4] == selected_year[0]
-        ]
+        printings = []
+        if st.toggle("Show versions", key=rf"show-versions-{oracle_card['_id']}"):
+            result = get_printings(oracle_card["_id"])
+            printings = result["cards"]
+            if result.get("error"):
+                st.error(f"Could not load every version: {result['error']}")
+        if printings:
+            # select set
+            sets = get_sets(printings)
+            selected_set = st.selectbox(
+                "Select set",
+                list(sets.items()),
+                format_func=lambda x: f"{x[0]} ({x[1]})",
+                key=rf"select-set-{oracle_card['name']}",
+                index=None,
+            )
+            # Set cards
+            set_cards = get_set_cards(printings, selected_set)
+            langs = reduce(reduce_count, [card["lang"] for card in set_cards], {})
+            selected_lang = st.selectbox(
+                "Select language",
+                list(langs.items()),
+                format_func=lambda x: f"{x[0]} ({x[1]})",
+                key=rf"select-lang-{oracle_card['name']}",
+                index=None,
+            )
+            # Lang cards
+            lang_cards = [
+                card
+                for card in set_cards
+                if not selected_lang or card["lang"] == selected_lang[0]
+            ]
+            years = reduce(
+                reduce_count,
+                [(card.get("released_at") or "")[:4] for card in lang_cards],
+                {},
+            )
+            selected_year = st.selectbox(
+                "Select year",
+                list(years.items()),
+                format_func=lambda x: f"{x[0]} ({x[1]})",
+                key=rf"select-year-{oracle_card['name']}",
+                index=None,
+            )
+            # Year cards
+            year_cards = [
+                card
+                for card in lang_cards
+                if not selected_year
+                or (card.get("released_at") or "")[:4] == selected_year[0]
+            ]
 
     year_cards_thumbnail = [
         year_card["thumbnail"] for year_card in year_cards if year_card.get("thumbnail")
@@ -67,6 +67,38 @@ def search_cards(
         return {"cards": [], "cursor": None, "has_more": False, "error": str(e)}
 
 
+@st.cache_data
+def get_printings(oracle_id: str) -> dict:
+    """Get every printing of an oracle card, newest first.
+
+    Follows the cursor of the printings pages until the last one.
+
+    Args:
+        oracle_id: Oracle id of the card
+
+    Returns:
+        Dict with a 'cards' key, and an 'error' key with the printings
+        fetched before a request failed
+    """
+    printings, cursor = [], None
+    try:
+        while True:
+            response = get(
+                f"http://api:8000/cards/oracle/{oracle_id}/printings",
+                params={"cursor": cursor, "page_count": 100},
+                timeout=30,
+            )
+            response.raise_for_status()
+            page = response.json()
+            printings.extend(page["cards"])
+            cursor = page["cursor"]
+            if not cursor:
+                return {"cards": printings}
+    except Exception as e:
+        print(f"Error fetching printings: {e}")
+        return {"cards": printings, "error": str(e)}
+
+
 @st.cache_data
 def all_sets() -> list[str]:
     return get("http://api:8000/sets").json()["sets"]
@@ -6,3 +6,46 @@ DATABASE_HOST = os.getenv("DATABASE_HOSTNAME", "localhost")
 DATABASE_USER = os.getenv("DATABASE_USER", "root")
 DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD", "root")
 DATABASE_PORT = os.getenv("DATABASE_PORT", "27017")
+# Connection pool of the API client, shared by every request
+DATABASE_MAX_POOL_SIZE = int(os.getenv("DATABASE_MAX_POOL_SIZE", "100"))
+DATABASE_MIN_POOL_SIZE = int(os.getenv("DATABASE_MIN_POOL_SIZE", "0"))
+DATABASE_MAX_IDLE_TIME_MS = int(os.getenv("DATABASE_MAX_IDLE_TIME_MS", "300000"))
+DATABASE_CONNECT_TIMEOUT_MS = int(os.getenv("DATABASE_CONNECT_TIMEOUT_MS", "5000"))
+DATABASE_SERVER_SELECTION_TIMEOUT_MS = int(
+    os.getenv("DATABASE_SERVER_SELECTION_TIMEOUT_MS", "5000")
+)
+# Empty waits for the server as long as needed
+DATABASE_SOCKET_TIMEOUT_MS = int(os.getenv("DATABASE_SOCKET_TIMEOUT_MS") or 0) or None
+# "primary", "primaryPreferred", "secondary", "secondaryPreferred" or "nearest"
+DATABASE_READ_PREFERENCE = os.getenv("DATABASE_READ_PREFERENCE", "primary")
+MEILI_CARDS_INDEX = os.getenv("MEILI_CARDS_INDEX", "cards")
+# Backend of /cards/search: "mongo" ($text on oracle_cards) or "meilisearch"
+CARDS_SEARCH_BACKEND = os.getenv("CARDS_SEARCH_BACKEND", "mongo")
+# Redis response cache of the card routes, see api.helpers.cache
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+API_CACHE = os.getenv("API_CACHE", "true").lower() == "true"
+API_CACHE_TTL = int(os.getenv("API_CACHE_TTL", "3600"))
+# Larger responses are not cached
+API_CACHE_MAX_ENTRY_KB = int(os.getenv("API_CACHE_MAX_ENTRY_KB", "512"))
+# Seconds without trying Redis again after it failed
+API_CACHE_RETRY_INTERVAL = float(os.getenv("API_CACHE_RETRY_INTERVAL", "30"))
+# Seconds the data version is reused before being read again
+API_CACHE_VERSION_REFRESH = float(os.getenv("API_CACHE_VERSION_REFRESH", "5"))
+# Seconds the in-memory snapshots (set list, name index) are kept while the
+# data version cannot be read
+API_SNAPSHOT_REFRESH = float(os.getenv("API_SNAPSHOT_REFRESH", "300"))
+# Largest number of suggestions of /cards/autocomplete
+API_AUTOCOMPLETE_MAX = int(os.getenv("API_AUTOCOMPLETE_MAX", "20"))
+# Largest number of deck list lines of POST /cards/resolve
+API_RESOLVE_MAX_LINES = int(os.getenv("API_RESOLVE_MAX_LINES", "250"))
+# Card routes whose responses are encoded with orjson, see
+# api.helpers.serialization, an empty value keeps the stdlib json everywhere
+API_FAST_JSON_ROUTES = [
+    route.strip()
+    for route in os.getenv(
+        "API_FAST_JSON_ROUTES", "name,resolve,search,id,oracle,printings"
+    ).split(",")
+    if route.strip()
+]
+# Bumped by the ingest (tasks.data_version) once it has written its changes
+DATA_VERSION_KEY = "mtg:data_version"
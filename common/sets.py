@@ -0,0 +1,20 @@
+"""Grouping of the printings into sets, shared by the ingest and the API.
+
+The ingest writes its result to the ``sets`` collection (``tasks.sets``),
+the API runs it on the cards collection until that collection is built
+(``api.helpers.sets``).
+"""
+
+SETS_PIPELINE = [
+    # Tombstoned printings, see tasks.sync
+    {"$match": {"deleted_at": {"$exists": False}}},
+    {
+        "$group": {
+            "_id": "$set",
+            "name": {"$first": "$set_name"},
+            "released_at": {"$min": "$released_at"},
+            "set_type": {"$first": "$set_type"},
+            "card_count": {"$sum": 1},
+        }
+    },
+]
@@ -49,6 +49,24 @@ class APIClient:
         response.raise_for_status()
         return response
 
+    async def post(self, path: str, **kwargs) -> httpx.Response:
+        """Send POST request to FastAPI backend.
+
+        Args:
+            path: API endpoint path (e.g., "/cards/resolve")
+            **kwargs: Additional arguments passed to httpx.post()
+
+        Returns:
+            httpx.Response object
+
+        Raises:
+            httpx.HTTPStatusError: If response status indicates error (4xx, 5xx)
+            httpx.RequestError: If request fails (network error, timeout, etc.)
+        """
+        response = await self.client.post(path, **kwargs)
+        response.raise_for_status()
+        return response
+
     async def close(self) -> None:
         """Close the HTTP client connection."""
         await self.client.aclose()
@@ -20,6 +20,9 @@ mcp = FastMCP(
 # Resources auto-register via @mcp.resource() decorators
 from mcp_server.resources import cards  # noqa: E402, F401
 
+# Tools auto-register via @mcp.tool() decorators
+from mcp_server.tools import cards as card_tools  # noqa: E402, F401
+
 # Create a FastAPI app for health checks
 # FastMCP uses this internally for HTTP/SSE transport
 app = FastAPI()
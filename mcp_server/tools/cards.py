@@ -0,0 +1,49 @@
+"""MCP tools for MTG card lookups.
+
+This module provides MCP tools working on several cards at once, such as
+resolving a whole deck list, which communicate with the FastAPI backend via
+HTTP.
+"""
+
+from typing import Optional
+
+from mcp_server.client import get_client
+from mcp_server.server import mcp
+
+
+@mcp.tool()
+async def resolve_deck_list(
+    cards: list[dict],
+    lang: Optional[str] = "en",
+    fields: Optional[list[str]] = None,
+) -> dict:
+    """Find the cards of a deck list in a single request.
+
+    Args:
+        cards: Deck list lines, each with a card ``name`` and optionally its
+            ``count``, ``set`` code and collector number (``num``)
+        lang: Language of the cards (default: en)
+        fields: Fields of the cards to return, e.g. ["name", "mana_cost",
+            "cards.set"], all by default
+
+    Returns:
+        Dictionary with:
+            - results: The lines in order, each with its ``card`` (the oracle
+              card and its matching printings, None when not found)
+            - missing: Names of the lines without a card
+
+    Raises:
+        httpx.HTTPStatusError: If the deck list or a field is invalid (422) or
+            API error (500)
+        httpx.RequestError: If request fails (network error, timeout, etc.)
+
+    Example:
+        >>> await resolve_deck_list([{"name": "Sol Ring", "count": 1, "set": "C21"}])
+    """
+    client = get_client()
+    response = await client.post(
+        "/cards/resolve",
+        params={"fields": fields} if fields else None,
+        json={"cards": cards, "lang": lang or "en"},
+    )
+    return response.json()
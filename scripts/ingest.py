@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+MTG Cards Ingest CLI Script
+
+A command-line tool to run and inspect the Scryfall card ingest outside of
+the nightly huey schedule.
+"""
+
+import logging
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Optional
+
+import bson
+import ijson
+import typer
+from meilisearch.errors import MeilisearchError
+from rich.console import Console
+from rich.logging import RichHandler
+from rich.table import Table
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tasks.bulk_stream import open_replay  # noqa: E402
+from tasks.data_version import bump_data_version  # noqa: E402
+from tasks.history import (  # noqa: E402
+    EDHREC_COLLECTION,
+    PRICES_COLLECTION,
+    migrate_daily_history,
+    read_step_history,
+)
+from tasks.ifetch_dataset import get_database, i_fetch_dataset  # noqa: E402
+from tasks.index_admin import (  # noqa: E402
+    apply_index_profile,
+    index_usage,
+    unused_indexes,
+)
+from tasks.indexes import (  # noqa: E402
+    BULK_LOAD,
+    INDEX_PROFILE,
+    INDEX_PROFILES,
+    ORACLE_INDEXES,
+)
+from tasks.ingest_benchmark import BENCHMARK_DATABASE, benchmark_ingest  # noqa: E402
+from tasks.normalize import benchmark_normalization, normalize_card  # noqa: E402
+from tasks.obj_utils import benchmark_diff  # noqa: E402
+from tasks.oracle_cards import ORACLE_COLLECTION, OracleCardsWriter  # noqa: E402
+from tasks.search_index import (  # noqa: E402
+    CARDS_INDEX,
+    SearchIndexError,
+    get_search_client,
+    rebuild_search_index,
+)
+from tasks.sets import SETS_COLLECTION, refresh_sets  # noqa: E402
+from tasks.synthetic_cards import generate_cards, write_dataset  # noqa: E402
+
+app = typer.Typer(
+    name="ingest",
+    help="Run and inspect the Scryfall card ingest",
+    no_args_is_help=True,
+)
+
+console = Console()
+
+
+def setup_logging(debug: bool = False) -> None:
+    """Set up logging configuration."""
+    level = logging.DEBUG if debug else logging.INFO
+
+    logging.basicConfig(
+        level=level,
+        format="%(message)s",
+        handlers=[RichHandler(console=console, rich_tracebacks=True)],
+    )
+
+
+@app.command()
+def run(
+    force: bool = typer.Option(
+        False,
+        "--force",
+        "-f",
+        help="Reprocess the bulk file even if its updated_at was already ingested",
+    ),
+    replay: Optional[Path] = typer.Option(
+        None,
+        "--replay",
+        help="Ingest a copy kept with INGEST_REPLAY_COPY instead of downloading",
+        exists=True,
+        dir_okay=False,
+    ),
+    bulk_load: bool = typer.Option(
+        BULK_LOAD,
+        "--bulk-load/--no-bulk-load",
+        help="Drop the secondary indexes during the ingest and rebuild them after",
+    ),
+    debug: bool = typer.Option(False, "--debug", help="Enable debug logging"),
+) -> None:
+    """
+    Ingest the Scryfall all_cards bulk file into MongoDB.
+    """
+    setup_logging(debug)
+
+    summary = i_fetch_dataset(
+        force=force,
+        replay_path=str(replay) if replay else None,
+        bulk_load=bulk_load,
+    )
+
+    if summary is None:
+        console.print("[yellow]Bulk data already ingested, use --force to rerun[/]")
+        return
+
+    counts = summary["counts"]
+    console.print(
+        f"[green]✅ Ingest {summary['status']}[/green] in {summary['duration']:.0f}s: "
+        f"{counts.get('inserted', 0)} inserted, {counts.get('updated', 0)} updated, "
+        f"{counts.get('unchanged', 0)} unchanged, "
+        f"peak memory {summary.get('peak_rss_mb', 0):.0f} MB"
+    )
+
+
+@app.command()
+def runs(
+    limit: int = typer.Option(10, "--limit", "-n", help="Number of runs to show"),
+) -> None:
+    """
+    Show the most recent ingest runs.
+    """
+    table = Table("Started", "Source", "Updated at", "Status", "Duration", "Counts")
+    for ingest_run in (
+        get_database()["ingest_runs"].find().sort("started_at", -1).limit(limit)
+    ):
+        counts = ingest_run.get("counts", {})
+        status = ingest_run["status"]
+        if status != "success" and "checkpoint" in ingest_run:
+            status += f" @ {ingest_run['checkpoint']['cards']}"
+        table.add_row(
+            f"{ingest_run['started_at']:%Y-%m-%d %H:%M}",
+            ingest_run["source"],
+            f"{ingest_run['updated_at']:%Y-%m-%d %H:%M}",
+            status,
+            f"{ingest_run.get('duration', 0):.0f}s",
+            ", ".join(f"{key}={value}" for key, value in counts.items()),
+        )
+    console.print(table)
+
+
+@app.command()
+def migrate_history(
+    drop_daily: bool = typer.Option(
+        False,
+        "--drop-daily",
+        help="Drop the legacy daily collections once migrated",
+    ),
+) -> None:
+    """
+    Move card_stocks_daily and edhrec_daily into monthly buckets.
+    """
+    setup_logging()
+    db = get_database()
+
+    for daily, monthly, value_field in (
+        ("card_stocks_daily", PRICES_COLLECTION, "prices"),
+        ("edhrec_daily", EDHREC_COLLECTION, "edhrec_rank"),
+    ):
+        count = migrate_daily_history(db[daily], db[monthly], value_field)
+        console.print(f"[green]✅ {daily}: {count} documents migrated to {monthly}[/]")
+        if drop_daily:
+            db[daily].drop()
+            console.print(f"Dropped {daily}")
+
+
+@app.command()
+def history(
+    card_id: str = typer.Argument(..., help="Scryfall id of the printing"),
+    days: int = typer.Option(30, "--days", "-d", help="Number of days to show"),
+    end: Optional[datetime] = typer.Option(
+        None, "--end", formats=["%Y-%m-%d"], help="Last day shown, defaults to today"
+    ),
+) -> None:
+    """
+    Show the daily prices and EDHREC rank of a printing.
+    """
+    end = end or datetime.now(timezone.utc).replace(tzinfo=None)
+    end = datetime(end.year, end.month, end.day)
+    start = end - timedelta(days=days - 1)
+    db = get_database()
+
+    prices = {
+        point["date"]: point["value"]
+        for point in read_step_history(db[PRICES_COLLECTION], card_id, start, end)
+    }
+    ranks = {
+        point["date"]: point["value"]
+        for point in read_step_history(db[EDHREC_COLLECTION], card_id, start, end)
+    }
+    if not prices and not ranks:
+        console.print(f"[yellow]No history for {card_id}[/yellow]")
+        raise typer.Exit(1)
+
+    table = Table("Date", "EDHREC rank", "Prices")
+    for date in sorted({*prices, *ranks}):
+        rank = ranks.get(date)
+        table.add_row(
+            f"{date:%Y-%m-%d}",
+            "" if rank is None else str(rank),
+            ", ".join(
+                f"{currency} {price}"
+                for currency, price in (prices.get(date) or {}).items()
+                if price is not None
+            ),
+        )
+    console.print(table)
+
+
+@app.command()
+def rebuild_oracles() -> None:
+    """
+    Rebuild every oracle_cards document from the stored printings.
+    """
+    setup_logging()
+    db = get_database()
+    oracle_cards = db[ORACLE_COLLECTION]
+    oracle_cards.create_indexes(ORACLE_INDEXES)
+
+    writer = OracleCardsWriter(db["cards"], oracle_cards)
+    writer.touch_all()
+    counts = writer.refresh()
+    bump_data_version()
+    console.print(
+        f"[green]✅ {counts['oracles_written']} oracle cards written[/green], "
+        f"{counts['oracles_deleted']} deleted"
+    )
+
+
+@app.command()
+def rebuild_sets() -> None:
+    """
+    Rebuild the sets collection from the stored printings.
+    """
+    setup_logging()
+    db = get_database()
+    counts = refresh_sets(db["cards"], db[SETS_COLLECTION])
+    bump_data_version()
+    console.print(
+        f"[green]✅ {counts['sets_written']} sets written[/green], "
+        f"{counts['sets_deleted']} deleted"
+    )
+
+
+@app.command()
+def reindex_search() -> None:
+    """
+    Rebuild the Meilisearch cards index from the oracle_cards collection.
+    """
+    setup_logging()
+    try:
+        counts = rebuild_search_index(
+            get_search_client(), get_database()[ORACLE_COLLECTION]
+        )
+    except (MeilisearchError, SearchIndexError) as error:
+        console.print(f"[red]❌ Search index not rebuilt: {error}[/red]")
+        raise typer.Exit(1)
+    bump_data_version()
+    console.print(
+        f"[green]✅ {counts['search_upserted']} oracle cards indexed "
+        f"in {CARDS_INDEX}[/green]"
+    )
+
+
+@app.command()
+def indexes(
+    profile: str = typer.Option(
+        INDEX_PROFILE, "--profile", "-p", help="Profile whose indexes are expected"
+    ),
+) -> None:
+    """
+    Audit the cards indexes with $indexStats and the query profiler.
+    """
+    if profile not in INDEX_PROFILES:
+        console.print(f"[red]Unknown profile {profile}[/red]")
+        raise typer.Exit(1)
+
+    db = get_database()
+    expected = {model.document["name"] for model in INDEX_PROFILES[profile]}
+    usage = index_usage(db["cards"], db["system.profile"])
+
+    table = Table("Index", "Ops", "Profiled", "Since", "In profile", "Unused")
+    for index in usage:
+        since = index["since"]
+        table.add_row(
+            index["name"],
+            str(index["ops"]),
+            str(index["profiled"]),
+            f"{since:%Y-%m-%d %H:%M}" if since else "",
+            "yes" if index["name"] in expected else "",
+            "[red]unused[/red]" if index["unused"] else "",
+        )
+    console.print(table)
+
+    prunable = unused_indexes(usage, profile)
+    if prunable:
+        console.print(
+            f"[yellow]Unused and not in {profile}: {', '.join(prunable)}[/yellow]"
+        )
+
+
+@app.command()
+def apply_indexes(
+    profile: str = typer.Argument(..., help=f"One of {', '.join(INDEX_PROFILES)}"),
+    prune: bool = typer.Option(
+        False, "--prune", help="Drop the indexes that are not in the profile"
+    ),
+) -> None:
+    """
+    Create the indexes of a profile on the cards collection.
+    """
+    if profile not in INDEX_PROFILES:
+        console.print(f"[red]Unknown profile {profile}[/red]")
+        raise typer.Exit(1)
+
+    setup_logging()
+    result = apply_index_profile(get_database()["cards"], profile, prune=prune)
+    console.print(
+        f"[green]✅ {profile}[/green]: created {', '.join(result['created']) or 'none'}"
+        f", dropped {', '.join(result['dropped']) or 'none'}"
+    )
+
+
+@app.command()
+def bench_normalize(
+    path: Path = typer.Argument(
+        ..., help="Bulk file (plain or gzip JSON array of cards)", exists=True
+    ),
+    workers: list[int] = typer.Option(
+        [0, 2, 4], "--workers", "-w", help="Worker counts to compare, 0 is in-process"
+    ),
+    limit: int = typer.Option(50000, "--limit", "-n", help="Number of cards to use"),
+    batch_size: int = typer.Option(1000, "--batch-size", help="Cards per batch"),
+) -> None:
+    """
+    Benchmark the card normalization stage for several worker counts.
+    """
+    with open_replay(str(path)) as file:
+        cards = list(islice(ijson.items(file, "item", use_float=True), limit))
+
+    table = Table("Workers", "Cards", "Duration", "Cards/s", "Speedup")
+    baseline = None
+    for worker_count in workers:
+        result = benchmark_normalization(cards, worker_count, batch_size)
+        baseline = baseline or result["cards_per_second"]
+        table.add_row(
+            str(worker_count),
+            str(result["cards"]),
+            f"{result['duration']:.2f}s",
+            f"{result['cards_per_second']:.0f}",
+            f"{result['cards_per_second'] / baseline:.2f}x",
+        )
+    console.print(table)
+
+
+def stored_document(card: dict) -> dict:
+    """Card document as stored by the ingest."""
+    return bson.decode(normalize_card(card).document)
+
+
+@app.command()
+def bench_diff(
+    before: Path = typer.Argument(
+        ..., help="Older bulk file (plain or gzip JSON array of cards)", exists=True
+    ),
+    after: Path = typer.Argument(
+        ..., help="Newer bulk file (plain or gzip JSON array of cards)", exists=True
+    ),
+    limit: int = typer.Option(50000, "--limit", "-n", help="Cards read from BEFORE"),
+    repeat: int = typer.Option(5, "--repeat", "-r", help="Passes, the fastest is kept"),
+) -> None:
+    """
+    Benchmark the card diff on the cards present in two bulk files.
+    """
+    with open_replay(str(before)) as file:
+        stored = {
+            card["id"]: stored_document(card)
+            for card in islice(ijson.items(file, "item", use_float=True), limit)
+        }
+    with open_replay(str(after)) as file:
+        pairs = [
+            (stored[card["id"]], stored_document(card))
+            for card in ijson.items(file, "item", use_float=True)
+            if card["id"] in stored
+        ]
+
+    changed = sum(before_card != after_card for before_card, after_card in pairs)
+    console.print(f"{len(pairs)} card pairs, {changed} changed")
+
+    table = Table("Diff", "Pairs", "Duration", "Pairs/s", "Speedup")
+    baseline = None
+    for result in benchmark_diff(pairs, repeat):
+        baseline = baseline or result["pairs_per_second"]
+        table.add_row(
+            result["name"],
+            str(result["pairs"]),
+            f"{result['duration']:.3f}s",
+            f"{result['pairs_per_second']:.0f}",
+            f"{result['pairs_per_second'] / baseline:.2f}x",
+        )
+    console.print(table)
+
+
+@app.command()
+def generate(
+    path: Path = typer.Argument(..., help="Output file, gzip compressed if .gz"),
+    count: int = typer.Option(100000, "--count", "-n", help="Number of cards"),
+    seed: int = typer.Option(0, "--seed", help="Seed of the dataset"),
+    revision: int = typer.Option(
+        0, "--revision", "-r", help="Revision, 0 is the base dataset"
+    ),
+    changed: float = typer.Option(
+        0.05, "--changed", help="Fraction of the cards changed by a revision"
+    ),
+) -> None:
+    """
+    Write a synthetic all_cards bulk file.
+    """
+    written = write_dataset(str(path), generate_cards(count, seed, revision, changed))
+    console.print(f"[green]✅ {written} cards written to {path}[/green]")
+
+
+@app.command()
+def bench_ingest(
+    count: int = typer.Option(100000, "--count", "-n", help="Number of cards"),
+    changed: float = typer.Option(
+        0.05, "--changed", help="Fraction of the cards changed in the last stage"
+    ),
+    seed: int = typer.Option(0, "--seed", help="Seed of the dataset"),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="Normalization processes, 0 is in-process"
+    ),
+    database: str = typer.Option(
+        BENCHMARK_DATABASE, "--database", help="Scratch database, dropped first"
+    ),
+) -> None:
+    """
+    Benchmark the ingest on a synthetic dataset against the local MongoDB.
+
+    The stages load the dataset in the empty database, ingest it again
+    unchanged, then ingest a revision with a fraction of changed cards.
+    Each row covers the whole ingest of one dataset. MB received is the
+    network input of the server, MB stored the growth of the database.
+    """
+    with tempfile.TemporaryDirectory(prefix="ingest-bench-") as directory:
+        base = str(Path(directory) / "base.json")
+        revised = str(Path(directory) / "revised.json")
+        write_dataset(base, generate_cards(count, seed))
+        write_dataset(revised, generate_cards(count, seed, 1, changed))
+        results = benchmark_ingest(
+            [("load", base), ("unchanged", base), ("changed", revised)],
+            database,
+            workers,
+        )
+
+    table = Table(
+        "Dataset",
+        "Cards/s",
+        "Duration",
+        "Write ops",
+        "MB received",
+        "MB stored",
+        "Peak MB",
+    )
+    for result in results:
+        table.add_row(
+            result["stage"],
+            f"{result['cards_per_second']:.0f}",
+            f"{result['duration']:.1f}s",
+            str(result["write_ops"]),
+            f"{result['bytes_in'] / 1e6:.1f}",
+            f"{result['stored_bytes'] / 1e6:+.1f}",
+            f"{result['peak_rss_mb']:.0f}",
+        )
+    console.print(table)
+
+
+if __name__ == "__main__":
+    app()
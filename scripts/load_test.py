@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+API Load Test Script
+
+A command-line tool firing concurrent card searches at running API
+instances and reporting their throughput and latency, e.g. to compare a
+deployment with sync card routes to one with async card routes:
+
+    python scripts/load_test.py search http://old:8000 http://new:8000 -c 200
+
+It also times the JSON encoders of the card responses on search pages with
+their printings, generated or fetched from a running API:
+
+    python scripts/load_test.py serialization --base-url http://localhost:8000
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import time
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+import typer
+from rich.console import Console
+from rich.table import Table
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.helpers.cards_mongo import CARD_PROJECTION, ORACLE_FIELDS  # noqa: E402
+from api.helpers.serialization import encode_json, orjson  # noqa: E402
+
+DEFAULT_QUERIES = ["dragon", "lightning", "counter", "elf", "angel", "zombie"]
+
+app = typer.Typer(
+    name="load-test",
+    help="Load test the card routes of running API instances",
+    no_args_is_help=True,
+)
+
+console = Console()
+
+
+@app.callback()
+def main() -> None:
+    """
+    Load test the card routes of running API instances.
+    """
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Value below which ``fraction`` of the sorted ``values`` fall."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+async def run_load(
+    client: httpx.AsyncClient, paths: list[str], concurrency: int
+) -> dict:
+    """Request every path with ``concurrency`` requests in flight.
+
+    Returns:
+        The number of ``requests`` and ``errors``, the ``duration`` in
+        seconds, ``requests_per_second`` and latency percentiles in ms
+    """
+    pending = iter(paths)
+    latencies = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for path in pending:
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "duration": duration,
+        "requests_per_second": len(latencies) / duration if duration else 0.0,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p50_ms": percentile(latencies, 0.5),
+        "p99_ms": percentile(latencies, 0.99),
+    }
+
+
+async def load_test(
+    base_url: str, paths: list[str], concurrency: int, timeout: float
+) -> dict:
+    """Run ``run_load`` against one API instance with a pooled client."""
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        return await run_load(client, paths, concurrency)
+
+
+@app.command()
+def search(
+    base_urls: list[str] = typer.Argument(..., help="API instances to compare"),
+    concurrency: int = typer.Option(
+        200, "--concurrency", "-c", help="Requests in flight"
+    ),
+    requests: int = typer.Option(2000, "--requests", "-n", help="Requests per API"),
+    queries: list[str] = typer.Option(
+        DEFAULT_QUERIES, "--query", "-q", help="Search texts, used in turn"
+    ),
+    timeout: float = typer.Option(30.0, "--timeout", help="Seconds per request"),
+) -> None:
+    """
+    Load test /cards/search on each API instance in turn.
+    """
+    paths = [f"/cards/search/{query}" for query in islice(cycle(queries), requests)]
+
+    table = Table("API", "Requests", "Errors", "Req/s", "p50 ms", "p99 ms")
+    for base_url in base_urls:
+        result = asyncio.run(load_test(base_url, paths, concurrency, timeout))
+        table.add_row(
+            base_url,
+            str(result["requests"]),
+            str(result["errors"]),
+            f"{result['requests_per_second']:.0f}",
+            f"{result['p50_ms']:.0f}",
+            f"{result['p99_ms']:.0f}",
+        )
+    console.print(table)
+
+
+def fake_printing(oracle_number: int, number: int) -> dict:
+    """Printing with every field of the card routes, as stored by the ingest."""
+    card_id = f"{oracle_number:08d}-0000-4000-8000-{number:012d}"
+    images = {
+        size: f"https://cards.scryfall.io/{size}/front/{card_id}.jpg"
+        for size in ("small", "normal", "large", "png", "art_crop", "border_crop")
+    }
+    card = {
+        field: f"{field} of card {oracle_number}"
+        for field in CARD_PROJECTION
+        if field != "_id"
+    }
+    card.update(
+        {
+            "id": card_id,
+            "oracle_id": f"{oracle_number:08d}-oracle",
+            "lang": "en",
+            "oracle_text": "Flying, haste\nWhen this enters, deal 3 damage to any "
+            "target. " * 2,
+            "cmc": 3.0,
+            "colors": ["R", "U"],
+            "color_identity": ["R", "U"],
+            "games": ["paper", "mtgo", "arena"],
+            "image_uris": images,
+            "related_uris": {
+                name: f"https://example.com/{name}/{card_id}"
+                for name in ("gatherer", "edhrec", "tcgplayer_infinite_articles")
+            },
+            "released_at": f"20{number % 25:02d}-06-01",
+            "promo": False,
+            "reprint": number > 0,
+            "variation": False,
+            "thumbnail": images["normal"],
+            "faces_thumbnails": [],
+            "image": images["large"],
+            "imageXL": images["png"],
+        }
+    )
+    return card
+
+
+def fake_search_page(page_count: int, printings: int) -> dict:
+    """Search page of oracle cards, each with its printings embedded."""
+    cards = []
+    for oracle_number in range(page_count):
+        oracle = {
+            "_id": f"{oracle_number:08d}-oracle",
+            **{field: f"{field} of card {oracle_number}" for field in ORACLE_FIELDS},
+            "cmc": 3.0,
+            "colors": ["R", "U"],
+            "edhrec_rank": 1200 + oracle_number,
+            "penny_rank": None,
+            "faces_thumbnails": [],
+            "score": 1.5 - oracle_number / 100,
+            "card_count": printings,
+            "cards": [fake_printing(oracle_number, n) for n in range(printings)],
+        }
+        cards.append(oracle)
+    return {"cards": cards, "cursor": "1.4:00000009-oracle", "has_more": True}
+
+
+def fetch_search_pages(
+    base_url: str, queries: list[str], page_count: int, printings: int
+) -> list[dict]:
+    """Search pages of a running API, each card with its printings."""
+    pages = []
+    with httpx.Client(base_url=base_url, timeout=30.0) as client:
+        for query in queries:
+            response = client.get(
+                f"/cards/search/{query}", params={"page_count": page_count}
+            )
+            response.raise_for_status()
+            page = response.json()
+            for card in page["cards"]:
+                printings_page = client.get(
+                    f"/cards/oracle/{card['_id']}/printings",
+                    params={"page_count": printings},
+                )
+                printings_page.raise_for_status()
+                card["cards"] = printings_page.json()["cards"]
+            pages.append(page)
+    return pages
+
+
+def time_encoder(
+    encode: Callable[[dict], bytes], payloads: list[dict], rounds: int
+) -> dict:
+    """Encode the payloads in turn ``rounds`` times.
+
+    Returns:
+        The ``bytes`` of the first payload and latency percentiles in µs
+    """
+    latencies = []
+    for payload in islice(cycle(payloads), rounds):
+        start = time.perf_counter()
+        encode(payload)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+    return {
+        "bytes": len(encode(payloads[0])),
+        "mean_us": statistics.fmean(latencies),
+        "p50_us": percentile(latencies, 0.5),
+        "p99_us": percentile(latencies, 0.99),
+    }
+
+
+def serialization_encoders() -> dict[str, Callable[[dict], bytes]]:
+    """Encoders compared by the serialization benchmark."""
+    encoders = {
+        "FastAPI (jsonable_encoder + json)": encode_json,
+        "json": lambda content: json.dumps(content).encode(),
+    }
+    if orjson is not None:
+        encoders["orjson"] = lambda content: encode_json(content, fast=True)
+    return encoders
+
+
+@app.command()
+def serialization(
+    base_url: Optional[str] = typer.Option(
+        None, "--base-url", help="API to fetch the search pages from"
+    ),
+    page_count: int = typer.Option(10, "--page-count", help="Cards per page"),
+    printings: int = typer.Option(8, "--printings", help="Printings per card"),
+    rounds: int = typer.Option(2000, "--rounds", "-n", help="Encodings per encoder"),
+    queries: list[str] = typer.Option(
+        DEFAULT_QUERIES, "--query", "-q", help="Search texts of --base-url"
+    ),
+) -> None:
+    """
+    Time the JSON encoders of the card routes on search pages.
+    """
+    if base_url:
+        payloads = fetch_search_pages(base_url, queries, page_count, printings)
+    else:
+        payloads = [fake_search_page(page_count, printings)]
+
+    table = Table("Encoder", "Bytes", "Mean µs", "p50 µs", "p99 µs", "p50 speedup")
+    baseline = None
+    for name, encode in serialization_encoders().items():
+        result = time_encoder(encode, payloads, rounds)
+        baseline = baseline or result["p50_us"]
+        table.add_row(
+            name,
+            str(result["bytes"]),
+            f"{result['mean_us']:.0f}",
+            f"{result['p50_us']:.0f}",
+            f"{result['p99_us']:.0f}",
+            f"{baseline / result['p50_us']:.1f}x" if result["p50_us"] else "-",
+        )
+    console.print(table)
+    if orjson is None:
+        console.print("[yellow]orjson is not installed[/yellow]")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,293 @@
+"""Streaming access to the Scryfall bulk data files.
+
+The bulk file is read straight from the HTTP response so parsing can start
+while the download is still running, without writing the multi-GB JSON to
+disk first. gzip payloads are decompressed on the fly, interrupted
+downloads resume with an HTTP ``Range`` request and a compressed copy can
+be kept to replay an ingest later.
+"""
+
+import gzip
+import io
+import logging
+import os
+import queue
+import threading
+import zlib
+from typing import Callable, Optional
+
+from requests import Session
+from requests.exceptions import ChunkedEncodingError
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from urllib3.exceptions import ProtocolError, ReadTimeoutError
+
+CHUNK_SIZE = int(os.getenv("INGEST_STREAM_CHUNK_SIZE", str(1 << 20)))
+MAX_RETRIES = int(os.getenv("INGEST_STREAM_MAX_RETRIES", "5"))
+PREFETCH_CHUNKS = int(os.getenv("INGEST_STREAM_PREFETCH", "16"))
+
+GZIP_MAGIC = b"\x1f\x8b"
+RETRYABLE_ERRORS = (
+    ProtocolError,
+    ReadTimeoutError,
+    ChunkedEncodingError,
+    RequestsConnectionError,
+)
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def _copy_buffer(stream, b) -> int:
+    """Copy the unread part of ``stream.buffer`` into ``b``."""
+    size = min(len(b), len(stream.buffer) - stream.position)
+    b[:size] = memoryview(stream.buffer)[stream.position : stream.position + size]
+    stream.position += size
+    return size
+
+
+class HTTPBulkStream(io.RawIOBase):
+    """Readable binary stream over an HTTP download.
+
+    Bytes are read undecoded from the wire so the download can be resumed
+    at the exact wire offset with ``Range``, gzip is then decompressed here
+    whether it comes from ``Content-Encoding`` or from a ``.gz`` payload.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        copy_path: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_retries: int = MAX_RETRIES,
+        progress_hook: Optional[Callable[[int, int], None]] = None,
+        session: Optional[Session] = None,
+        timeout: float = 60,
+    ):
+        """
+        Args:
+            uri: URL of the bulk file
+            copy_path: Where to keep a gzip compressed copy of the file
+            chunk_size: Size of the chunks read from the socket
+            max_retries: Number of resumes attempted after a broken download
+            progress_hook: Called with the wire bytes read and the total size
+            session: requests session, a new one is created by default
+            timeout: Connect/read timeout in seconds
+        """
+        self.uri = uri
+        self.copy_path = copy_path
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.progress_hook = progress_hook
+        self.session = session or Session()
+        self.timeout = timeout
+
+        self.wire_offset = 0
+        self.total_size = -1
+        self.retries = 0
+        self.validator = None
+        self.encoding = ""
+        self.detected = False
+        self.decompressor = None
+        self.copy_file = None
+        self.buffer = b""
+        self.position = 0
+        self.finished = False
+
+        self.response = self._open()
+        self.chunks = self._wire_chunks()
+
+    def readable(self) -> bool:
+        return True
+
+    def _open(self):
+        headers = {"Accept-Encoding": "gzip"}
+        if self.wire_offset:
+            headers["Range"] = f"bytes={self.wire_offset}-"
+            if self.validator:
+                headers["If-Range"] = self.validator
+
+        response = self.session.get(
+            self.uri, headers=headers, stream=True, timeout=self.timeout
+        )
+        response.raise_for_status()
+
+        if self.wire_offset and response.status_code != 206:
+            if self.validator:
+                # If-Range did not match: the file changed since the first
+                # request, the bytes already parsed belong to the old one
+                response.close()
+                raise IOError(f"{self.uri} changed on the server during the download")
+            # Server ignored the range, skip what was already consumed
+            HUEY_LOGGER.warning("Range not honoured, skipping downloaded bytes")
+            skip = self.wire_offset
+            while skip:
+                skipped = response.raw.read(
+                    min(skip, self.chunk_size), decode_content=False
+                )
+                if not skipped:
+                    raise IOError(f"{self.uri} is shorter than on the first attempt")
+                skip -= len(skipped)
+
+        if not self.wire_offset:
+            self.validator = response.headers.get("ETag") or response.headers.get(
+                "Last-Modified"
+            )
+            self.total_size = int(response.headers.get("Content-Length", -1))
+            self.encoding = response.headers.get("Content-Encoding", "").lower()
+
+        return response
+
+    def _wire_chunks(self):
+        while True:
+            try:
+                chunk = self.response.raw.read(self.chunk_size, decode_content=False)
+            except RETRYABLE_ERRORS as error:
+                if self.retries >= self.max_retries:
+                    raise
+                self.retries += 1
+                HUEY_LOGGER.warning(
+                    f"Download interrupted at {self.wire_offset} bytes ({error}), "
+                    f"resuming ({self.retries}/{self.max_retries})"
+                )
+                self.response.close()
+                self.response = self._open()
+                continue
+
+            if not chunk:
+                return
+
+            self.wire_offset += len(chunk)
+            if self.progress_hook:
+                self.progress_hook(self.wire_offset, self.total_size)
+            yield chunk
+
+    def _decode(self, chunk: bytes) -> bytes:
+        if not self.detected:
+            self.detected = True
+            is_gzip = self.encoding == "gzip" or chunk.startswith(GZIP_MAGIC)
+            if is_gzip:
+                self.decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32)
+            if self.copy_path:
+                # gzip payloads are copied as is, plain ones are compressed
+                self.copy_file = (
+                    open(self.copy_path, "wb")
+                    if is_gzip
+                    else gzip.open(self.copy_path, "wb")
+                )
+
+        if self.decompressor:
+            if self.copy_file:
+                self.copy_file.write(chunk)
+            return self.decompressor.decompress(chunk)
+
+        if self.copy_file:
+            self.copy_file.write(chunk)
+        return chunk
+
+    def readinto(self, b) -> int:
+        while self.position >= len(self.buffer) and not self.finished:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.finished = True
+                self.buffer = self.decompressor.flush() if self.decompressor else b""
+            else:
+                self.buffer = self._decode(chunk)
+            self.position = 0
+
+        return _copy_buffer(self, b)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.response.close()
+            if self.copy_file:
+                self.copy_file.close()
+        super().close()
+
+
+class PrefetchReader(io.RawIOBase):
+    """Read a stream ahead in a background thread.
+
+    Network reads and decompression then overlap with the JSON parsing done
+    by the consumer. At most ``depth`` chunks are kept in memory.
+    """
+
+    def __init__(
+        self, stream, chunk_size: int = CHUNK_SIZE, depth: int = PREFETCH_CHUNKS
+    ):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.queue = queue.Queue(maxsize=depth)
+        self.buffer = b""
+        self.position = 0
+        self.finished = False
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._fill, daemon=True)
+        self.thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def _put(self, item) -> bool:
+        while not self.stopped.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _fill(self) -> None:
+        try:
+            while chunk := self.stream.read(self.chunk_size):
+                if not self._put(chunk):
+                    return
+            self._put(b"")
+        except Exception as error:  # re-raised in the consumer thread
+            self._put(error)
+
+    def readinto(self, b) -> int:
+        if self.position >= len(self.buffer) and not self.finished:
+            item = self.queue.get()
+            if isinstance(item, Exception):
+                self.finished = True
+                raise item
+            if not item:
+                self.finished = True
+            self.buffer = item
+            self.position = 0
+
+        return _copy_buffer(self, b)
+
+    def close(self) -> None:
+        if not self.closed:
+            self.stopped.set()
+            self.thread.join()
+            self.stream.close()
+        super().close()
+
+
+def open_bulk_stream(
+    uri: str,
+    copy_path: Optional[str] = None,
+    prefetch: bool = True,
+    **kwargs,
+):
+    """Open a Scryfall bulk file for incremental parsing.
+
+    Args:
+        uri: URL of the bulk file
+        copy_path: Where to keep a gzip compressed copy for replay
+        prefetch: Download in a background thread while the caller parses
+        **kwargs: Forwarded to HTTPBulkStream
+
+    Returns:
+        Readable binary stream of the decompressed JSON
+    """
+    stream = HTTPBulkStream(uri, copy_path=copy_path, **kwargs)
+    return PrefetchReader(stream) if prefetch else stream
+
+
+def open_replay(path: str):
+    """Open a copy kept by ``open_bulk_stream`` for replay."""
+    with open(path, "rb") as file:
+        is_gzip = file.read(2) == GZIP_MAGIC
+    return gzip.open(path, "rb") if is_gzip else open(path, "rb")
@@ -0,0 +1,110 @@
+"""Batched bulk writer for the ingest tasks.
+
+Operations are buffered per collection and sent with a single unordered
+``bulk_write`` once the buffer reaches ``batch_size`` operations or once
+``flush_interval`` seconds have elapsed since the last flush.
+"""
+
+import logging
+import os
+import time
+from typing import Optional
+
+from pymongo.errors import BulkWriteError
+
+BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+FLUSH_INTERVAL = float(os.getenv("INGEST_FLUSH_INTERVAL", "5"))
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+class BulkWriter:
+    """Buffer write operations and flush them in unordered batches.
+
+    Can be used as a context manager, in which case the remaining operations
+    are flushed on exit.
+    """
+
+    def __init__(
+        self,
+        collection,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL,
+        ordered: bool = False,
+        name: Optional[str] = None,
+    ):
+        """
+        Args:
+            collection: Collection the operations are written to
+            batch_size: Number of buffered operations triggering a flush
+            flush_interval: Seconds after which a non-empty buffer is flushed
+            ordered: Forwarded to ``bulk_write``
+            name: Label used in the log lines, defaults to the collection name
+        """
+        self.collection = collection
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.ordered = ordered
+        self.name = name or getattr(collection, "name", "collection")
+
+        self.operations = []
+        self.last_flush = time.monotonic()
+
+        self.batches = 0
+        self.operation_count = 0
+        self.write_errors = 0
+        self.elapsed = 0.0
+
+    def add(self, operation) -> None:
+        """Buffer an operation, flushing if the batch is full or stale."""
+        self.operations.append(operation)
+
+        if (
+            len(self.operations) >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def extend(self, operations) -> None:
+        """Buffer several operations."""
+        for operation in operations:
+            self.add(operation)
+
+    def flush(self) -> None:
+        """Send the buffered operations in a single ``bulk_write``."""
+        self.last_flush = time.monotonic()
+        if not self.operations:
+            return
+
+        operations, self.operations = self.operations, []
+        start = time.perf_counter()
+        try:
+            self.collection.bulk_write(operations, ordered=self.ordered)
+        except BulkWriteError as error:
+            # Unordered batches still apply every valid operation, only log
+            # the failing ones instead of aborting the whole ingest
+            errors = error.details.get("writeErrors", [])
+            self.write_errors += len(errors)
+            HUEY_LOGGER.warning(
+                f"{self.name}: {len(errors)} write errors in batch, first: "
+                f"{errors[0].get('errmsg') if errors else error}"
+            )
+        duration = time.perf_counter() - start
+
+        self.batches += 1
+        self.operation_count += len(operations)
+        self.elapsed += duration
+        HUEY_LOGGER.info(
+            f"{self.name}: batch {self.batches} wrote {len(operations)} ops "
+            f"in {duration:.2f}s ({len(operations) / max(duration, 1e-9):.0f} ops/s)"
+        )
+
+    def __enter__(self) -> "BulkWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.flush()
+        HUEY_LOGGER.info(
+            f"{self.name}: {self.operation_count} ops in {self.batches} batches, "
+            f"{self.elapsed:.2f}s spent writing"
+        )
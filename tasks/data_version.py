@@ -0,0 +1,42 @@
+"""Version token of the served card data.
+
+The API caches its card responses in Redis under keys holding the current
+data version (see ``api.helpers.cache``). Bumping the version once an
+ingest has written its changes makes every cached response stale at once,
+the entries of older versions expire with their TTL.
+
+Failing to reach Redis never fails an ingest: the cached responses are
+then refreshed when they expire.
+"""
+
+import logging
+from typing import Optional
+
+import redis
+
+from common.constants import DATA_VERSION_KEY, REDIS_URL
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def bump_data_version(client: Optional[redis.Redis] = None) -> Optional[int]:
+    """Increment the data version read by the API response cache.
+
+    Args:
+        client: Redis client, defaults to one connected to ``REDIS_URL``
+
+    Returns:
+        The new version, None if Redis could not be reached
+    """
+    try:
+        if client is None:
+            client = redis.Redis.from_url(REDIS_URL, socket_timeout=5)
+        version = client.incr(DATA_VERSION_KEY)
+    except redis.RedisError as error:
+        HUEY_LOGGER.warning(
+            f"Data version not bumped, cached responses expire with their TTL: {error}"
+        )
+        return None
+
+    HUEY_LOGGER.info(f"Data version bumped to {version}")
+    return version
@@ -0,0 +1,108 @@
+"""Bounded-memory sort of the bulk file cards by id.
+
+The merge-join sync (see ``tasks.sync``) needs the cards of the bulk file
+sorted by ``id``, which the file is not. Sorting the parsed dump with
+``sorted`` holds every card as Python objects, several times the size of
+the 2+ GB file. Here cards are kept BSON encoded, which is about the size
+of their JSON, in a buffer of at most ``memory_limit`` bytes. A full buffer
+is sorted and spilled to a run file on disk, and the runs are then merged
+lazily, reading one card at a time from each run.
+"""
+
+import heapq
+import logging
+import os
+import tempfile
+from collections import Counter
+from contextlib import ExitStack
+from operator import itemgetter
+from typing import Iterable, Iterator, Optional
+
+import bson
+
+# Memory budget of the sort buffer, larger inputs are spilled to disk
+SORT_MEMORY_MB = int(os.getenv("INGEST_SORT_MEMORY_MB", "512"))
+# Directory of the spilled runs, defaults to the system temporary directory
+SORT_DIR = os.getenv("INGEST_SORT_DIR") or None
+
+# Python overhead of a buffered (key, bytes) entry on top of the BSON bytes
+ENTRY_OVERHEAD = 120
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+class ExternalSort:
+    """Sort documents by a key with a bounded in-memory buffer.
+
+    Usage:
+        sorter = ExternalSort("id")
+        for card in sorter.sorted(cards):
+            ...
+        sorter.counts  # sorted documents, spilled runs and bytes
+    """
+
+    def __init__(
+        self,
+        key: str = "id",
+        memory_limit: int = SORT_MEMORY_MB * 1024 * 1024,
+        directory: Optional[str] = SORT_DIR,
+    ):
+        """
+        Args:
+            key: Field the documents are sorted by
+            memory_limit: Bytes the buffered documents may take before they
+                are spilled to disk
+            directory: Parent directory of the spilled runs
+        """
+        self.key = key
+        self.memory_limit = memory_limit
+        self.directory = directory
+        self.counts = Counter()
+
+    def _spill(self, buffer: list, path: str) -> None:
+        buffer.sort(key=itemgetter(0))
+        with open(path, "wb") as run:
+            for _, encoded in buffer:
+                run.write(encoded)
+                self.counts["sort_spilled_bytes"] += len(encoded)
+        self.counts["sort_runs"] += 1
+        HUEY_LOGGER.info(f"Sort: spilled run {self.counts['sort_runs']} to {path}")
+        buffer.clear()
+
+    def sorted(self, documents: Iterable[dict]) -> Iterator[dict]:
+        """Iterate over ``documents`` sorted by ``key``.
+
+        The run files are deleted once the iteration ends or is closed.
+        """
+        with tempfile.TemporaryDirectory(
+            prefix="ingest-sort-", dir=self.directory
+        ) as directory:
+            runs = []
+            buffer = []
+            size = 0
+            for document in documents:
+                encoded = bson.encode(document)
+                if buffer and size + len(encoded) + ENTRY_OVERHEAD > self.memory_limit:
+                    runs.append(os.path.join(directory, f"run-{len(runs)}.bson"))
+                    self._spill(buffer, runs[-1])
+                    size = 0
+                buffer.append((document[self.key], encoded))
+                size += len(encoded) + ENTRY_OVERHEAD
+                self.counts["sort_documents"] += 1
+
+            if not runs:
+                buffer.sort(key=itemgetter(0))
+                for _, encoded in buffer:
+                    yield bson.decode(encoded)
+                return
+
+            if buffer:
+                runs.append(os.path.join(directory, f"run-{len(runs)}.bson"))
+                self._spill(buffer, runs[-1])
+
+            with ExitStack() as stack:
+                files = [stack.enter_context(open(run, "rb")) for run in runs]
+                yield from heapq.merge(
+                    *(bson.decode_file_iter(file) for file in files),
+                    key=itemgetter(self.key),
+                )
@@ -1,18 +1,29 @@
-import json
 import logging
 import os
 from datetime import datetime
-from urllib.request import urlretrieve
 
-from pymongo import InsertOne, MongoClient, UpdateOne
+import ijson
+from pymongo import MongoClient
 from requests import get
-from tqdm import tqdm
-from unidecode import unidecode
 
-from tasks.indexes import INDEX_BASE, TEXT_INDEX, TEXT_INDEX_OPTION
-from tasks.obj_utils import yield_differences
+from tasks.bulk_stream import open_bulk_stream
+from tasks.data_version import bump_data_version
+from tasks.external_sort import SORT_MEMORY_MB, ExternalSort
+from tasks.history import (
+    EDHREC_COLLECTION,
+    HISTORY_MODE,
+    LATEST_COLLECTION,
+    PRICES_COLLECTION,
+)
+from tasks.index_admin import apply_index_profile
+from tasks.indexes import INDEX_PROFILE, ORACLE_INDEXES
+from tasks.ingest_runs import IngestRun
+from tasks.oracle_cards import ORACLE_COLLECTION
+from tasks.search_index import SEARCH_INDEX, get_search_client
+from tasks.sets import SETS_COLLECTION, refresh_sets
+from tasks.storage import raw_collection
+from tasks.sync import sync_cards
 
-DOWNLOAD_FILENAME = "latest_cards.json"
 API_URL = "https://api.scryfall.com/bulk-data"
 
 DATABASE = os.getenv("DATABASE", "mtg")
@@ -25,8 +36,9 @@ HUEY_LOGGER = logging.getLogger("huey")
 
 
 def read_file(file_path: str):
-    with open(file_path) as file:
-        return json.loads(file.read())
+    """Stream the cards of a downloaded bulk file."""
+    with open(file_path, "rb") as file:
+        yield from ijson.items(file, "item", use_float=True)
 
 
 class ProgressBar:
@@ -45,108 +57,95 @@ class ProgressBar:
             HUEY_LOGGER.info(f"Downloading {progress_update:.2f}%")
 
 
+def stream_cards(raw_cards_uri: str):
+    progress_bar = ProgressBar()
+    with open_bulk_stream(
+        raw_cards_uri,
+        progress_hook=lambda read, total: progress_bar.progress_hook(1, read, total),
+    ) as stream:
+        yield from ijson.items(stream, "item", use_float=True)
+
+
 def load_dataset():
+    """Bulk data entry of the ``all_cards`` file and a stream of its cards."""
     result = get(API_URL)
     bulk_data = result.json()["data"]
     all_cards = next(filter(lambda x: x["type"] == "all_cards", bulk_data), None)
-    raw_cards_uri = all_cards["download_uri"]
 
-    progress_bar = ProgressBar()
-    urlretrieve(
-        raw_cards_uri,
-        DOWNLOAD_FILENAME,
-        reporthook=progress_bar.progress_hook,
-    )
-
-    return datetime.fromisoformat(all_cards["updated_at"]), read_file(DOWNLOAD_FILENAME)
+    return all_cards, stream_cards(all_cards["download_uri"])
 
 
-def get_dbs():
+def get_database():
     client = MongoClient(
         f"mongodb://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}"
     )
-    db = client[DATABASE]
+    return client[DATABASE]
+
+
+def get_dbs(db=None):
+    db = db if db is not None else get_database()
     card_collection = db["cards"]
 
-    base_indexes = card_collection.create_indexes(INDEX_BASE)
-    text_index = card_collection.create_indexes(TEXT_INDEX, **TEXT_INDEX_OPTION)
-    HUEY_LOGGER.info(f"Indexes validated: {len(base_indexes)}, {len(text_index)}")
-    card_stocks_daily = db["card_stocks_daily"]
-    edhrec_daily = db["edhrec_daily"]
+    # Only creates the missing indexes, the profile includes the id index
+    # used for the sorted walk of the stored cards
+    apply_index_profile(card_collection, INDEX_PROFILE)
+    card_stocks_monthly = db[PRICES_COLLECTION]
+    edhrec_monthly = db[EDHREC_COLLECTION]
+    latest_prices = db[LATEST_COLLECTION] if HISTORY_MODE == "delta" else None
+    oracle_cards = db[ORACLE_COLLECTION]
+    oracle_cards.create_indexes(ORACLE_INDEXES)
+
+    return (
+        card_collection,
+        card_stocks_monthly,
+        edhrec_monthly,
+        latest_prices,
+        oracle_cards,
+    )
+
 
-    return card_collection, card_stocks_daily, edhrec_daily
+def update_cards_db(memory_limit_mb: int = SORT_MEMORY_MB):
+    """Synchronize the cards collection with the ``all_cards`` bulk file.
 
+    The streamed cards are sorted by id with at most ``memory_limit_mb`` of
+    them in memory, the rest is spilled to disk (see ``tasks.external_sort``).
 
-def update_cards_db():
+    Returns:
+        The ``ingest_runs`` document of the run, with its counts and peak
+        memory
+    """
     HUEY_LOGGER.info("Loading dataset")
-    date, cards = load_dataset()
-    card_collection, card_stocks_daily, edhrec_daily = get_dbs()
-
-    batch_updates = []
-    price_updates = []
-    edhrec_update = []
-
-    sorted_cards = sorted(cards, key=lambda x: x["id"])
-    sorted_existing = card_collection.find().sort("id", 1)
-    next_existing = next(sorted_existing, None)
-
-    for card in tqdm(sorted_cards):
-        card_id = card["id"]
-        card["name_search"] = unidecode(card["name"]).lower()
-
-        if card.get("_id"):
-            HUEY_LOGGER.warning(f"Card should not have an _id, {card}")
-            break
-
-        prices = {
-            price_key: (
-                card["prices"][price_key]
-                if not card["prices"][price_key]
-                else float(card["prices"][price_key])
-            )
-            for price_key in card["prices"]
-        }
-        price_updates.append(
-            InsertOne({"date": date, "card_id": card_id, "prices": prices})
-        )
-        edhrec_update.append(
-            InsertOne(
-                {
-                    "date": date,
-                    "card_id": card_id,
-                    "edhrec_rank": card.get("edhrec_rank", None),
-                }
+    all_cards, cards = load_dataset()
+    date = datetime.fromisoformat(all_cards["updated_at"])
+    db = get_database()
+    (
+        card_collection,
+        card_stocks_monthly,
+        edhrec_monthly,
+        latest_prices,
+        oracle_cards,
+    ) = get_dbs(db)
+
+    sorter = ExternalSort("id", memory_limit_mb * 1024 * 1024)
+    with IngestRun(
+        db["ingest_runs"], all_cards["type"], all_cards["download_uri"], date
+    ) as run:
+        run.counts.update(
+            sync_cards(
+                sorter.sorted(cards),
+                date,
+                card_collection,
+                card_stocks_monthly,
+                edhrec_monthly,
+                latest_prices,
+                oracle_cards,
+                get_search_client() if SEARCH_INDEX else None,
+                raw_collection(db),
             )
         )
+        run.counts.update(sorter.counts)
+        run.counts.update(refresh_sets(card_collection, db[SETS_COLLECTION]))
+        HUEY_LOGGER.info(f"Cards synced: {dict(run.counts)}")
 
-        del card["prices"]
-        if "edhrec_rank" in card:
-            del card["edhrec_rank"]
-
-        if not next_existing or next_existing["id"] != card_id:
-            batch_updates.append(InsertOne(card))
-            continue
-
-        db_id = next_existing["_id"]
-        del next_existing["_id"]
-
-        update = {}
-        for key, before, after in yield_differences(next_existing, card):
-            update[key] = after
-
-        if update:
-            batch_updates.append(UpdateOne({"_id": db_id}, {"$set": update}))
-
-        next_existing = next(sorted_existing, None)
-
-        if batch_updates:
-            HUEY_LOGGER.info(f"Batch updates: {len(batch_updates)}")
-            card_collection.bulk_write(batch_updates)
-
-        if price_updates:
-            HUEY_LOGGER.info(f"Price updates: {len(price_updates)}")
-            card_stocks_daily.bulk_write(price_updates)
-
-        if edhrec_update:
-            HUEY_LOGGER.info(f"Edhrec updates: {len(edhrec_update)}")
-            edhrec_daily.bulk_write(edhrec_update)
+    bump_data_version()
+    return run.document
@@ -0,0 +1,286 @@
+"""Monthly bucketed storage of the per-card price and EDHREC history.
+
+Instead of one document per card and per day, each card has one bucket per
+month holding its daily values keyed by day of month::
+
+    {
+        "_id": "<card_id>:2025-01",
+        "card_id": "<card_id>",
+        "month": datetime(2025, 1, 1),
+        "days": {"01": {...}, "02": {...}},
+    }
+
+Writes are idempotent upserts of a single day, so re-running an ingest for
+the same date rewrites the same value instead of adding a duplicate.
+
+In ``delta`` mode a day is only written when the value differs from the
+last known one, kept in the ``latest_prices`` collection, and histories
+are read back as a step function. The last known values are only written
+once the buckets of the same cards are, so an interrupted run never
+records a value whose history write was lost.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from pymongo import ASCENDING, IndexModel, UpdateOne
+
+from tasks.bulk_writer import BATCH_SIZE, BulkWriter
+
+PRICES_COLLECTION = "card_stocks_monthly"
+EDHREC_COLLECTION = "edhrec_monthly"
+LATEST_COLLECTION = "latest_prices"
+
+# "delta" only stores values that changed since the last run, "full" every day
+HISTORY_MODE = os.getenv("INGEST_HISTORY_MODE", "delta")
+
+HISTORY_INDEXES = [IndexModel([("card_id", ASCENDING), ("month", ASCENDING)])]
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def _utc(date: datetime) -> datetime:
+    if date.tzinfo is None:
+        return date
+    return date.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def bucket_id(card_id: str, date: datetime) -> str:
+    return f"{card_id}:{_utc(date):%Y-%m}"
+
+
+def bucket_update(card_id: str, date: datetime, value) -> UpdateOne:
+    """Upsert the value of one day in the monthly bucket of a card."""
+    date = _utc(date)
+    return UpdateOne(
+        {"_id": bucket_id(card_id, date)},
+        {
+            "$set": {f"days.{date:%d}": value},
+            "$setOnInsert": {
+                "card_id": card_id,
+                "month": datetime(date.year, date.month, 1),
+            },
+        },
+        upsert=True,
+    )
+
+
+def snapshot_digest(value) -> int:
+    """Compact stable digest of a daily value, used to detect changes."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return int.from_bytes(
+        hashlib.blake2b(encoded.encode(), digest_size=8).digest(), "big", signed=True
+    )
+
+
+def load_latest_values(collection) -> dict[str, tuple]:
+    """Map card ids to their last written ``(prices_hash, edhrec_rank)``."""
+    return {
+        latest["_id"]: (latest.get("prices_hash"), latest.get("edhrec_rank"))
+        for latest in collection.find(
+            {}, {"_id": 1, "prices_hash": 1, "edhrec_rank": 1}
+        )
+    }
+
+
+def latest_update(card_id: str, date: datetime, **values) -> UpdateOne:
+    """Upsert the last known values of a card."""
+    return UpdateOne(
+        {"_id": card_id},
+        {"$set": {**values, "date": _utc(date)}},
+        upsert=True,
+    )
+
+
+class HistoryWriter:
+    """Write the daily prices and EDHREC rank of normalized cards.
+
+    With a ``latest`` collection (delta mode), values are only written on
+    the days they differ from the last known ones, loaded in memory once.
+    Without it every day is written.
+
+    The updates of the last known values are queued and only written after
+    the bucket writers holding the same days have flushed without error.
+
+    Usage:
+        with HistoryWriter(prices, edhrec, latest) as history:
+            history.add(card, date)
+    """
+
+    def __init__(self, prices, edhrec, latest=None, batch_size: int = BATCH_SIZE):
+        """
+        Args:
+            prices: Monthly price buckets collection
+            edhrec: Monthly EDHREC rank buckets collection
+            latest: Last known values collection, enables delta mode
+            batch_size: Forwarded to the bulk writers
+        """
+        self.delta = latest is not None
+        self.latest_values = load_latest_values(latest) if self.delta else {}
+        self.prices_writer = BulkWriter(prices, batch_size)
+        self.edhrec_writer = BulkWriter(edhrec, batch_size)
+        self.latest_writer = BulkWriter(latest, batch_size) if self.delta else None
+        self.batch_size = batch_size
+        self.pending_latest = []
+        self.counts = Counter()
+        self.stack = ExitStack()
+
+    def add(self, card, date: datetime) -> None:
+        """Write the values of a ``NormalizedCard`` for ``date`` if needed."""
+        latest = self.latest_values.get(card.id)
+        prices_changed = not latest or latest[0] != card.prices_hash
+        edhrec_changed = not latest or latest[1] != card.edhrec_rank
+
+        if not self.delta or prices_changed:
+            self.prices_writer.add(bucket_update(card.id, date, card.prices))
+            self.counts["prices_written"] += 1
+        if not self.delta or edhrec_changed:
+            self.edhrec_writer.add(bucket_update(card.id, date, card.edhrec_rank))
+            self.counts["edhrec_written"] += 1
+        if self.delta and (prices_changed or edhrec_changed):
+            self.pending_latest.append(
+                latest_update(
+                    card.id,
+                    date,
+                    prices=card.prices,
+                    prices_hash=card.prices_hash,
+                    edhrec_rank=card.edhrec_rank,
+                )
+            )
+            if len(self.pending_latest) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Send the buffered buckets, then the queued last known values.
+
+        The last known values are dropped when a bucket write failed, the
+        next run sees the values as changed and writes their buckets again.
+        """
+        buckets = (self.prices_writer, self.edhrec_writer)
+        errors = sum(writer.write_errors for writer in buckets)
+        for writer in buckets:
+            writer.flush()
+        if not self.delta:
+            return
+
+        pending, self.pending_latest = self.pending_latest, []
+        if sum(writer.write_errors for writer in buckets) > errors:
+            HUEY_LOGGER.warning(
+                f"History buckets write errors, {len(pending)} latest values "
+                "not updated"
+            )
+            return
+        self.latest_writer.extend(pending)
+        self.latest_writer.flush()
+
+    def __enter__(self) -> "HistoryWriter":
+        for writer in (self.prices_writer, self.edhrec_writer, self.latest_writer):
+            if writer is not None:
+                self.stack.enter_context(writer)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        # The writers would flush in reverse order, the buckets go first
+        try:
+            self.flush()
+        finally:
+            self.stack.close()
+
+
+def read_history(
+    collection,
+    card_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> list[dict]:
+    """Daily values of a card, oldest first, as ``{"date", "value"}`` dicts."""
+    start = _utc(start) if start else None
+    end = _utc(end) if end else None
+
+    query = {"card_id": card_id}
+    month_range = {}
+    if start:
+        month_range["$gte"] = datetime(start.year, start.month, 1)
+    if end:
+        month_range["$lte"] = end
+    if month_range:
+        query["month"] = month_range
+
+    history = []
+    for bucket in collection.find(query).sort("month", 1):
+        for day, value in sorted(bucket["days"].items()):
+            date = bucket["month"].replace(day=int(day))
+            if (start and date < start) or (end and date > end):
+                continue
+            history.append({"date": date, "value": value})
+
+    return history
+
+
+def read_step_history(
+    collection,
+    card_id: str,
+    start: datetime,
+    end: datetime,
+) -> list[dict]:
+    """Daily values of a card from ``start`` to ``end`` included.
+
+    Values written in delta mode only exist on the days they changed, each
+    day here carries the last value written on or before it. Days before
+    the first known value are omitted.
+    """
+    start, end = _utc(start), _utc(end)
+    changes = read_history(collection, card_id, end=end)
+
+    history = []
+    index = 0
+    value = None
+    known = False
+    day = datetime(start.year, start.month, start.day)
+    while day <= end:
+        while index < len(changes) and changes[index]["date"] <= day:
+            value = changes[index]["value"]
+            known = True
+            index += 1
+        if known:
+            history.append({"date": day, "value": value})
+        day += timedelta(days=1)
+
+    return history
+
+
+def migrate_daily_history(daily, monthly, value_field: str, **writer_options) -> int:
+    """Copy a legacy one-document-per-day collection into monthly buckets.
+
+    The migration is idempotent and can be stopped and run again.
+
+    Args:
+        daily: Legacy collection with ``card_id``, ``date`` and ``value_field``
+        monthly: Bucket collection to fill
+        value_field: Field holding the daily value, ``prices`` or ``edhrec_rank``
+        **writer_options: Forwarded to BulkWriter
+
+    Returns:
+        Number of daily documents migrated
+    """
+    monthly.create_indexes(HISTORY_INDEXES)
+
+    count = 0
+    with BulkWriter(monthly, **writer_options) as writer:
+        for snapshot in daily.find(
+            {}, {"_id": 0, "card_id": 1, "date": 1, value_field: 1}
+        ):
+            writer.add(
+                bucket_update(
+                    snapshot["card_id"], snapshot["date"], snapshot.get(value_field)
+                )
+            )
+            count += 1
+
+    return count
@@ -1,18 +1,52 @@
 import logging
 import os
+from collections import Counter
+from contextlib import nullcontext
 from datetime import datetime
+from itertools import islice
+from typing import Callable, Optional
 from urllib.request import urlretrieve
 
+import bson
 import ijson
-from pymongo import InsertOne, MongoClient, UpdateOne
+from bson.raw_bson import RawBSONDocument
+from pymongo import InsertOne, MongoClient
 from requests import get
-from unidecode import unidecode
 
-from tasks.obj_utils import yield_differences
+from tasks.bulk_stream import open_bulk_stream, open_replay
+from tasks.bulk_writer import BATCH_SIZE, BulkWriter
+from tasks.data_version import bump_data_version
+from tasks.history import (
+    EDHREC_COLLECTION,
+    HISTORY_INDEXES,
+    HISTORY_MODE,
+    LATEST_COLLECTION,
+    PRICES_COLLECTION,
+    HistoryWriter,
+)
+from tasks.index_admin import apply_index_profile, bulk_load_indexes
+from tasks.indexes import BULK_LOAD, DIGEST_INDEX_NAME, INDEX_PROFILE, ORACLE_INDEXES
+from tasks.ingest_runs import (
+    CHECKPOINT_INTERVAL,
+    IngestRun,
+    is_already_ingested,
+    resumable_run,
+)
+from tasks.normalize import WORKERS, normalized_batches
+from tasks.oracle_cards import ORACLE_COLLECTION, OracleCardsWriter
+from tasks.search_index import SEARCH_INDEX, get_search_client, sync_search_index
+from tasks.sets import SETS_COLLECTION, refresh_sets
+from tasks.storage import raw_collection, raw_update
+from tasks.sync import TOMBSTONE_FIELD, card_updates
 
 DOWNLOAD_FILENAME = "latest_cards.json"
 API_URL = "https://api.scryfall.com/bulk-data"
 
+# Parse the bulk file while downloading it instead of going through the disk
+STREAM_DOWNLOAD = os.getenv("INGEST_STREAM", "true").lower() == "true"
+# Optional path of a gzip copy of the streamed file, to replay an ingest
+REPLAY_COPY_PATH = os.getenv("INGEST_REPLAY_COPY") or None
+
 DATABASE = os.getenv("DATABASE", "mtg")
 DATABASE_HOST = os.getenv("DATABASE_HOSTNAME", "mtg")
 DATABASE_PORT = os.getenv("DATABASE_PORT", "27017")
@@ -22,20 +56,26 @@ DATABASE_PASSWORD = os.getenv("DATABASE_PASSWORD", "root")
 HUEY_LOGGER = logging.getLogger("huey")
 
 
-def get_dbs():
+def get_database(name: str = DATABASE):
     client = MongoClient(
         f"mongodb://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}"
     )
-    db = client[DATABASE]
+    return client[name]
+
+
+def get_dbs(db=None):
+    db = db if db is not None else get_database()
     card_collection = db["cards"]
 
-    # base_indexes = card_collection.create_indexes(INDEX_BASE)
-    # text_index = card_collection.create_indexes(TEXT_INDEX, **TEXT_INDEX_OPTION)
-    # HUEY_LOGGER.info(f"Indexes validated: {len(base_indexes)}, {len(text_index)}")
-    card_stocks_daily = db["card_stocks_daily"]
-    edhrec_daily = db["edhrec_daily"]
+    apply_index_profile(card_collection, INDEX_PROFILE)
+    card_stocks_monthly = db[PRICES_COLLECTION]
+    edhrec_monthly = db[EDHREC_COLLECTION]
+    card_stocks_monthly.create_indexes(HISTORY_INDEXES)
+    edhrec_monthly.create_indexes(HISTORY_INDEXES)
+    oracle_cards = db[ORACLE_COLLECTION]
+    oracle_cards.create_indexes(ORACLE_INDEXES)
 
-    return card_collection, card_stocks_daily, edhrec_daily
+    return card_collection, card_stocks_monthly, edhrec_monthly, oracle_cards
 
 
 class ProgressBar:
@@ -65,80 +105,260 @@ class ProgressBar:
             self.progress = progress_update
             HUEY_LOGGER.info(f"{self.text} {progress_update:.2f}%")
 
+    def progress_hook_bytes(self, read, totalsize):
+        self.progress_hook_urlretrieve(1, read, totalsize)
 
-def i_fetch_dataset():
-    card_collection, card_stocks_daily, edhrec_daily = get_dbs()
 
-    result = get(API_URL)
-    bulk_data = result.json()["data"]
-    all_cards = next(filter(lambda x: x["type"] == "all_cards", bulk_data), None)
-    raw_cards_uri = all_cards["download_uri"]
-    last_update_datetime = datetime.fromisoformat(all_cards["updated_at"])
+def ingest_cards(
+    cards,
+    last_update_datetime: datetime,
+    card_collection,
+    card_stocks_monthly,
+    edhrec_monthly,
+    latest_prices=None,
+    oracle_cards=None,
+    search_client=None,
+    raw_cards=None,
+    batch_size: int = BATCH_SIZE,
+    workers: Optional[int] = None,
+    total: int = 500000,
+    resume_from: int = 0,
+    on_checkpoint: Optional[Callable[[int, Counter], None]] = None,
+    checkpoint_interval: int = CHECKPOINT_INTERVAL,
+):
+    """Write cards and their daily price/EDHREC values in batches.
+
+    Cards are normalized by ``workers`` processes (see ``tasks.normalize``)
+    and written here, in order, by a single writer.
+
+    Each card stores a ``content_hash`` of its normalized content. Stored
+    hashes are read once per batch through the covering ``id_digest``
+    index, and only cards whose hash changed are read in full and diffed.
+
+    With a ``latest_prices`` collection, prices and EDHREC ranks are only
+    written on the days they differ from the last known values, loaded in
+    memory once at the start of the run. Without it every day is written.
+
+    With an ``oracle_cards`` collection, the oracles whose printings were
+    inserted or updated are rebuilt once the cards are written.
+    With a ``search_client`` as well, the rebuilt oracle cards are then
+    pushed to the Meilisearch ``cards`` index.
+
+    With a ``raw_cards`` collection, the untrimmed version of the inserted
+    and changed cards is written to it (see ``tasks.storage``).
+
+    Every ``checkpoint_interval`` cards the writers are flushed and
+    ``on_checkpoint`` is called with the number of cards of ``cards``
+    processed so far. A resumed run skips the first ``resume_from`` cards
+    and rebuilds every oracle card, the oracles touched before the
+    interruption are not known.
+
+    Returns:
+        Counter with the number of ``cards`` processed and how many were
+        ``inserted``, ``updated`` or ``unchanged``, plus the number of
+        ``prices_written`` and ``edhrec_written`` history values and the
+        oracle cards and search index counts.
+    """
+    pb_cards = ProgressBar("Process cards", total)
+    counts = Counter()
+    checkpointed = 0
+    if resume_from:
+        cards = islice(cards, resume_from, None)
+    oracles = OracleCardsWriter(card_collection, oracle_cards, batch_size)
+
+    with (
+        BulkWriter(card_collection, batch_size) as cards_writer,
+        HistoryWriter(
+            card_stocks_monthly, edhrec_monthly, latest_prices, batch_size
+        ) as history,
+        (
+            BulkWriter(raw_cards, batch_size)
+            if raw_cards is not None
+            else nullcontext()
+        ) as raw_writer,
+    ):
+        for batch in normalized_batches(
+            cards, batch_size, WORKERS if workers is None else workers
+        ):
+            stored_cards = {
+                existing["id"]: existing
+                for existing in card_collection.find(
+                    {"id": {"$in": [card.id for card in batch]}},
+                    {
+                        "_id": 0,
+                        "id": 1,
+                        "content_hash": 1,
+                        "oracle_id": 1,
+                        TOMBSTONE_FIELD: 1,
+                    },
+                ).hint(DIGEST_INDEX_NAME)
+            }
+            changed_cards = []
+
+            for card in batch:
+                pb_cards.progress_hook_index(resume_from + counts["cards"])
+                counts["cards"] += 1
+                history.add(card, last_update_datetime)
+                oracles.rank(card.oracle_id, card.edhrec_rank)
+
+                stored = stored_cards.get(card.id)
+                if (
+                    raw_writer is not None
+                    and card.raw is not None
+                    and (
+                        stored is None
+                        or stored.get("content_hash") != card.content_hash
+                    )
+                ):
+                    raw_writer.add(raw_update(card))
+
+                if stored is None:
+                    cards_writer.add(InsertOne(RawBSONDocument(card.document)))
+                    counts["inserted"] += 1
+                    oracles.touch(card.oracle_id)
+                elif (
+                    stored.get("content_hash") == card.content_hash
+                    and stored.get(TOMBSTONE_FIELD) is None
+                ):
+                    counts["unchanged"] += 1
+                else:
+                    changed_cards.append(bson.decode(card.document))
+                    oracles.touch(card.oracle_id)
+                    oracles.touch(stored.get("oracle_id"))
+
+            if changed_cards:
+                for operation in card_updates(card_collection, changed_cards):
+                    if operation:
+                        cards_writer.add(operation)
+                        counts["updated"] += 1
+                    else:
+                        counts["unchanged"] += 1
+
+            if on_checkpoint and counts["cards"] - checkpointed >= checkpoint_interval:
+                cards_writer.flush()
+                history.flush()
+                if raw_writer is not None:
+                    raw_writer.flush()
+                checkpointed = counts["cards"]
+                on_checkpoint(resume_from + checkpointed, counts + history.counts)
+
+    counts.update(history.counts)
+    if oracle_cards is not None:
+        if resume_from:
+            oracles.touch_all()
+        counts.update(oracles.refresh())
+        if search_client is not None:
+            counts.update(
+                sync_search_index(
+                    search_client,
+                    oracle_cards,
+                    oracles.written,
+                    oracles.deleted,
+                    batch_size=batch_size,
+                )
+            )
+    return counts
+
+
+def open_cards_source(raw_cards_uri: str, replay_path: Optional[str] = None):
+    """Open the bulk file, streamed from Scryfall unless replaying a copy."""
+    if replay_path:
+        HUEY_LOGGER.info(f"Replaying {replay_path}")
+        return open_replay(replay_path)
 
     pb_download = ProgressBar("Download file")  # 500k cards
+    if STREAM_DOWNLOAD:
+        return open_bulk_stream(
+            raw_cards_uri,
+            copy_path=REPLAY_COPY_PATH,
+            progress_hook=pb_download.progress_hook_bytes,
+        )
+
     urlretrieve(
         raw_cards_uri,
         DOWNLOAD_FILENAME,
         reporthook=pb_download.progress_hook_urlretrieve,
     )
+    return open(DOWNLOAD_FILENAME, "rb")
 
-    with open(DOWNLOAD_FILENAME, "rb") as f:
-        HUEY_LOGGER.info("Processing cards")
-        cards = ijson.items(f, "item", use_float=True)
-        pb_cards = ProgressBar("Process cards", 500000)  # 500k cards
-        for index, card in enumerate(cards):
-            pb_cards.progress_hook_index(index)
-            card_id = card["id"]
-            card["name_search"] = unidecode(card["name"]).lower()
-
-            prices = {
-                price_key: (
-                    card["prices"][price_key]
-                    if not card["prices"][price_key]
-                    else float(card["prices"][price_key])
-                )
-                for price_key in card["prices"]
-            }
-            card_stocks_daily.bulk_write(
-                [
-                    InsertOne(
-                        {
-                            "date": last_update_datetime,
-                            "card_id": card_id,
-                            "prices": prices,
-                        }
-                    )
-                ]
-            )
-            edhrec_daily.bulk_write(
-                [
-                    InsertOne(
-                        {
-                            "date": last_update_datetime,
-                            "card_id": card_id,
-                            "edhrec_rank": card.get("edhrec_rank", None),
-                        }
-                    )
-                ]
-            )
 
-            del card["prices"]
-            if "edhrec_rank" in card:
-                del card["edhrec_rank"]
+def i_fetch_dataset(
+    force: bool = False,
+    replay_path: Optional[str] = None,
+    bulk_load: bool = BULK_LOAD,
+):
+    """Ingest the Scryfall ``all_cards`` bulk file.
+
+    Args:
+        force: Process the bulk file even if its ``updated_at`` was already
+            ingested by a successful run
+        replay_path: Ingest a copy kept by a previous run instead of
+            downloading the bulk file
+        bulk_load: Drop the secondary indexes of the cards collection during
+            the ingest and rebuild them after
 
-            next_existing = card_collection.find_one({"id": card_id})
-            if not next_existing:
-                card_collection.insert_one(card)
-                continue
+    Returns:
+        The ``ingest_runs`` document of the run, None if it was skipped
+    """
+    db = get_database()
+    card_collection, card_stocks_monthly, edhrec_monthly, oracle_cards = get_dbs(db)
+    ingest_runs = db["ingest_runs"]
 
-            db_id = next_existing["_id"]
-            del next_existing["_id"]
+    result = get(API_URL)
+    bulk_data = result.json()["data"]
+    all_cards = next(filter(lambda x: x["type"] == "all_cards", bulk_data), None)
+    raw_cards_uri = all_cards["download_uri"]
+    last_update_datetime = datetime.fromisoformat(all_cards["updated_at"])
 
-            update = {}
-            for key, before, after in yield_differences(next_existing, card):
-                update[key] = after
+    if not force and is_already_ingested(
+        ingest_runs, all_cards["type"], last_update_datetime
+    ):
+        HUEY_LOGGER.info(
+            f"Bulk data from {last_update_datetime} already ingested, skipping"
+        )
+        return None
 
-            if update:
-                card_collection.bulk_write(
-                    [UpdateOne({"_id": db_id}, {"$set": update})]
-                )
+    with (
+        IngestRun(
+            ingest_runs,
+            all_cards["type"],
+            raw_cards_uri,
+            last_update_datetime,
+            resume=resumable_run(ingest_runs, all_cards["type"], last_update_datetime),
+        ) as run,
+        open_cards_source(raw_cards_uri, replay_path) as f,
+        (
+            bulk_load_indexes(card_collection, INDEX_PROFILE)
+            if bulk_load
+            else nullcontext()
+        ),
+    ):
+        HUEY_LOGGER.info("Processing cards")
+        cards = ijson.items(f, "item", use_float=True)
+        run.counts.update(
+            ingest_cards(
+                cards,
+                last_update_datetime,
+                card_collection,
+                card_stocks_monthly,
+                edhrec_monthly,
+                db[LATEST_COLLECTION] if HISTORY_MODE == "delta" else None,
+                oracle_cards,
+                get_search_client() if SEARCH_INDEX else None,
+                raw_collection(db),
+                resume_from=run.position,
+                on_checkpoint=run.checkpoint,
+            )
+        )
+        HUEY_LOGGER.info(
+            f"Processed {run.counts['cards']} cards: "
+            f"{run.counts.get('inserted', 0)} inserted, "
+            f"{run.counts.get('updated', 0)} updated, "
+            f"{run.counts.get('unchanged', 0)} unchanged, "
+            f"{run.counts.get('prices_written', 0)} prices and "
+            f"{run.counts.get('edhrec_written', 0)} EDHREC ranks written"
+        )
+        run.counts.update(refresh_sets(card_collection, db[SETS_COLLECTION]))
+
+    bump_data_version()
+    return run.document
@@ -0,0 +1,171 @@
+"""Declarative index profiles and index usage audit of the cards collection.
+
+A profile from ``tasks.indexes.INDEX_PROFILES`` lists every secondary index
+the collection should have. Applying it creates the missing ones and, when
+pruning, drops the others. During a large ingest the secondary indexes can
+be dropped and rebuilt once at the end instead of being maintained on every
+write.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Optional
+
+from tasks.indexes import (
+    DIGEST_INDEX_NAME,
+    INDEX_PROFILES,
+    ORACLE_PRINTINGS_INDEX_NAME,
+    RETIRED_INDEX_NAMES,
+)
+
+ID_INDEX_NAME = "_id_"
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def profile_indexes(profile: str) -> list:
+    """Index models of a profile.
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in INDEX_PROFILES:
+        raise ValueError(
+            f"Unknown index profile {profile!r}, expected one of {list(INDEX_PROFILES)}"
+        )
+    return INDEX_PROFILES[profile]
+
+
+def apply_index_profile(collection, profile: str, prune: bool = False) -> dict:
+    """Create the missing indexes of a profile.
+
+    Indexes of ``RETIRED_INDEX_NAMES`` are always dropped.
+
+    Args:
+        collection: Collection to index
+        profile: Name of the profile in ``INDEX_PROFILES``
+        prune: Also drop the secondary indexes not in the profile
+
+    Returns:
+        Names of the ``created`` and ``dropped`` indexes
+    """
+    models = profile_indexes(profile)
+    wanted = {model.document["name"] for model in models}
+    existing = collection.index_information()
+
+    dropped = []
+    for name in existing:
+        if name == ID_INDEX_NAME or name in wanted:
+            continue
+        if prune or name in RETIRED_INDEX_NAMES:
+            collection.drop_index(name)
+            dropped.append(name)
+
+    missing = [model for model in models if model.document["name"] not in existing]
+    created = collection.create_indexes(missing) if missing else []
+    HUEY_LOGGER.info(
+        f"Index profile {profile}: {len(created)} created, {len(dropped)} dropped"
+    )
+    return {"created": created, "dropped": dropped}
+
+
+@contextmanager
+def bulk_load_indexes(
+    collection,
+    profile: str,
+    keep=(DIGEST_INDEX_NAME, ORACLE_PRINTINGS_INDEX_NAME),
+):
+    """Drop the secondary indexes for the duration of a bulk load.
+
+    The indexes of ``profile`` are rebuilt on exit, also when the load
+    fails, so the API is not left without indexes.
+
+    Args:
+        collection: Collection being loaded
+        profile: Profile rebuilt on exit
+        keep: Indexes the load itself relies on
+    """
+    profile_indexes(profile)
+    for name in collection.index_information():
+        if name != ID_INDEX_NAME and name not in keep:
+            collection.drop_index(name)
+            HUEY_LOGGER.info(f"Bulk load: dropped index {name}")
+    try:
+        yield
+    finally:
+        apply_index_profile(collection, profile)
+
+
+def _plan_key(key) -> str:
+    """Key pattern of an index as written in a profiler ``planSummary``."""
+    fields = ", ".join(
+        f"{field}: {int(direction)}"
+        if isinstance(direction, (int, float))
+        else f'{field}: "{direction}"'
+        for field, direction in key
+    )
+    return f"{{ {fields} }}"
+
+
+def index_usage(collection, profile_collection=None) -> list[dict]:
+    """Usage of each index of a collection.
+
+    Args:
+        collection: Indexed collection
+        profile_collection: The database ``system.profile`` collection, to
+            also count the profiled queries whose plan used each index
+
+    Returns:
+        One dict per index with its ``name``, the ``ops`` counted by
+        ``$indexStats`` since ``since`` (reset on server restart), the
+        ``profiled`` plans using it and whether it looks ``unused``
+    """
+    plans = []
+    if profile_collection is not None:
+        namespace = getattr(collection, "full_name", collection.name)
+        plans = [
+            entry["planSummary"]
+            for entry in profile_collection.find({"ns": namespace}, {"planSummary": 1})
+            if entry.get("planSummary")
+        ]
+
+    information = collection.index_information()
+    usage = []
+    for stats in collection.aggregate([{"$indexStats": {}}]):
+        name = stats["name"]
+        plan_key = _plan_key(information.get(name, {}).get("key", []))
+        profiled = sum(plan_key in plan for plan in plans)
+        ops = stats["accesses"]["ops"]
+        usage.append(
+            {
+                "name": name,
+                "ops": ops,
+                "since": stats["accesses"].get("since"),
+                "profiled": profiled,
+                "unused": name != ID_INDEX_NAME and not ops and not profiled,
+            }
+        )
+
+    return sorted(usage, key=lambda index: (index["ops"], index["name"]))
+
+
+def unused_indexes(usage: list[dict], profile: Optional[str] = None) -> list[str]:
+    """Names of the unused indexes, excluding those of ``profile``.
+
+    Args:
+        usage: Usage of the indexes, see ``index_usage``
+        profile: Profile whose indexes are kept even when unused
+
+    Returns:
+        The unused indexes the profile does not need, candidates to drop
+    """
+    kept = (
+        {model.document["name"] for model in profile_indexes(profile)}
+        if profile
+        else set()
+    )
+    return [
+        index["name"]
+        for index in usage
+        if index["unused"] and index["name"] not in kept
+    ]
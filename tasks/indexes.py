@@ -1,4 +1,6 @@
-from pymongo import ASCENDING, HASHED, TEXT, IndexModel
+import os
+
+from pymongo import ASCENDING, DESCENDING, HASHED, TEXT, IndexModel
 
 INDEX_BASE = [
     # IndexModel([("object", HASHED)]),
@@ -82,6 +84,23 @@ INDEX_BASE = [
     IndexModel([("legalities.predh", HASHED)]),
 ]
 
+# Compound index covering the per-batch lookups of the ingest and the
+# merge scan of the sync, neither of them fetches the documents
+DIGEST_INDEX_NAME = "id_digest"
+DIGEST_INDEX = [
+    IndexModel(
+        [
+            ("id", ASCENDING),
+            ("content_hash", ASCENDING),
+            ("oracle_id", ASCENDING),
+            ("deleted_at", ASCENDING),
+        ],
+        name=DIGEST_INDEX_NAME,
+    )
+]
+# Indexes replaced by another one, dropped when a profile is applied
+RETIRED_INDEX_NAMES = ("id_content_hash",)
+
 TEXT_INDEX = [
     ("name", TEXT),
     ("card_faces.name", TEXT),
@@ -130,3 +149,55 @@ TEXT_INDEX_OPTION = {
         "keywords": 5,
     },
 }
+
+TEXT_INDEX_MODEL = IndexModel(TEXT_INDEX, **TEXT_INDEX_OPTION)
+
+# Printings of an oracle, also read by the ingest to rebuild the oracle cards
+ORACLE_PRINTINGS_INDEX_NAME = "oracle_id_released_at"
+
+# Indexes used by the API routes and the ingest only
+API_MINIMAL_INDEXES = [
+    *DIGEST_INDEX,  # /cards/id/{id} and the ingest lookups
+    IndexModel(
+        [("oracle_id", ASCENDING), ("released_at", DESCENDING)],
+        name=ORACLE_PRINTINGS_INDEX_NAME,
+    ),
+    IndexModel([("name_search", ASCENDING)]),  # prefix regex of /cards/{name}
+    TEXT_INDEX_MODEL,  # /cards/search/{text}
+]
+
+# Indexes of the oracle_cards collection
+ORACLE_INDEXES = [
+    IndexModel([("oracle_id", ASCENDING)]),
+    IndexModel([("name_search", ASCENDING), ("lang", ASCENDING)]),
+    IndexModel(
+        [
+            ("name", TEXT),
+            ("type_line", TEXT),
+            ("card_text", TEXT),
+            ("keywords", TEXT),
+            ("artists", TEXT),
+            ("set_names", TEXT),
+            ("sets", TEXT),
+        ],
+        name="oracle_text_index",
+        weights={
+            "name": 10,
+            "type_line": 10,
+            "card_text": 2,
+            "keywords": 5,
+            "artists": 10,
+            "set_names": 10,
+            "sets": 10,
+        },
+    ),
+]
+
+INDEX_PROFILES = {
+    "api-minimal": API_MINIMAL_INDEXES,
+    "full": [*INDEX_BASE, *API_MINIMAL_INDEXES],
+}
+# Profile of the cards collection indexes created by the ingest
+INDEX_PROFILE = os.getenv("INGEST_INDEX_PROFILE", "api-minimal")
+# Drop the secondary indexes during the ingest and rebuild them after
+BULK_LOAD = os.getenv("INGEST_BULK_LOAD", "false").lower() == "true"
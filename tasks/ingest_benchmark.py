@@ -0,0 +1,138 @@
+"""Ingest throughput benchmark on synthetic datasets.
+
+Each stage ingests a dataset file (see ``tasks.synthetic_cards``) into a
+scratch database the way ``i_fetch_dataset`` does, without the download
+and the Meilisearch index. The stages are datasets (a first load, the same
+file again, a revision), not steps of the ingest pipeline: each figure
+covers the whole ingest of its file. Stages run in order, each in a fresh
+process so the reported peak memory is the stage's own.
+
+Write operations and the bytes the server received over the network are
+read from the ``serverStatus`` counters before and after each stage: they
+are only exact on a local MongoDB no other client writes to. The storage
+written is the growth of the data and indexes of the scratch database
+reported by ``dbStats``; updates in place do not grow it.
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
+
+import ijson
+
+from tasks.bulk_stream import open_replay
+from tasks.history import HISTORY_MODE, LATEST_COLLECTION
+from tasks.ifetch_dataset import DATABASE, get_database, get_dbs, ingest_cards
+from tasks.ingest_runs import peak_rss_mb
+from tasks.storage import raw_collection
+
+BENCHMARK_DATABASE = os.getenv("INGEST_BENCHMARK_DATABASE", "mtg_benchmark")
+# Bulk file date of the first stage, each next stage is a day later
+FIRST_UPDATE = datetime(2025, 1, 1)
+
+
+def server_counters(db) -> dict:
+    """Write operations and network bytes received by the server so far,
+    and the bytes of data and indexes stored in ``db``."""
+    status = db.client.admin.command("serverStatus")
+    operations = status["opcounters"]
+    stats = db.command("dbStats")
+    return {
+        "write_ops": operations["insert"] + operations["update"] + operations["delete"],
+        "bytes_in": status["network"]["bytesIn"],
+        "stored_bytes": stats["dataSize"] + stats["indexSize"],
+    }
+
+
+def ingest_stage(
+    db, path: str, updated_at: datetime, workers: Optional[int] = None
+) -> dict:
+    """Ingest a dataset file into ``db`` and measure it.
+
+    Args:
+        db: Database the cards, history and oracle cards are written to
+        path: Plain or gzip JSON array of cards
+        updated_at: Date of the bulk file, the day of the history values
+        workers: Normalization processes, defaults to ``INGEST_WORKERS``
+
+    Returns:
+        The ``cards`` ingested, the ``duration`` in seconds and
+        ``cards_per_second``, the ``write_ops`` and network ``bytes_in`` of
+        the server, the ``stored_bytes`` growth of ``db``, the
+        ``peak_rss_mb`` of the process and the ingest ``counts``
+    """
+    card_collection, card_stocks_monthly, edhrec_monthly, oracle_cards = get_dbs(db)
+    before = server_counters(db)
+    start = time.perf_counter()
+    with open_replay(path) as file:
+        counts = ingest_cards(
+            ijson.items(file, "item", use_float=True),
+            updated_at,
+            card_collection,
+            card_stocks_monthly,
+            edhrec_monthly,
+            db[LATEST_COLLECTION] if HISTORY_MODE == "delta" else None,
+            oracle_cards,
+            raw_cards=raw_collection(db),
+            workers=workers,
+        )
+    duration = time.perf_counter() - start
+    after = server_counters(db)
+
+    return {
+        "cards": counts["cards"],
+        "duration": duration,
+        "cards_per_second": counts["cards"] / duration if duration else 0.0,
+        "write_ops": after["write_ops"] - before["write_ops"],
+        "bytes_in": after["bytes_in"] - before["bytes_in"],
+        "stored_bytes": after["stored_bytes"] - before["stored_bytes"],
+        "peak_rss_mb": peak_rss_mb(),
+        "counts": dict(counts),
+    }
+
+
+def _run_stage(
+    database: str, path: str, updated_at: datetime, workers: Optional[int]
+) -> dict:
+    return ingest_stage(get_database(database), path, updated_at, workers)
+
+
+def benchmark_ingest(
+    stages: list[tuple[str, str]],
+    database: str = BENCHMARK_DATABASE,
+    workers: Optional[int] = None,
+) -> list[dict]:
+    """Ingest dataset files in order into a dropped and recreated database.
+
+    Args:
+        stages: (name, path) of the dataset file of each stage
+        database: Scratch database, dropped first
+        workers: Normalization processes of each stage
+
+    Returns:
+        The ``ingest_stage`` result of each stage with its ``stage`` name
+
+    Raises:
+        ValueError: If ``database`` is the database of the ingest
+    """
+    if database == DATABASE:
+        raise ValueError(f"Refusing to drop the ingest database {DATABASE}")
+    get_database(database).client.drop_database(database)
+
+    results = []
+    for number, (name, path) in enumerate(stages):
+        with ProcessPoolExecutor(
+            1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            result = executor.submit(
+                _run_stage,
+                database,
+                path,
+                FIRST_UPDATE + timedelta(days=number),
+                workers,
+            ).result()
+        results.append({"stage": name, **result})
+    return results
@@ -0,0 +1,190 @@
+"""Bookkeeping of the ingest runs in the ``ingest_runs`` collection.
+
+Each run records the bulk file it processed (source type, download URI and
+Scryfall ``updated_at``), its duration, peak memory, the card counts and
+its status, so the nightly task can skip a bulk file that was already
+ingested.
+
+While it runs, an ingest checkpoints the number of cards whose writes are
+flushed. A run that failed or died (OOM, container restart) is resumed by
+the next run of the same bulk file from its last checkpoint. Every write
+is an idempotent upsert, so the cards processed after the checkpoint are
+written again without duplicates.
+"""
+
+import logging
+import os
+import resource
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+
+from bson import ObjectId
+
+STATUS_RUNNING = "running"
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+
+# Cards processed between two checkpoints of a run
+CHECKPOINT_INTERVAL = int(os.getenv("INGEST_CHECKPOINT_INTERVAL", "10000"))
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def last_successful_run(collection, source: str) -> Optional[dict]:
+    """Get the most recent successful run for a bulk data type."""
+    runs = (
+        collection.find({"source": source, "status": STATUS_SUCCESS})
+        .sort("updated_at", -1)
+        .limit(1)
+    )
+    return next(iter(runs), None)
+
+
+def is_already_ingested(collection, source: str, updated_at: datetime) -> bool:
+    """Whether a successful run already processed this version of the bulk file."""
+    last_run = last_successful_run(collection, source)
+    return last_run is not None and as_utc(last_run["updated_at"]) >= as_utc(updated_at)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of the process, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def resumable_run(collection, source: str, updated_at: datetime) -> Optional[dict]:
+    """Most recent unfinished run of this version of the bulk file.
+
+    Runs still ``running`` are included, a killed process never marks its
+    run failed.
+    """
+    runs = (
+        collection.find(
+            {
+                "source": source,
+                "updated_at": updated_at,
+                "status": {"$in": [STATUS_RUNNING, STATUS_FAILED]},
+                "checkpoint": {"$exists": True},
+            }
+        )
+        .sort("started_at", -1)
+        .limit(1)
+    )
+    return next(iter(runs), None)
+
+
+def as_utc(value: datetime) -> datetime:
+    """Make a datetime comparable, MongoDB returns naive UTC datetimes."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+class IngestRun:
+    """Record an ingest run, marking it failed if the body raises.
+
+    Usage:
+        with IngestRun(collection, "all_cards", uri, updated_at) as run:
+            run.counts.update(
+                ingest_cards(..., resume_from=run.position, on_checkpoint=run.checkpoint)
+            )
+    """
+
+    def __init__(
+        self,
+        collection,
+        source: str,
+        source_uri: str,
+        updated_at,
+        resume: Optional[dict] = None,
+    ):
+        """
+        Args:
+            collection: The ``ingest_runs`` collection
+            source: Scryfall bulk data type, e.g. ``all_cards``
+            source_uri: Download URI of the bulk file
+            updated_at: Scryfall ``updated_at`` of the bulk file
+            resume: Unfinished run continued by this one, see ``resumable_run``
+        """
+        self.collection = collection
+        self.resumed = resume is not None
+        if resume is not None:
+            self.document = dict(resume)
+            self.position = resume["checkpoint"]["cards"]
+            self.counts = Counter(resume["checkpoint"]["counts"])
+        else:
+            self.document = {
+                "_id": ObjectId(),
+                "source": source,
+                "source_uri": source_uri,
+                "updated_at": updated_at,
+                "status": STATUS_RUNNING,
+                "started_at": datetime.now(timezone.utc),
+            }
+            self.position = 0
+            self.counts = Counter()
+        self.start = None
+
+    @property
+    def id(self) -> ObjectId:
+        return self.document["_id"]
+
+    def checkpoint(self, position: int, counts: Counter) -> None:
+        """Record that the writes of the first ``position`` cards are flushed.
+
+        Args:
+            position: Number of cards of the bulk file processed
+            counts: Counts of this attempt, added to those of the attempts
+                it resumes
+        """
+        checkpoint = {
+            "cards": position,
+            "counts": dict(self.counts + counts),
+            "at": datetime.now(timezone.utc),
+        }
+        self.document["checkpoint"] = checkpoint
+        self.collection.update_one(
+            {"_id": self.id}, {"$set": {"checkpoint": checkpoint}}
+        )
+
+    def __enter__(self) -> "IngestRun":
+        self.start = time.perf_counter()
+        if self.resumed:
+            resumed_at = datetime.now(timezone.utc)
+            self.document.update(status=STATUS_RUNNING, resumed_at=resumed_at)
+            self.document["resumes"] = self.document.get("resumes", 0) + 1
+            self.collection.update_one(
+                {"_id": self.id},
+                {
+                    "$set": {"status": STATUS_RUNNING, "resumed_at": resumed_at},
+                    "$inc": {"resumes": 1},
+                },
+            )
+            HUEY_LOGGER.info(
+                f"Resuming ingest run {self.id} after {self.position} cards"
+            )
+        else:
+            self.collection.insert_one(dict(self.document))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        update = {
+            "status": STATUS_FAILED if exc_type else STATUS_SUCCESS,
+            "finished_at": datetime.now(timezone.utc),
+            "duration": time.perf_counter() - self.start,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+            "counts": dict(self.counts),
+        }
+        if exc_type:
+            update["error"] = f"{exc_type.__name__}: {exc_val}"
+
+        self.document.update(update)
+        self.collection.update_one({"_id": self.id}, {"$set": update})
+        HUEY_LOGGER.info(
+            f"Ingest run {self.id} {update['status']} in {update['duration']:.0f}s, "
+            f"peak memory {update['peak_rss_mb']:.0f} MB"
+        )
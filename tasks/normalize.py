@@ -0,0 +1,129 @@
+"""CPU-bound normalization of the Scryfall cards.
+
+Cards are normalized in batches, optionally by a pool of worker processes.
+Each worker strips the volatile fields, computes the content hash and
+encodes the stored document to BSON, so the parent process only pickles
+compact bytes and the bulk writer does not encode inserted cards again.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched
+from typing import NamedTuple, Optional
+
+import bson
+from unidecode import unidecode
+
+from tasks.bulk_writer import BATCH_SIZE
+from tasks.history import snapshot_digest
+from tasks.obj_utils import content_digest
+from tasks.oracle_cards import card_oracle_id
+from tasks.storage import RAW_COPY, STORAGE_PROFILE, lean_document, storage_fields
+
+# Number of normalization processes, 0 normalizes in the ingest process
+WORKERS = int(os.getenv("INGEST_WORKERS") or max((os.cpu_count() or 1) - 1, 0))
+
+
+class NormalizedCard(NamedTuple):
+    id: str
+    content_hash: str
+    document: bytes  # BSON of the stored card document
+    prices: dict
+    prices_hash: int
+    edhrec_rank: Optional[int]
+    oracle_id: Optional[str]
+    raw: Optional[bytes] = None  # BSON of the untrimmed card, see tasks.storage
+
+
+def normalize_prices(prices: dict) -> dict:
+    return {
+        price_key: (
+            prices[price_key] if not prices[price_key] else float(prices[price_key])
+        )
+        for price_key in prices
+    }
+
+
+def normalize_card(card: dict) -> NormalizedCard:
+    """Split a Scryfall card into its stored document and daily snapshots.
+
+    With the ``lean`` storage profile the stored document only keeps the
+    fields in use, and the untrimmed card is kept in ``raw`` if
+    ``RAW_COPY`` is enabled.
+    """
+    prices = normalize_prices(card.pop("prices", {}))
+    edhrec_rank = card.pop("edhrec_rank", None)
+
+    card["name_search"] = unidecode(card["name"]).lower()
+    if not card.get("oracle_id") and card_oracle_id(card):
+        card["oracle_id"] = card_oracle_id(card)
+
+    raw = None
+    if STORAGE_PROFILE == "lean":
+        content_hash = f"lean-{content_digest(card)}"
+        if RAW_COPY:
+            raw = bson.encode(card)
+        card = lean_document(card, storage_fields())
+        card["content_hash"] = content_hash
+    else:
+        card["content_hash"] = content_digest(card)
+
+    return NormalizedCard(
+        card["id"],
+        card["content_hash"],
+        bson.encode(card),
+        prices,
+        snapshot_digest(prices),
+        edhrec_rank,
+        card.get("oracle_id"),
+        raw,
+    )
+
+
+def normalize_batch(cards) -> list[NormalizedCard]:
+    return [normalize_card(card) for card in cards]
+
+
+def normalized_batches(cards, batch_size: int = BATCH_SIZE, workers: int = WORKERS):
+    """Normalize cards in batches, preserving the input order.
+
+    With ``workers`` processes, at most two batches per worker are in flight
+    so memory stays bounded whatever the size of the input.
+    """
+    batches = batched(cards, batch_size)
+    if workers < 1:
+        yield from map(normalize_batch, batches)
+        return
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(normalize_batch, batch))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def benchmark_normalization(
+    cards: list[dict], workers: int, batch_size: int = BATCH_SIZE
+) -> dict:
+    """Time the normalization stage alone on an in-memory list of cards."""
+    start = time.perf_counter()
+    count = sum(
+        len(batch)
+        for batch in normalized_batches(
+            (dict(card) for card in cards), batch_size, workers
+        )
+    )
+    duration = time.perf_counter() - start
+
+    return {
+        "workers": workers,
+        "cards": count,
+        "duration": duration,
+        "cards_per_second": count / duration if duration else 0.0,
+    }
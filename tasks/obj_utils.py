@@ -1,4 +1,106 @@
+import hashlib
+import json
+import time
+
+DIGEST_EXCLUDED_KEYS = ("_id", "content_hash", "prices", "edhrec_rank")
+
+# Value of a key missing on one side of a diff
+MISSING = object()
+
+
+def content_digest(card: dict) -> str:
+    """Stable digest of a card document, ignoring volatile and storage keys.
+
+    Keys are sorted so the digest does not depend on the field order of the
+    Scryfall dump or of the stored document.
+    """
+    content = {
+        key: value for key, value in card.items() if key not in DIGEST_EXCLUDED_KEYS
+    }
+    encoded = json.dumps(
+        content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+
 def yield_differences(a: dict, b: dict, parent: str = ""):
+    """Differences between two documents as ``(key, before, after)`` tuples.
+
+    Both documents are walked with an explicit stack. Dicts, and lists of the
+    same length, are compared element by element. Any other change, including
+    a list changing length or a value changing type, is reported for the
+    whole value. A key missing on one side has the ``MISSING`` value there.
+    """
+    stack = [(parent, a, b)]
+    while stack:
+        prefix, before, after = stack.pop()
+        if type(before) is dict:
+            pairs = [
+                (key, a_value, b_value)
+                for key, a_value in before.items()
+                if a_value != (b_value := after.get(key, MISSING))
+                or type(a_value) is not type(b_value)
+            ]
+            # Only look for added keys when some keys of ``after`` were not seen
+            if len(after) > len(before) - sum(
+                value is MISSING for _, _, value in pairs
+            ):
+                pairs.extend(
+                    (key, MISSING, b_value)
+                    for key, b_value in after.items()
+                    if key not in before
+                )
+        else:
+            pairs = [
+                (index, a_value, b_value)
+                for index, (a_value, b_value) in enumerate(zip(before, after))
+                if a_value != b_value or type(a_value) is not type(b_value)
+            ]
+
+        for key, a_value, b_value in pairs:
+            path = f"{prefix}.{key}" if prefix else str(key)
+            value_type = type(a_value)
+            if value_type is type(b_value) and (
+                value_type is dict
+                or (value_type is list and len(a_value) == len(b_value))
+            ):
+                stack.append((path, a_value, b_value))
+            else:
+                yield path, a_value, b_value
+
+
+def diff_update(before: dict, after: dict, ignore=("_id",)) -> dict:
+    """Minimal update document turning ``before`` into ``after``.
+
+    Args:
+        before: Stored document
+        after: New version of the document
+        ignore: Top level keys left untouched
+
+    Returns:
+        ``{"$set": ..., "$unset": ...}`` without the empty operators, an empty
+        dict when the documents are equal
+    """
+    set_fields = {}
+    unset_fields = {}
+    for key, _, value in yield_differences(before, after):
+        if key in ignore:
+            continue
+        if value is MISSING:
+            unset_fields[key] = ""
+        else:
+            set_fields[key] = value
+
+    update = {}
+    if set_fields:
+        update["$set"] = set_fields
+    if unset_fields:
+        update["$unset"] = unset_fields
+    return update
+
+
+def _recursive_differences(a: dict, b: dict, parent: str = ""):
+    """Previous recursive implementation, kept as the benchmark baseline."""
     all_keys = set(a.keys()).union(set(b.keys()))
     for key in all_keys:
         full_key = f"{parent}.{key}" if parent != "" else key
@@ -10,7 +112,7 @@ def yield_differences(a: dict, b: dict, parent: str = ""):
             continue
 
         if isinstance(a_value, dict) and isinstance(b_value, dict):
-            yield from yield_differences(a_value, b_value, full_key)
+            yield from _recursive_differences(a_value, b_value, full_key)
             continue
 
         if isinstance(a_value, list) and isinstance(b_value, list):
@@ -25,10 +127,45 @@ def yield_differences(a: dict, b: dict, parent: str = ""):
                     continue
 
                 if isinstance(arr_a, dict) and isinstance(arr_b, dict):
-                    yield from yield_differences(arr_a, arr_b, full_arr_key)
+                    yield from _recursive_differences(arr_a, arr_b, full_arr_key)
                     continue
 
                 yield full_arr_key, arr_a, arr_b
             continue
 
         yield full_key, a_value, b_value
+
+
+def benchmark_diff(pairs: list[tuple[dict, dict]], repeat: int = 5) -> list[dict]:
+    """Time the document diff against the previous recursive implementation.
+
+    Args:
+        pairs: ``(stored, new)`` card documents
+        repeat: Number of passes over the pairs, the fastest is kept
+
+    Returns:
+        One result per implementation, the baseline first
+    """
+    results = []
+    for name, differences in (
+        ("recursive", _recursive_differences),
+        ("iterative", yield_differences),
+    ):
+        durations = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for before, after in pairs:
+                for _ in differences(before, after):
+                    pass
+            durations.append(time.perf_counter() - start)
+
+        duration = min(durations)
+        results.append(
+            {
+                "name": name,
+                "pairs": len(pairs),
+                "duration": duration,
+                "pairs_per_second": len(pairs) / duration if duration else 0.0,
+            }
+        )
+    return results
@@ -0,0 +1,265 @@
+"""Precomputed ``oracle_cards`` collection, one document per oracle and language.
+
+The API used to group every matching printing by ``oracle_id`` at query time.
+The ingest now keeps one summary document per ``(oracle_id, lang)`` instead,
+holding the fields of the most recent printing, the aggregated counts and
+ranks, and the compact list of its printing ids::
+
+    {
+        "_id": "<oracle_id>:en",
+        "oracle_id": "<oracle_id>",
+        "lang": "en",
+        "name": "Lightning Bolt",
+        "card_count": 2,
+        "printings": ["<id of the latest printing>", "<id>"],
+        ...
+    }
+
+Only the oracles whose printings were inserted, changed or removed during
+an ingest are rebuilt, from the stored printings.
+"""
+
+import logging
+from collections import Counter, defaultdict
+from itertools import batched
+from typing import Optional
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+from unidecode import unidecode
+
+from tasks.bulk_writer import BATCH_SIZE, BulkWriter
+
+ORACLE_COLLECTION = "oracle_cards"
+
+# Fields of the stored printings needed to build the oracle documents
+ORACLE_SOURCE_PROJECTION = {
+    "_id": 0,
+    "id": 1,
+    "oracle_id": 1,
+    "lang": 1,
+    "name": 1,
+    "name_search": 1,
+    "oracle_text": 1,
+    "type_line": 1,
+    "mana_cost": 1,
+    "cmc": 1,
+    "colors": 1,
+    "color_identity": 1,
+    "rarity": 1,
+    "layout": 1,
+    "keywords": 1,
+    "edhrec_rank": 1,
+    "penny_rank": 1,
+    "released_at": 1,
+    "set": 1,
+    "set_name": 1,
+    "artist": 1,
+    "image_uris.normal": 1,
+    "card_faces.image_uris.normal": 1,
+}
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def card_oracle_id(card: dict) -> Optional[str]:
+    """Oracle id of a card, reversible cards only have it on their faces."""
+    if card.get("oracle_id"):
+        return card["oracle_id"]
+    faces = card.get("card_faces") or [{}]
+    return faces[0].get("oracle_id")
+
+
+def oracle_document_id(oracle_id: str, lang: str) -> str:
+    return f"{oracle_id}:{lang}"
+
+
+def _max_rank(printings: list[dict], field: str) -> Optional[int]:
+    ranks = [card[field] for card in printings if card.get(field) is not None]
+    return max(ranks) if ranks else None
+
+
+def build_oracle_document(
+    printings: list[dict], edhrec_rank: Optional[int] = None
+) -> dict:
+    """Summary document of the printings of one oracle in one language.
+
+    Args:
+        printings: Stored cards sharing an ``oracle_id`` and ``lang``
+        edhrec_rank: Rank from the bulk file, the stored cards don't keep it.
+            Defaults to the highest rank found on the printings.
+
+    Returns:
+        The ``oracle_cards`` document
+    """
+    printings = sorted(
+        printings,
+        key=lambda card: (card.get("released_at") or "", card["id"]),
+        reverse=True,
+    )
+    latest = printings[0]
+    oracle_id = card_oracle_id(latest)
+    faces_thumbnails = [
+        face["image_uris"]["normal"]
+        for face in latest.get("card_faces") or []
+        if face.get("image_uris", {}).get("normal")
+    ]
+
+    return {
+        "_id": oracle_document_id(oracle_id, latest.get("lang")),
+        "oracle_id": oracle_id,
+        "lang": latest.get("lang"),
+        "name": latest["name"],
+        "name_search": latest.get("name_search") or unidecode(latest["name"]).lower(),
+        "card_text": latest.get("oracle_text"),
+        "type_line": latest.get("type_line"),
+        "mana_cost": latest.get("mana_cost"),
+        "cmc": latest.get("cmc"),
+        "colors": latest.get("colors"),
+        "color_identity": latest.get("color_identity"),
+        "rarity": latest.get("rarity"),
+        "layout": latest.get("layout"),
+        "keywords": latest.get("keywords", []),
+        "released_at": latest.get("released_at"),
+        "card_count": len(printings),
+        "edhrec_rank": (
+            edhrec_rank
+            if edhrec_rank is not None
+            else _max_rank(printings, "edhrec_rank")
+        ),
+        "penny_rank": _max_rank(printings, "penny_rank"),
+        "thumbnail": latest.get("image_uris", {}).get("normal"),
+        "faces_thumbnails": faces_thumbnails or None,
+        "sets": sorted({card["set"] for card in printings if card.get("set")}),
+        "set_names": sorted(
+            {card["set_name"] for card in printings if card.get("set_name")}
+        ),
+        "rarities": sorted(
+            {card["rarity"] for card in printings if card.get("rarity")}
+        ),
+        "artists": sorted({card["artist"] for card in printings if card.get("artist")}),
+        "printings": [card["id"] for card in printings],
+    }
+
+
+def build_oracle_documents(
+    cards, edhrec_ranks: Optional[dict[str, int]] = None
+) -> list[dict]:
+    """Group printings by oracle and language into ``oracle_cards`` documents."""
+    edhrec_ranks = edhrec_ranks or {}
+    groups = defaultdict(list)
+    for card in cards:
+        oracle_id = card_oracle_id(card)
+        if oracle_id:
+            groups[oracle_id, card.get("lang")].append(card)
+
+    return [
+        build_oracle_document(printings, edhrec_ranks.get(oracle_id))
+        for (oracle_id, _), printings in groups.items()
+    ]
+
+
+class OracleCardsWriter:
+    """Rebuild the ``oracle_cards`` documents touched by an ingest.
+
+    The ingest reports the oracles whose printings changed with ``touch``
+    and every EDHREC rank it reads with ``rank``. ``refresh`` is called once
+    the cards are written: touched oracles are rebuilt from their stored
+    printings, the others only get their rank updated when it changed.
+    The ``_id`` of the documents written and deleted are kept in ``written``
+    and ``deleted`` for the search index, see ``tasks.search_index``.
+    """
+
+    def __init__(self, cards, oracle_cards, batch_size: int = BATCH_SIZE):
+        """
+        Args:
+            cards: The ``cards`` collection, read once the ingest wrote it
+            oracle_cards: The ``oracle_cards`` collection
+            batch_size: Oracles rebuilt per query and write batch
+        """
+        self.cards = cards
+        self.oracle_cards = oracle_cards
+        self.batch_size = batch_size
+        self.touched = set()
+        self.ranks = {}
+        self.written = set()
+        self.deleted = set()
+
+    def touch(self, oracle_id: Optional[str]) -> None:
+        if oracle_id:
+            self.touched.add(oracle_id)
+
+    def rank(self, oracle_id: Optional[str], edhrec_rank: Optional[int]) -> None:
+        if oracle_id and edhrec_rank is not None:
+            self.ranks[oracle_id] = max(edhrec_rank, self.ranks.get(oracle_id, 0))
+
+    def touch_all(self) -> None:
+        """Mark every oracle of the cards collection for a rebuild."""
+        for card in self.cards.find({}, {"_id": 0, "oracle_id": 1}):
+            self.touch(card.get("oracle_id"))
+
+    def refresh(self) -> Counter:
+        """Write the touched oracles and the changed ranks.
+
+        An empty ``oracle_cards`` collection is built from every printing.
+
+        Returns:
+            Counter of ``oracles_written``, ``oracles_deleted`` and
+            ``oracle_ranks_updated``
+        """
+        if self.oracle_cards.find_one({}) is None:
+            self.touch_all()
+
+        counts = Counter()
+        with BulkWriter(self.oracle_cards, self.batch_size) as writer:
+            for batch in batched(sorted(self.touched), self.batch_size):
+                oracle_ids = list(batch)
+                documents = build_oracle_documents(
+                    self.cards.find(
+                        {
+                            "oracle_id": {"$in": oracle_ids},
+                            # Tombstoned printings, see tasks.sync
+                            "deleted_at": {"$exists": False},
+                        },
+                        ORACLE_SOURCE_PROJECTION,
+                    ),
+                    self.ranks,
+                )
+                for document in documents:
+                    writer.add(
+                        ReplaceOne({"_id": document["_id"]}, document, upsert=True)
+                    )
+                    counts["oracles_written"] += 1
+                    self.written.add(document["_id"])
+
+                built = {document["_id"] for document in documents}
+                for stale in self.oracle_cards.find(
+                    {"oracle_id": {"$in": oracle_ids}}, {"_id": 1}
+                ):
+                    if stale["_id"] not in built:
+                        writer.add(DeleteOne({"_id": stale["_id"]}))
+                        counts["oracles_deleted"] += 1
+                        self.deleted.add(stale["_id"])
+
+            if self.ranks:
+                for oracle in self.oracle_cards.find(
+                    {}, {"_id": 1, "oracle_id": 1, "edhrec_rank": 1}
+                ):
+                    oracle_id = oracle["oracle_id"]
+                    if oracle_id in self.touched or oracle_id not in self.ranks:
+                        continue
+                    if oracle.get("edhrec_rank") != self.ranks[oracle_id]:
+                        writer.add(
+                            UpdateOne(
+                                {"_id": oracle["_id"]},
+                                {"$set": {"edhrec_rank": self.ranks[oracle_id]}},
+                            )
+                        )
+                        counts["oracle_ranks_updated"] += 1
+                        self.written.add(oracle["_id"])
+
+        HUEY_LOGGER.info(
+            f"Oracle cards: {counts['oracles_written']} written, "
+            f"{counts['oracles_deleted']} deleted, "
+            f"{counts['oracle_ranks_updated']} ranks updated"
+        )
+        return counts
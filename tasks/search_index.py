@@ -0,0 +1,266 @@
+"""Meilisearch ``cards`` index of the oracle cards, kept in sync by the ingest.
+
+The index holds one document per ``oracle_cards`` document. After each
+ingest only the oracle cards rebuilt or removed by
+``tasks.oracle_cards.OracleCardsWriter`` are pushed, in batches, and the
+ingest waits for Meilisearch to process them. An empty index is filled from
+the whole ``oracle_cards`` collection, ``rebuild_search_index`` rebuilds it
+in a side index swapped in once complete.
+"""
+
+import logging
+import os
+from collections import Counter
+from itertools import batched
+from typing import Optional
+
+import meilisearch
+from meilisearch.errors import MeilisearchError
+
+from tasks.bulk_writer import BATCH_SIZE
+
+MEILI_HTTP_ADDR = os.getenv("MEILI_HTTP_ADDR", "http://localhost:7700")
+MEILI_API_KEY = os.getenv("MEILI_API_KEY", "NOKEY")
+CARDS_INDEX = os.getenv("MEILI_CARDS_INDEX", "cards")
+# Push the oracle cards changed by the ingest to the Meilisearch index
+SEARCH_INDEX = os.getenv("INGEST_SEARCH_INDEX", "true").lower() == "true"
+# Longest wait for Meilisearch to process one task
+TASK_TIMEOUT_MS = int(os.getenv("MEILI_TASK_TIMEOUT_MS", "600000"))
+
+CARDS_INDEX_SETTINGS = {
+    "searchableAttributes": [
+        "name",
+        "type_line",
+        "card_text",
+        "keywords",
+        "set_names",
+        "artists",
+    ],
+    "filterableAttributes": [
+        "lang",
+        "sets",
+        "set_names",
+        "colors",
+        "color_count",
+        "cmc",
+        "types",
+        "rarity",
+        "rarities",
+    ],
+    "sortableAttributes": ["edhrec_rank", "released_at", "cmc"],
+}
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+class SearchIndexError(Exception):
+    """A Meilisearch task did not succeed."""
+
+
+def get_search_client() -> meilisearch.Client:
+    return meilisearch.Client(MEILI_HTTP_ADDR, MEILI_API_KEY)
+
+
+def search_document_id(oracle_document_id: str) -> str:
+    """Meilisearch id of an oracle card, ``:`` is not allowed in ids."""
+    return oracle_document_id.replace(":", "_")
+
+
+def card_types(type_line: Optional[str]) -> list[str]:
+    """Super, card and sub types of every face of a type line."""
+    if not type_line:
+        return []
+    return sorted(set(type_line.replace("//", " ").replace("—", " ").split()))
+
+
+def search_document(oracle: dict) -> dict:
+    """Meilisearch document of an ``oracle_cards`` document."""
+    return {
+        "id": search_document_id(oracle["_id"]),
+        "oracle_id": oracle["oracle_id"],
+        "lang": oracle.get("lang"),
+        "name": oracle.get("name"),
+        "card_text": oracle.get("card_text"),
+        "type_line": oracle.get("type_line"),
+        "types": card_types(oracle.get("type_line")),
+        "mana_cost": oracle.get("mana_cost"),
+        "cmc": oracle.get("cmc"),
+        "colors": oracle.get("colors"),
+        "color_count": len(oracle.get("colors") or []),
+        "color_identity": oracle.get("color_identity"),
+        "rarity": oracle.get("rarity"),
+        "rarities": oracle.get("rarities", []),
+        "sets": oracle.get("sets", []),
+        "set_names": oracle.get("set_names", []),
+        "keywords": oracle.get("keywords", []),
+        "artists": oracle.get("artists", []),
+        "released_at": oracle.get("released_at"),
+        "edhrec_rank": oracle.get("edhrec_rank"),
+        "penny_rank": oracle.get("penny_rank"),
+        "thumbnail": oracle.get("thumbnail"),
+        "faces_thumbnails": oracle.get("faces_thumbnails"),
+        "printings": oracle.get("printings", []),
+    }
+
+
+def wait_for_tasks(client, tasks) -> None:
+    """Wait for Meilisearch to process enqueued tasks.
+
+    Raises:
+        SearchIndexError: If a task failed or was canceled
+    """
+    for task in tasks:
+        result = client.wait_for_task(task.task_uid, timeout_in_ms=TASK_TIMEOUT_MS)
+        if result.status != "succeeded":
+            raise SearchIndexError(
+                f"Meilisearch task {task.task_uid} {result.status}: {result.error}"
+            )
+
+
+def configure_index(client, index_name: str = CARDS_INDEX) -> None:
+    """Create the index if needed and apply its settings."""
+    created = client.wait_for_task(
+        client.create_index(index_name, {"primaryKey": "id"}).task_uid,
+        timeout_in_ms=TASK_TIMEOUT_MS,
+    )
+    if (
+        created.status != "succeeded"
+        and (created.error or {}).get("code") != "index_already_exists"
+    ):
+        raise SearchIndexError(f"Could not create index {index_name}: {created.error}")
+
+    wait_for_tasks(
+        client, [client.index(index_name).update_settings(CARDS_INDEX_SETTINGS)]
+    )
+
+
+def push_oracle_cards(
+    client,
+    oracle_cards,
+    written,
+    deleted,
+    index_name: str = CARDS_INDEX,
+    batch_size: int = BATCH_SIZE,
+) -> Counter:
+    """Push the oracle cards rebuilt or removed by an ingest.
+
+    Args:
+        client: Meilisearch client
+        oracle_cards: The ``oracle_cards`` collection
+        written: ``_id`` of the oracle cards written
+        deleted: ``_id`` of the oracle cards removed
+        index_name: Meilisearch index
+        batch_size: Documents per Meilisearch task
+
+    Returns:
+        Counter of ``search_upserted`` and ``search_deleted`` documents
+    """
+    index = client.index(index_name)
+    counts = Counter()
+    tasks = []
+
+    for batch in batched(sorted(written), batch_size):
+        documents = [
+            search_document(oracle)
+            for oracle in oracle_cards.find({"_id": {"$in": list(batch)}})
+        ]
+        if documents:
+            tasks.append(index.add_documents(documents, primary_key="id"))
+            counts["search_upserted"] += len(documents)
+
+    for batch in batched(sorted(deleted), batch_size):
+        tasks.append(index.delete_documents([search_document_id(id_) for id_ in batch]))
+        counts["search_deleted"] += len(batch)
+
+    wait_for_tasks(client, tasks)
+    return counts
+
+
+def rebuild_search_index(
+    client,
+    oracle_cards,
+    index_name: str = CARDS_INDEX,
+    batch_size: int = BATCH_SIZE,
+) -> Counter:
+    """Rebuild the index from every oracle card.
+
+    The documents are loaded in a side index swapped with ``index_name``
+    once complete, so searches keep working during the rebuild.
+
+    Returns:
+        Counter of ``search_upserted`` documents
+    """
+    rebuild_name = f"{index_name}_rebuild"
+    client.wait_for_task(
+        client.delete_index(rebuild_name).task_uid, timeout_in_ms=TASK_TIMEOUT_MS
+    )
+    configure_index(client, rebuild_name)
+    configure_index(client, index_name)
+
+    index = client.index(rebuild_name)
+    counts = Counter()
+    tasks = []
+    for batch in batched(oracle_cards.find({}), batch_size):
+        tasks.append(
+            index.add_documents(
+                [search_document(oracle) for oracle in batch], primary_key="id"
+            )
+        )
+        counts["search_upserted"] += len(batch)
+    wait_for_tasks(client, tasks)
+
+    wait_for_tasks(
+        client, [client.swap_indexes([{"indexes": [index_name, rebuild_name]}])]
+    )
+    wait_for_tasks(client, [client.delete_index(rebuild_name)])
+    return counts
+
+
+def sync_search_index(
+    client,
+    oracle_cards,
+    written,
+    deleted,
+    index_name: str = CARDS_INDEX,
+    batch_size: int = BATCH_SIZE,
+) -> Counter:
+    """Bring the index up to date after an ingest.
+
+    An empty index is rebuilt from every oracle card. A Meilisearch failure
+    is logged and counted as ``search_failed`` instead of failing the
+    ingest, the cards are already written: ``ingest reindex-search`` then
+    rebuilds the index.
+
+    Args:
+        client: Meilisearch client
+        oracle_cards: The ``oracle_cards`` collection
+        written: ``_id`` of the oracle cards written by the ingest
+        deleted: ``_id`` of the oracle cards removed by the ingest
+        index_name: Meilisearch index
+        batch_size: Documents per Meilisearch task
+
+    Returns:
+        Counter of ``search_upserted``, ``search_deleted`` documents and
+        ``search_failed``
+    """
+    try:
+        configure_index(client, index_name)
+        if client.index(index_name).get_stats().number_of_documents == 0:
+            HUEY_LOGGER.info(f"Search index {index_name} is empty, rebuilding it")
+            counts = rebuild_search_index(client, oracle_cards, index_name, batch_size)
+        else:
+            counts = push_oracle_cards(
+                client, oracle_cards, written, deleted, index_name, batch_size
+            )
+    except (MeilisearchError, SearchIndexError) as error:
+        HUEY_LOGGER.error(
+            f"Search index {index_name} not updated, "
+            f"run `ingest reindex-search` to rebuild it: {error}"
+        )
+        return Counter(search_failed=1)
+
+    HUEY_LOGGER.info(
+        f"Search index {index_name}: {counts['search_upserted']} upserted, "
+        f"{counts['search_deleted']} deleted"
+    )
+    return counts
@@ -0,0 +1,81 @@
+"""Precomputed ``sets`` collection, one small document per set.
+
+``GET /sets`` used to group the whole cards collection by set name on every
+call. The ingest now rebuilds the list of sets once it has written its
+changes, in a single aggregation on the server::
+
+    {
+        "_id": "lea",
+        "code": "lea",
+        "name": "Limited Edition Alpha",
+        "released_at": "1993-08-05",
+        "set_type": "core",
+        "card_count": 295,
+    }
+
+``card_count`` counts the stored printings of the set in every language.
+Only the sets that changed are written, the sets without printings left are
+deleted.
+"""
+
+import logging
+from collections import Counter
+
+from pymongo import DeleteOne, ReplaceOne
+
+from common.sets import SETS_PIPELINE
+from tasks.bulk_writer import BATCH_SIZE, BulkWriter
+
+SETS_COLLECTION = "sets"
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def build_set_documents(card_collection) -> list[dict]:
+    """Group the stored printings into one document per set code."""
+    return [
+        {
+            "_id": group["_id"],
+            "code": group["_id"],
+            "name": group.get("name"),
+            "released_at": group.get("released_at"),
+            "set_type": group.get("set_type"),
+            "card_count": group["card_count"],
+        }
+        for group in card_collection.aggregate(SETS_PIPELINE)
+        if group["_id"] is not None
+    ]
+
+
+def refresh_sets(
+    card_collection, sets_collection, batch_size: int = BATCH_SIZE
+) -> Counter:
+    """Bring the ``sets`` collection in line with the stored printings.
+
+    Args:
+        card_collection: Collection of the printings
+        sets_collection: Collection of the set documents
+        batch_size: Number of operations per bulk write
+
+    Returns:
+        Counter of ``sets_written`` and ``sets_deleted``
+    """
+    stored = {document["_id"]: document for document in sets_collection.find({})}
+
+    counts = Counter()
+    with BulkWriter(sets_collection, batch_size) as writer:
+        built = set()
+        for document in build_set_documents(card_collection):
+            built.add(document["_id"])
+            if stored.get(document["_id"]) != document:
+                writer.add(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+                counts["sets_written"] += 1
+        for code in stored.keys() - built:
+            writer.add(DeleteOne({"_id": code}))
+            counts["sets_deleted"] += 1
+
+    HUEY_LOGGER.info(
+        f"Sets refreshed: {counts['sets_written']} written, "
+        f"{counts['sets_deleted']} deleted"
+    )
+    return counts
@@ -0,0 +1,113 @@
+"""Storage profiles of the cards collection.
+
+The ``full`` profile stores every field of the Scryfall cards. The ``lean``
+profile only keeps the top-level fields served by the API routes, and
+through them by the MCP server and the apps, read by the ingest and the
+oracle cards, or used by an index of the index profile. The trimmed fields
+are URIs and identifiers of other services the API never returns, so the
+hot collection and its indexes take less memory.
+
+With the lean profile, the untrimmed cards can be kept in the cold
+``cards_raw`` collection, keyed by card id. It is written when a card is
+inserted or changes, never read by the API.
+
+The content hash of a lean card covers the untrimmed card, so the cold
+copy is rewritten on any change, and is prefixed by the profile: switching
+profile rewrites each card once, unsetting or restoring the trimmed fields.
+"""
+
+import os
+from functools import cache
+
+import bson
+from pymongo import ReplaceOne
+
+from tasks.indexes import INDEX_PROFILE, INDEX_PROFILES
+from tasks.oracle_cards import ORACLE_SOURCE_PROJECTION
+
+STORAGE_PROFILES = ("full", "lean")
+# "full" stores the whole Scryfall card, "lean" only the fields in use
+STORAGE_PROFILE = os.getenv("INGEST_STORAGE_PROFILE", "full")
+# With the lean profile, keep the untrimmed cards in RAW_COLLECTION
+RAW_COPY = os.getenv("INGEST_RAW_COPY", "false").lower() == "true"
+RAW_COLLECTION = "cards_raw"
+
+# Fields of the cards returned by the API (api.helpers.cards_mongo) or used
+# by its queries, and fields written by the ingest
+SERVED_FIELDS = (
+    "id",
+    "oracle_id",
+    "name",
+    "name_search",
+    "printed_name",
+    "lang",
+    "layout",
+    "oracle_text",
+    "type_line",
+    "mana_cost",
+    "cmc",
+    "colors",
+    "color_identity",
+    "keywords",
+    "card_faces",
+    "image_uris",
+    "artist",
+    "collector_number",
+    "flavor_name",
+    "flavor_text",
+    "games",
+    "promo",
+    "rarity",
+    "related_uris",
+    "released_at",
+    "reprint",
+    "set",
+    "set_name",
+    "set_type",
+    "variation",
+    "variation_of",
+    "security_stamp",
+    "watermark",
+    "content_hash",
+    "deleted_at",
+)
+
+
+def _top_level(field: str) -> str:
+    return field.split(".", 1)[0]
+
+
+@cache
+def storage_fields(index_profile: str = INDEX_PROFILE) -> frozenset[str]:
+    """Top-level fields kept by the lean profile.
+
+    Args:
+        index_profile: Index profile whose indexed fields are kept as well
+    """
+    fields = set(SERVED_FIELDS)
+    fields.update(_top_level(field) for field in ORACLE_SOURCE_PROJECTION)
+    for model in INDEX_PROFILES[index_profile]:
+        fields.update(_top_level(field) for field in model.document["key"])
+    fields.discard("_id")
+    return frozenset(fields)
+
+
+def lean_document(card: dict, fields: frozenset[str]) -> dict:
+    """Card without the fields outside ``fields``."""
+    return {key: value for key, value in card.items() if key in fields}
+
+
+def raw_collection(db, profile: str = STORAGE_PROFILE, raw_copy: bool = RAW_COPY):
+    """Cold collection of the untrimmed cards, None unless enabled.
+
+    Raises:
+        ValueError: If the storage profile is unknown
+    """
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(f"Storage profile must be one of {STORAGE_PROFILES}")
+    return db[RAW_COLLECTION] if profile == "lean" and raw_copy else None
+
+
+def raw_update(card) -> ReplaceOne:
+    """Upsert the untrimmed version of a ``NormalizedCard`` in the cold copy."""
+    return ReplaceOne({"_id": card.id}, bson.decode(card.raw), upsert=True)
@@ -0,0 +1,246 @@
+"""Merge-join synchronization of the cards collection with a bulk file.
+
+The cards of the bulk file, sorted by ``id``, are walked side by side with
+a cursor over the stored cards sorted the same way. Each id is then either
+only in the file (insert), in both (update if the content hash differs) or
+only in the collection (delete or tombstone). Only the current card of each
+side and one batch of changed cards are held in memory, whatever the size
+of the dump.
+
+MongoDB compares strings by their UTF-8 bytes, which is the same order as
+Python string comparison, so both sides agree on the order of the ids.
+"""
+
+import logging
+import os
+from collections import Counter
+from contextlib import nullcontext
+from operator import attrgetter, itemgetter
+from typing import Callable, Optional
+
+import bson
+from bson.raw_bson import RawBSONDocument
+from pymongo import DeleteOne, InsertOne, UpdateOne
+
+from tasks.bulk_writer import BATCH_SIZE, BulkWriter
+from tasks.history import HistoryWriter
+from tasks.indexes import DIGEST_INDEX_NAME
+from tasks.normalize import WORKERS, normalized_batches
+from tasks.obj_utils import diff_update
+from tasks.oracle_cards import OracleCardsWriter
+from tasks.search_index import sync_search_index
+from tasks.storage import raw_update
+
+DELETE_MODES = ("delete", "tombstone")
+# Cards missing from the bulk file are deleted, or only flagged as deleted
+DELETE_MODE = os.getenv("INGEST_DELETE_MODE", "delete")
+TOMBSTONE_FIELD = "deleted_at"
+
+HUEY_LOGGER = logging.getLogger("huey")
+
+
+def _keyed(items, key: Callable, side: str):
+    previous = None
+    for item in items:
+        current = key(item)
+        if previous is not None and current <= previous:
+            raise ValueError(
+                f"{side} side is not sorted by increasing unique key at {current!r}"
+            )
+        previous = current
+        yield current, item
+
+
+def merge_join(left, right, left_key: Callable, right_key: Callable):
+    """Full outer join of two iterables sorted by a unique key.
+
+    Yields:
+        ``(left_item, right_item)`` pairs, with ``None`` on the side missing
+        the key
+
+    Raises:
+        ValueError: If a side is not sorted by strictly increasing key
+    """
+    left = _keyed(left, left_key, "left")
+    right = _keyed(right, right_key, "right")
+    left_entry, right_entry = next(left, None), next(right, None)
+
+    while left_entry or right_entry:
+        if right_entry is None or (left_entry and left_entry[0] < right_entry[0]):
+            yield left_entry[1], None
+            left_entry = next(left, None)
+        elif left_entry is None or right_entry[0] < left_entry[0]:
+            yield None, right_entry[1]
+            right_entry = next(right, None)
+        else:
+            yield left_entry[1], right_entry[1]
+            left_entry, right_entry = next(left, None), next(right, None)
+
+
+def card_updates(collection, cards: list[dict]):
+    """Diff changed cards against their stored version, read in one query.
+
+    Keys missing from the new version, such as a tombstone, are unset.
+
+    Yields:
+        One ``UpdateOne`` per card, ``None`` when nothing differs
+    """
+    existing_cards = {
+        existing["id"]: existing
+        for existing in collection.find({"id": {"$in": [card["id"] for card in cards]}})
+    }
+    for card in cards:
+        existing = existing_cards[card["id"]]
+        update = diff_update(existing, card)
+        yield UpdateOne({"_id": existing["_id"]}, update) if update else None
+
+
+def _write_changed(collection, writer: BulkWriter, changed: list, counts: Counter):
+    for operation in card_updates(collection, changed):
+        if operation:
+            writer.add(operation)
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+    changed.clear()
+
+
+def sync_cards(
+    cards,
+    date,
+    card_collection,
+    card_stocks_monthly,
+    edhrec_monthly,
+    latest_prices=None,
+    oracle_cards=None,
+    search_client=None,
+    raw_cards=None,
+    batch_size: int = BATCH_SIZE,
+    workers: Optional[int] = None,
+    delete_mode: str = DELETE_MODE,
+) -> Counter:
+    """Synchronize the cards collection with cards sorted by ``id``.
+
+    Args:
+        cards: Scryfall cards sorted by ``id``
+        date: Date of the bulk file, used for the price and EDHREC history
+        card_collection: The ``cards`` collection
+        card_stocks_monthly: Monthly price buckets collection
+        edhrec_monthly: Monthly EDHREC rank buckets collection
+        latest_prices: Last known values collection, enables delta history
+        oracle_cards: Oracle cards collection, rebuilt for the oracles whose
+            printings changed
+        search_client: Meilisearch client, the oracle cards written or
+            removed are pushed to its ``cards`` index
+        raw_cards: Cold collection of the untrimmed cards, written for the
+            inserted and changed cards (see ``tasks.storage``)
+        batch_size: Size of the normalization and write batches
+        workers: Normalization processes, defaults to ``INGEST_WORKERS``
+        delete_mode: ``delete`` removes the cards missing from ``cards``,
+            ``tombstone`` sets their ``deleted_at`` to ``date``
+
+    Returns:
+        Counter with the number of ``cards`` read and how many were
+        ``inserted``, ``updated``, ``unchanged``, ``deleted`` or
+        ``tombstoned``, plus the history values, oracle cards and search
+        documents written
+
+    Raises:
+        ValueError: If ``delete_mode`` is unknown or the cards are not sorted
+    """
+    if delete_mode not in DELETE_MODES:
+        raise ValueError(f"delete_mode must be one of {DELETE_MODES}")
+
+    counts = Counter()
+    oracles = OracleCardsWriter(card_collection, oracle_cards, batch_size)
+    normalized = (
+        card
+        for batch in normalized_batches(
+            cards, batch_size, WORKERS if workers is None else workers
+        )
+        for card in batch
+    )
+    existing = (
+        card_collection.find(
+            {},
+            # Covered by the digest index, no document is fetched
+            {"_id": 0, "id": 1, "content_hash": 1, "oracle_id": 1, TOMBSTONE_FIELD: 1},
+        )
+        .sort("id", 1)
+        .hint(DIGEST_INDEX_NAME)
+    )
+
+    with (
+        BulkWriter(card_collection, batch_size) as cards_writer,
+        HistoryWriter(
+            card_stocks_monthly, edhrec_monthly, latest_prices, batch_size
+        ) as history,
+        (
+            BulkWriter(raw_cards, batch_size)
+            if raw_cards is not None
+            else nullcontext()
+        ) as raw_writer,
+    ):
+        changed = []
+        for card, stored in merge_join(
+            normalized, existing, attrgetter("id"), itemgetter("id")
+        ):
+            if card is None:
+                oracles.touch(stored.get("oracle_id"))
+                if delete_mode == "delete":
+                    cards_writer.add(DeleteOne({"id": stored["id"]}))
+                    if raw_writer is not None:
+                        raw_writer.add(DeleteOne({"_id": stored["id"]}))
+                    counts["deleted"] += 1
+                elif stored.get(TOMBSTONE_FIELD) is None:
+                    cards_writer.add(
+                        UpdateOne(
+                            {"id": stored["id"]}, {"$set": {TOMBSTONE_FIELD: date}}
+                        )
+                    )
+                    counts["tombstoned"] += 1
+                continue
+
+            counts["cards"] += 1
+            history.add(card, date)
+            oracles.rank(card.oracle_id, card.edhrec_rank)
+            if (
+                raw_writer is not None
+                and card.raw is not None
+                and (stored is None or stored.get("content_hash") != card.content_hash)
+            ):
+                raw_writer.add(raw_update(card))
+
+            if stored is None:
+                cards_writer.add(InsertOne(RawBSONDocument(card.document)))
+                counts["inserted"] += 1
+                oracles.touch(card.oracle_id)
+            elif (
+                stored.get("content_hash") == card.content_hash
+                and stored.get(TOMBSTONE_FIELD) is None
+            ):
+                counts["unchanged"] += 1
+            else:
+                changed.append(bson.decode(card.document))
+                oracles.touch(card.oracle_id)
+                oracles.touch(stored.get("oracle_id"))
+                if len(changed) >= batch_size:
+                    _write_changed(card_collection, cards_writer, changed, counts)
+
+        if changed:
+            _write_changed(card_collection, cards_writer, changed, counts)
+
+    counts.update(history.counts)
+    if oracle_cards is not None:
+        counts.update(oracles.refresh())
+        if search_client is not None:
+            counts.update(
+                sync_search_index(
+                    search_client,
+                    oracle_cards,
+                    oracles.written,
+                    oracles.deleted,
+                    batch_size=batch_size,
+                )
+            )
+    return counts
@@ -0,0 +1,298 @@
+"""Synthetic Scryfall ``all_cards`` datasets for the ingest benchmarks.
+
+Cards are generated deterministically: card ``i`` is the same in every
+dataset generated with the same seed and number of cards. Printings share
+their oracle fields (about four printings per oracle), layouts and
+languages follow rough Scryfall proportions, and multi-faced layouts carry
+``card_faces``.
+
+A ``revision`` above 0 changes a ``change_fraction`` of the cards, picked
+per card from the seed and the revision: their prices, EDHREC rank and
+image URIs version differ from revision 0, the others are identical. Two
+revisions of a dataset therefore mimic two consecutive bulk files.
+"""
+
+import gzip
+import json
+import random
+import uuid
+from datetime import date, timedelta
+from typing import Iterator
+
+PRINTINGS_PER_ORACLE = 4
+SET_COUNT = 400
+
+# (layout, weight), multi-faced layouts have card_faces
+LAYOUTS = (
+    ("normal", 80),
+    ("transform", 4),
+    ("modal_dfc", 3),
+    ("split", 3),
+    ("adventure", 3),
+    ("flip", 1),
+    ("token", 4),
+    ("art_series", 2),
+)
+# Faces with their own image_uris, the card has none
+DOUBLE_FACED_LAYOUTS = {"transform", "modal_dfc", "art_series"}
+MULTI_FACED_LAYOUTS = DOUBLE_FACED_LAYOUTS | {"split", "adventure", "flip"}
+
+LANGUAGES = (
+    ("en", 55),
+    ("ja", 6),
+    ("de", 5),
+    ("fr", 5),
+    ("it", 5),
+    ("es", 5),
+    ("pt", 5),
+    ("ru", 3),
+    ("ko", 3),
+    ("zhs", 3),
+    ("zht", 3),
+    ("he", 1),
+    ("la", 1),
+    ("grc", 1),
+    ("ar", 1),
+    ("ph", 1),
+)
+RARITIES = (("common", 45), ("uncommon", 30), ("rare", 18), ("mythic", 7))
+COLORS = ("W", "U", "B", "R", "G")
+FORMATS = ("standard", "pioneer", "modern", "legacy", "vintage", "commander")
+TYPES = (
+    ("Creature", ("Elf", "Goblin", "Human", "Zombie", "Dragon", "Wizard")),
+    ("Instant", ()),
+    ("Sorcery", ()),
+    ("Enchantment", ("Aura", "Saga")),
+    ("Artifact", ("Equipment", "Vehicle")),
+    ("Land", ("Forest", "Island")),
+    ("Planeswalker", ("Jace", "Chandra")),
+)
+WORDS = (
+    "Ancient Arcane Ashen Blazing Bog Dread Ember Fabled Gilded Grim Hollow "
+    "Iron Lunar Mire Night Primal Rune Shadow Storm Sun Thorn Tidal Verdant "
+    "Void Warden Wild Wrath Zealot Beacon Bolt Charm Crown Drake Fury Gate "
+    "Hound Knight Oath Pact Rite Sage Spire Titan Vow Ward"
+).split()
+EFFECTS = (
+    "{name} deals {n} damage to any target.",
+    "Draw {n} cards, then discard a card.",
+    "Target creature gets +{n}/+{n} until end of turn.",
+    "Create {n} 1/1 colorless Servo artifact creature tokens.",
+    "When {name} enters, you gain {n} life.",
+    "Counter target spell unless its controller pays {{{n}}}.",
+    "Destroy target creature with mana value {n} or less.",
+    "Flying\nWhen {name} dies, return it to its owner's hand.",
+)
+
+
+def _choice(rng: random.Random, weighted: tuple) -> str:
+    values, weights = zip(*weighted)
+    return rng.choices(values, weights)[0]
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _image_uris(card_id: str, face: int, version: int) -> dict:
+    base = f"https://cards.scryfall.io/{{}}/front/{card_id[0]}/{card_id}"
+    suffix = f"-{face}" if face else ""
+    return {
+        size: f"{base.format(size)}{suffix}.jpg?{version}"
+        for size in ("small", "normal", "large", "art_crop", "border_crop")
+    } | {"png": f"{base.format('png')}{suffix}.png?{version}"}
+
+
+def _face(rng: random.Random) -> dict:
+    """Oracle fields of one face."""
+    name = f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+    card_type, subtypes = rng.choice(TYPES)
+    colors = sorted(rng.sample(COLORS, rng.choices((0, 1, 2, 3), (10, 60, 25, 5))[0]))
+    cmc = rng.randint(1, 7)
+    if card_type == "Land":
+        colors, cmc = [], 0
+    generic = cmc - len(colors)
+    mana_cost = (f"{{{generic}}}" if generic > 0 else "") + "".join(
+        f"{{{color}}}" for color in colors
+    )
+    face = {
+        "name": name,
+        "mana_cost": mana_cost,
+        "type_line": card_type
+        + (f" — {rng.choice(subtypes)}" if subtypes and rng.random() < 0.6 else ""),
+        "oracle_text": rng.choice(EFFECTS).format(name=name, n=rng.randint(1, 4)),
+        "colors": colors,
+        "cmc": float(max(cmc, len(colors))),
+    }
+    if card_type == "Creature":
+        face["power"] = str(rng.randint(0, 6))
+        face["toughness"] = str(rng.randint(1, 6))
+    return face
+
+
+def oracle_fields(seed: int, oracle_index: int) -> dict:
+    """Fields shared by every printing of an oracle."""
+    rng = random.Random(f"{seed}:oracle:{oracle_index}")
+    layout = _choice(rng, LAYOUTS)
+    oracle = {
+        "oracle_id": _uuid(rng),
+        "layout": layout,
+        "keywords": rng.sample(
+            ("Flying", "Trample", "Haste", "Ward"), rng.randint(0, 2)
+        ),
+        "legalities": {
+            format_name: rng.choice(("legal", "legal", "not_legal", "banned"))
+            for format_name in FORMATS
+        },
+    }
+    if layout not in MULTI_FACED_LAYOUTS:
+        face = _face(rng)
+        if layout == "token":
+            face["type_line"] = f"Token {face['type_line']}"
+        oracle.update(face)
+        oracle["color_identity"] = face["colors"]
+        return oracle
+
+    faces = [_face(rng), _face(rng)]
+    oracle["name"] = " // ".join(face["name"] for face in faces)
+    oracle["type_line"] = " // ".join(face["type_line"] for face in faces)
+    oracle["cmc"] = faces[0]["cmc"]
+    oracle["color_identity"] = sorted({c for face in faces for c in face["colors"]})
+    if layout in DOUBLE_FACED_LAYOUTS:
+        # Each face has its own colors and images, the card has none
+        oracle["card_faces"] = faces
+    else:
+        oracle["mana_cost"] = " // ".join(face["mana_cost"] for face in faces)
+        oracle["colors"] = oracle["color_identity"]
+        oracle["card_faces"] = [
+            {key: value for key, value in face.items() if key != "colors"}
+            for face in faces
+        ]
+    return oracle
+
+
+def _prices(rng: random.Random, lang: str) -> dict:
+    def price(chance: float, high: float):
+        return f"{rng.uniform(0.05, high):.2f}" if rng.random() < chance else None
+
+    english = lang == "en"
+    return {
+        "usd": price(0.9 if english else 0.05, 40),
+        "usd_foil": price(0.5 if english else 0.02, 80),
+        "usd_etched": None,
+        "eur": price(0.7 if english else 0.3, 35),
+        "eur_foil": price(0.3, 70),
+        "tix": price(0.5 if english else 0.0, 5),
+    }
+
+
+def synthetic_card(
+    index: int,
+    count: int,
+    seed: int = 0,
+    revision: int = 0,
+    change_fraction: float = 0.0,
+) -> dict:
+    """Card ``index`` of a dataset of ``count`` cards.
+
+    Args:
+        index: Position of the card in the dataset
+        count: Number of cards of the dataset, sets the number of oracles
+        seed: Seed of the dataset
+        revision: Revision of the dataset, 0 is the base dataset
+        change_fraction: Fraction of the cards differing from revision 0
+    """
+    rng = random.Random(f"{seed}:card:{index}")
+    oracle_index = index % max(count // PRINTINGS_PER_ORACLE, 1)
+    card = oracle_fields(seed, oracle_index)
+    card_id = _uuid(rng)
+    lang = _choice(rng, LANGUAGES)
+    set_index = rng.randrange(SET_COUNT)
+    released_at = date(1993, 8, 5) + timedelta(days=set_index * 30)
+
+    card.update(
+        {
+            "object": "card",
+            "id": card_id,
+            "lang": lang,
+            "multiverse_ids": [rng.randint(1, 700000)],
+            "tcgplayer_id": rng.randint(1, 600000),
+            "uri": f"https://api.scryfall.com/cards/{card_id}",
+            "scryfall_uri": f"https://scryfall.com/card/s{set_index}/{index}",
+            "released_at": released_at.isoformat(),
+            "set": f"s{set_index:03d}",
+            "set_name": f"Synthetic Set {set_index}",
+            "set_type": "expansion",
+            "collector_number": str(rng.randint(1, 400)),
+            "rarity": _choice(rng, RARITIES),
+            "artist": f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+            "games": ["paper", "mtgo"] if rng.random() < 0.5 else ["paper"],
+            "promo": rng.random() < 0.05,
+            "reprint": index >= max(count // PRINTINGS_PER_ORACLE, 1),
+            "variation": False,
+            "prints_search_uri": (
+                f"https://api.scryfall.com/cards/search?q=oracleid:{card['oracle_id']}"
+            ),
+            "related_uris": {
+                "gatherer": f"https://gatherer.wizards.com/{card_id}",
+                "edhrec": f"https://edhrec.com/route/?cc={index}",
+            },
+            "purchase_uris": {
+                "tcgplayer": f"https://tcgplayer.com/product/{card_id}",
+                "cardmarket": f"https://cardmarket.com/search?q={card_id}",
+            },
+            "prices": _prices(rng, lang),
+            "edhrec_rank": (
+                None if card["layout"] == "token" else rng.randint(1, 30000)
+            ),
+        }
+    )
+    if lang != "en":
+        card["printed_name"] = f"{card['name']} ({lang})"
+        if "oracle_text" in card:
+            card["printed_text"] = f"[{lang}] {card['oracle_text']}"
+
+    version = 1700000000
+    if revision and random.Random(f"{seed}:{revision}:{index}").random() < (
+        change_fraction
+    ):
+        change = random.Random(f"{seed}:change:{revision}:{index}")
+        version += revision
+        card["prices"] = _prices(change, lang)
+        if card["edhrec_rank"] is not None:
+            card["edhrec_rank"] = max(card["edhrec_rank"] + change.randint(-50, 50), 1)
+
+    if card["layout"] in DOUBLE_FACED_LAYOUTS:
+        card["card_faces"] = [
+            {**face, "image_uris": _image_uris(card_id, number, version)}
+            for number, face in enumerate(card["card_faces"])
+        ]
+    else:
+        card["image_uris"] = _image_uris(card_id, 0, version)
+    return card
+
+
+def generate_cards(
+    count: int, seed: int = 0, revision: int = 0, change_fraction: float = 0.0
+) -> Iterator[dict]:
+    """Iterate over the ``count`` cards of a dataset, see ``synthetic_card``."""
+    for index in range(count):
+        yield synthetic_card(index, count, seed, revision, change_fraction)
+
+
+def write_dataset(path: str, cards) -> int:
+    """Write cards as a JSON array, gzip compressed if ``path`` ends in .gz.
+
+    Returns:
+        Number of cards written
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    written = 0
+    with opener(path, "wt", encoding="utf-8") as file:
+        file.write("[")
+        for card in cards:
+            file.write(",\n" if written else "\n")
+            file.write(json.dumps(card, ensure_ascii=False))
+            written += 1
+        file.write("\n]\n")
+    return written
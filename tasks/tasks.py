@@ -9,3 +9,8 @@ huey = SqliteHuey(filename="./db/huey.db")
 @huey.periodic_task(crontab(minute="0", hour="12"))
 def update_db():
     i_fetch_dataset()
+
+
+@huey.task()
+def force_update_db():
+    i_fetch_dataset(force=True)
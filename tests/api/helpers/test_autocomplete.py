@@ -0,0 +1,77 @@
+"""Tests for the in-memory name index of /cards/autocomplete.
+
+This module tests the prefix lookups, their ranking by EDHREC rank and the
+precomputed suggestions of short prefixes.
+"""
+
+import pytest
+
+from api.helpers.autocomplete import NameIndex
+
+
+def oracle(name: str, edhrec_rank=None, oracle_id=None) -> dict:
+    """Build an oracle_cards document of the name projection."""
+    return {"oracle_id": oracle_id or name, "name": name, "edhrec_rank": edhrec_rank}
+
+
+@pytest.fixture
+def index():
+    """Name index of a few oracles, one of them without EDHREC rank."""
+    return NameIndex(
+        [
+            oracle("Lightning Bolt", 20),
+            oracle("Lightning Greaves", 5),
+            oracle("Lightning Helix", 300),
+            oracle("Lightning Dragon"),
+            oracle("Lim-Dûl's Vault", 900),
+            oracle("Sol Ring", 1),
+        ],
+        max_results=3,
+    )
+
+
+@pytest.mark.unit
+def test_complete_ranks_by_edhrec_rank(index):
+    """Test that the most played matches come first, unranked ones last."""
+    names = [card["name"] for card in index.complete("lightning", 10)]
+
+    assert names == ["Lightning Greaves", "Lightning Bolt", "Lightning Helix"]
+
+
+@pytest.mark.unit
+def test_complete_short_prefix_is_precomputed(index):
+    """Test the precomputed suggestions of one and two characters."""
+    assert [card["name"] for card in index.complete("L", 2)] == [
+        "Lightning Greaves",
+        "Lightning Bolt",
+    ]
+    assert index.complete("Li", 3) == index.complete("li", 3)
+    assert index.complete("x", 3) == []
+
+
+@pytest.mark.unit
+def test_complete_normalizes_the_prefix(index):
+    """Test that case and accents are ignored and regex characters are plain."""
+    assert index.complete("LIM-DUL", 3)[0]["name"] == "Lim-Dûl's Vault"
+    assert index.complete("lightning d", 3) == [
+        {
+            "name": "Lightning Dragon",
+            "oracle_id": "Lightning Dragon",
+            "edhrec_rank": None,
+        }
+    ]
+    assert index.complete("sol .*", 3) == []
+    assert index.complete(" ", 3) == []
+
+
+@pytest.mark.unit
+def test_duplicate_names_keep_the_most_played_oracle():
+    """Test that a name shared by several oracles is suggested once."""
+    index = NameIndex(
+        [oracle("Goblin", 900, "token-1"), oracle("Goblin", 10, "token-2")]
+    )
+
+    assert len(index) == 1
+    assert index.complete("gob", 5) == [
+        {"name": "Goblin", "oracle_id": "token-2", "edhrec_rank": 10}
+    ]
@@ -0,0 +1,183 @@
+"""Tests for the Redis response cache.
+
+This module tests the read-through cache against an in-memory Redis mock,
+including its invalidation by the data version and its behavior when
+Redis is down.
+"""
+
+import pytest
+
+from api.helpers import cache as cache_module
+from api.helpers.cache import (
+    DataSnapshot,
+    ResponseCache,
+    cache_params,
+    close_response_cache,
+    open_response_cache,
+)
+from common.constants import DATA_VERSION_KEY
+from tests.mocks.redis import MockRedis
+
+SHOCK = b'{"name":"Shock"}'
+
+
+def counting(value):
+    """Coroutine function returning ``value`` and counting its calls."""
+
+    async def compute():
+        compute.calls += 1
+        return value
+
+    compute.calls = 0
+    return compute
+
+
+@pytest.mark.unit
+def test_cache_params_normalizes_lists_and_drops_none():
+    """Test that equivalent requests share a key source."""
+    assert cache_params(colors=["U", "R"], cmc_min=None, lang="en") == {
+        "colors": ["R", "U"],
+        "lang": "en",
+    }
+
+
+@pytest.mark.unit
+async def test_miss_then_hit():
+    """Test that a computed response is stored with its TTL then reused."""
+    client = MockRedis()
+    cache = ResponseCache(client, ttl=60)
+    compute = counting({"name": "Shock"})
+
+    assert await cache.get_or_set_json("id", {"id": "1"}, compute) == SHOCK
+    assert await cache.get_or_set_json("id", {"id": "1"}, compute) == SHOCK
+
+    assert compute.calls == 1
+    assert cache.stats["id"] == {"misses": 1, "hits": 1}
+    [key] = [key for key in client.store if key.startswith("api:")]
+    assert key.startswith("api:0:id:")
+    assert client.ttls[key] == 60
+
+
+@pytest.mark.unit
+async def test_hit_is_returned_encoded():
+    """Test that a hit is served as stored, without encoding it again."""
+    cache = ResponseCache(MockRedis())
+    encoded = []
+
+    def encode(content) -> bytes:
+        encoded.append(content)
+        return b'{"name":"Shock"}'
+
+    for _ in range(2):
+        body = await cache.get_or_set_json(
+            "id", {"id": "1"}, counting({"name": "Shock"}), encode
+        )
+        assert body == b'{"name":"Shock"}'
+
+    assert encoded == [{"name": "Shock"}]
+    assert cache.stats["id"] == {"misses": 1, "hits": 1}
+
+
+@pytest.mark.unit
+async def test_data_version_bump_invalidates():
+    """Test that a new data version misses the previous entries."""
+    client = MockRedis()
+    cache = ResponseCache(client, version_refresh=0)
+    compute = counting({"sets": ["Alpha"]})
+
+    await cache.get_or_set_json("sets", {}, compute)
+    await client.incr(DATA_VERSION_KEY)
+    await cache.get_or_set_json("sets", {}, compute)
+
+    assert compute.calls == 2
+    assert cache.summary()["data_version"] == "1"
+
+
+@pytest.mark.unit
+async def test_oversized_response_not_stored():
+    """Test that responses above the size cap are not cached."""
+    client = MockRedis()
+    cache = ResponseCache(client, max_entry_bytes=10)
+
+    await cache.get_or_set_json(
+        "search", {"text": "bolt"}, counting({"cards": ["x" * 20]})
+    )
+
+    assert not any(key.startswith("api:") for key in client.store)
+    assert cache.stats["search"]["oversized"] == 1
+
+
+@pytest.mark.unit
+async def test_redis_down_degrades_to_no_cache():
+    """Test that an unreachable Redis is bypassed instead of failing."""
+    client = MockRedis(fail=True)
+    cache = ResponseCache(client, retry_interval=60)
+    compute = counting({"name": "Shock"})
+
+    assert await cache.get_or_set_json("id", {"id": "1"}, compute) == SHOCK
+    assert await cache.get_or_set_json("id", {"id": "1"}, compute) == SHOCK
+
+    assert compute.calls == 2
+    # Redis is not tried again during the retry interval
+    assert client.commands == 1
+    assert cache.stats["id"] == {"errors": 1, "bypassed": 1}
+    assert cache.summary()["available"] is False
+
+
+@pytest.mark.unit
+async def test_disabled_cache_computes():
+    """Test that a cache without client always computes."""
+    cache = ResponseCache(None)
+    compute = counting([])
+
+    await cache.get_or_set_json("oracle", {"oracle_id": "o1"}, compute)
+
+    assert compute.calls == 1
+    assert cache.summary()["enabled"] is False
+
+
+@pytest.mark.unit
+async def test_snapshot_reloads_on_new_data_version():
+    """Test that a snapshot is loaded again only after a version bump."""
+    client = MockRedis()
+    cache = ResponseCache(client, version_refresh=0)
+    snapshot = DataSnapshot("sets")
+
+    assert await snapshot.get(cache, counting(["lea"])) == ["lea"]
+    assert await snapshot.get(cache, counting(["m10"])) == ["lea"]
+
+    await client.incr(DATA_VERSION_KEY)
+
+    assert await snapshot.get(cache, counting(["m10"])) == ["m10"]
+    assert snapshot.loads == 2
+    assert snapshot.version == "1"
+
+
+@pytest.mark.unit
+async def test_snapshot_without_redis_reloads_after_refresh():
+    """Test that a snapshot is reloaded on a timer while Redis is down."""
+    cache = ResponseCache(MockRedis(fail=True))
+    snapshot = DataSnapshot("sets", refresh=0)
+    load = counting(["lea"])
+
+    await snapshot.get(cache, load)
+    await snapshot.get(cache, load)
+
+    assert load.calls == 2
+    assert snapshot.version is None
+    assert cache.stats["sets"] == {"errors": 1, "bypassed": 1}
+
+
+@pytest.mark.unit
+async def test_shared_client_times_out_on_connect(monkeypatch):
+    """Test that an unreachable Redis cannot hang requests on connect."""
+    monkeypatch.setattr(cache_module, "API_CACHE", True)
+    monkeypatch.setattr(cache_module, "_cache", None)
+
+    client = open_response_cache().client
+    try:
+        options = client.connection_pool.connection_kwargs
+        assert options["socket_timeout"] == 0.5
+        assert options["socket_connect_timeout"] == 0.5
+    finally:
+        await close_response_cache()
@@ -4,81 +4,99 @@ This module tests that the database dependency functions work correctly
 and can be properly injected into FastAPI routes.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from pymongo import MongoClient
-from pymongo.collection import Collection
-from pymongo.database import Database
-
-from api.helpers.database import get_cards_collection, get_database, get_mongo_client
+from fastapi.testclient import TestClient
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.asynchronous.database import AsyncDatabase
+
+import api.helpers.database
+from api.helpers.database import (
+    close_async_mongo_client,
+    create_async_mongo_client,
+    get_async_cards_collection,
+    get_async_database,
+    get_async_mongo_client,
+    get_async_oracle_cards_collection,
+    get_async_sets_collection,
+)
+from api.main import app
+
+
+@pytest.fixture(autouse=True)
+def shared_client_reset():
+    """Start and end each test without a shared client."""
+    api.helpers.database._async_client = None
+    yield
+    api.helpers.database._async_client = None
 
 
 @pytest.mark.unit
-def test_get_mongo_client_returns_client():
-    """Test that get_mongo_client returns a MongoDB client instance."""
-    with patch("api.helpers.database.MongoClient") as mock_client:
-        mock_instance = MagicMock(spec=MongoClient)
-        mock_client.return_value = mock_instance
-
-        client = get_mongo_client()
+def test_create_async_mongo_client_uses_pool_settings():
+    """Test that the pool, timeouts and read preference are configured."""
+    with (
+        patch("api.helpers.database.AsyncMongoClient") as mock_client,
+        patch("api.helpers.database.DATABASE_MAX_POOL_SIZE", 25),
+        patch("api.helpers.database.DATABASE_READ_PREFERENCE", "secondaryPreferred"),
+    ):
+        create_async_mongo_client()
 
-        assert client is mock_instance
-        mock_client.assert_called_once()
+    options = mock_client.call_args.kwargs
+    assert options["maxPoolSize"] == 25
+    assert options["readPreference"] == "secondaryPreferred"
+    assert options["serverSelectionTimeoutMS"] == 5000
 
 
 @pytest.mark.unit
-def test_get_database_returns_correct_database():
-    """Test that get_database returns the correct database from client."""
-    mock_client = MagicMock(spec=MongoClient)
-    mock_database = MagicMock(spec=Database)
-    mock_client.__getitem__.return_value = mock_database
+def test_lifespan_opens_and_closes_client():
+    """Test that the application lifespan owns the shared client."""
+    with patch("api.helpers.database.AsyncMongoClient") as mock_async_client:
+        mock_async_instance = AsyncMock(spec=AsyncMongoClient)
+        mock_async_client.return_value = mock_async_instance
 
-    with patch("api.helpers.database.DATABASE", "test_db"):
-        database = get_database(client=mock_client)
+        with TestClient(app):
+            assert get_async_mongo_client() is mock_async_instance
+            mock_async_client.assert_called_once()
 
-        assert database is mock_database
-        mock_client.__getitem__.assert_called_once_with("test_db")
+        mock_async_instance.close.assert_awaited_once()
 
 
 @pytest.mark.unit
-def test_get_cards_collection_returns_correct_collection():
-    """Test that get_cards_collection returns the cards collection."""
-    mock_db = MagicMock(spec=Database)
-    mock_collection = MagicMock(spec=Collection)
-    mock_db.__getitem__.return_value = mock_collection
+async def test_async_client_is_shared_and_closed():
+    """Test that the routes share one client, closed on shutdown."""
+    with patch("api.helpers.database.AsyncMongoClient") as mock_async_client:
+        mock_instance = AsyncMock(spec=AsyncMongoClient)
+        mock_async_client.return_value = mock_instance
 
-    collection = get_cards_collection(db=mock_db)
+        assert get_async_mongo_client() is get_async_mongo_client()
+        await close_async_mongo_client()
 
-    assert collection is mock_collection
-    mock_db.__getitem__.assert_called_once_with("cards")
+    mock_async_client.assert_called_once()
+    mock_instance.close.assert_awaited_once()
 
 
 @pytest.mark.unit
-def test_dependency_injection_chain():
-    """Test that the full dependency injection chain works together."""
-    with patch("api.helpers.database.MongoClient") as mock_mongo_client:
-        # Setup mock chain
-        mock_client_instance = MagicMock(spec=MongoClient)
-        mock_db_instance = MagicMock(spec=Database)
-        mock_collection_instance = MagicMock(spec=Collection)
-
-        mock_mongo_client.return_value = mock_client_instance
-        mock_client_instance.__getitem__.return_value = mock_db_instance
-        mock_db_instance.__getitem__.return_value = mock_collection_instance
-
-        with patch("api.helpers.database.DATABASE", "test_db"):
-            # Test full chain
-            client = get_mongo_client()
-            database = get_database(client=client)
-            collection = get_cards_collection(db=database)
-
-            # Verify chain worked
-            assert client is mock_client_instance
-            assert database is mock_db_instance
-            assert collection is mock_collection_instance
-
-            # Verify calls
-            mock_mongo_client.assert_called_once()
-            mock_client_instance.__getitem__.assert_called_once_with("test_db")
-            mock_db_instance.__getitem__.assert_called_once_with("cards")
+@pytest.mark.parametrize(
+    ("dependency", "name"),
+    [
+        (get_async_cards_collection, "cards"),
+        (get_async_oracle_cards_collection, "oracle_cards"),
+        (get_async_sets_collection, "sets"),
+    ],
+)
+def test_async_dependency_chain(dependency, name):
+    """Test that the dependencies resolve each collection of the database."""
+    mock_client = MagicMock(spec=AsyncMongoClient)
+    mock_database = MagicMock(spec=AsyncDatabase)
+    mock_collection = MagicMock(spec=AsyncCollection)
+    mock_client.__getitem__.return_value = mock_database
+    mock_database.__getitem__.return_value = mock_collection
+
+    with patch("api.helpers.database.DATABASE", "test_db"):
+        collection = dependency(db=get_async_database(client=mock_client))
+
+    assert collection is mock_collection
+    mock_client.__getitem__.assert_called_once_with("test_db")
+    mock_database.__getitem__.assert_called_once_with(name)
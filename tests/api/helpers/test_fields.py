@@ -0,0 +1,107 @@
+"""Tests for the sparse fieldsets of the card routes.
+
+This module tests the parsing of the ``fields`` parameters and the
+projections and documents narrowed to the selected fields.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from api.helpers.cards_meili import ATTRIBUTES_TO_RETRIEVE
+from api.helpers.cards_mongo import CARD_PROJECTION, SUMMARY_PROJECTION
+from api.helpers.fields import (
+    CARD_FIELDS,
+    ORACLE_CARD_FIELDS,
+    meili_attributes,
+    narrow_projection,
+    needs_printings,
+    parse_fields,
+    pick_oracle_card,
+    printing_fields,
+)
+
+
+@pytest.mark.unit
+def test_parse_fields_accepts_comma_separated_and_repeated_values():
+    """Test that the values are split, deduplicated and sorted."""
+    assert parse_fields(["name, thumbnail", "set,name", ""], CARD_FIELDS) == [
+        "name",
+        "set",
+        "thumbnail",
+    ]
+    assert parse_fields([], CARD_FIELDS) is None
+    assert parse_fields([" , "], CARD_FIELDS) is None
+
+
+@pytest.mark.unit
+def test_parse_fields_rejects_unknown_fields():
+    """Test that fields outside the allow-list are a 422 error."""
+    with pytest.raises(HTTPException) as error:
+        parse_fields(["name,prices,_id"], CARD_FIELDS)
+
+    assert error.value.status_code == 422
+    assert error.value.detail == "Unknown fields: _id, prices"
+
+
+@pytest.mark.unit
+def test_narrow_projection_keeps_selected_and_required_fields():
+    """Test that computed fields keep their expression."""
+    assert narrow_projection(CARD_PROJECTION, ["thumbnail"], ["id"]) == {
+        "_id": 0,
+        "id": 1,
+        "thumbnail": "$image_uris.normal",
+    }
+    assert narrow_projection(SUMMARY_PROJECTION, None) is SUMMARY_PROJECTION
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    ("fields", "printings", "needed"),
+    [
+        (None, None, True),
+        (["name"], [], False),
+        (["card_count", "name"], [], True),
+        (["cards", "name"], None, True),
+        (["cards.set", "name"], ["set"], True),
+    ],
+)
+def test_printing_fields(fields, printings, needed):
+    """Test which printing fields an oracle card selection returns."""
+    assert all(field in ORACLE_CARD_FIELDS for field in fields or [])
+    assert printing_fields(fields) == printings
+    assert needs_printings(fields) is needed
+
+
+@pytest.mark.unit
+def test_pick_oracle_card_narrows_the_printings():
+    """Test that the oracle card and its printings keep their keys."""
+    card = {
+        "_id": "oracle-1",
+        "name": "Shock",
+        "mana_cost": "{R}",
+        "card_count": 1,
+        "cards": [{"id": "card-1", "oracle_id": "oracle-1", "set": "m19"}],
+    }
+
+    assert pick_oracle_card(card, ["cards.set", "name"]) == {
+        "_id": "oracle-1",
+        "name": "Shock",
+        "cards": [{"id": "card-1", "set": "m19"}],
+    }
+    assert pick_oracle_card(card, ["card_count"]) == {
+        "_id": "oracle-1",
+        "card_count": 1,
+    }
+    assert pick_oracle_card(card, None) is card
+
+
+@pytest.mark.unit
+def test_meili_attributes():
+    """Test that the printing ids are only retrieved to count them."""
+    assert meili_attributes(None) == ATTRIBUTES_TO_RETRIEVE
+    assert meili_attributes(["name", "thumbnail"]) == [
+        "oracle_id",
+        "name",
+        "thumbnail",
+    ]
+    assert meili_attributes(["card_count"]) == ["oracle_id", "printings"]
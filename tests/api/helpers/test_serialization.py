@@ -0,0 +1,63 @@
+"""Tests for the JSON encoding of the card responses.
+
+This module tests that the orjson fast path encodes the same documents as
+the FastAPI encoding, and that it can be switched off per route.
+"""
+
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from api.helpers import serialization
+from api.helpers.serialization import encode_json, json_response, uses_fast_json
+
+CARD = {
+    "_id": "oracle-1",
+    "name": "Jötun Grunt",
+    "cmc": 2.0,
+    "colors": ["W"],
+    "edhrec_rank": None,
+    "cards": [{"id": "card-1", "image_uris": {"normal": "https://img/1.jpg"}}],
+}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("fast", [False, True])
+def test_encode_json(fast):
+    """Test that both encoders return the same compact UTF-8 JSON."""
+    encoded = encode_json(CARD, fast=fast)
+
+    assert json.loads(encoded) == CARD
+    assert "Jötun".encode() in encoded
+    assert b", " not in encoded
+
+
+@pytest.mark.unit
+def test_encode_json_fast_path_falls_back_on_unknown_types():
+    """Test that values orjson does not support are still encoded."""
+    object_id = ObjectId()
+
+    encoded = encode_json(
+        {"_id": object_id, "deleted_at": datetime(2024, 1, 2, 3, 4, 5)}, fast=True
+    )
+
+    assert json.loads(encoded) == {
+        "_id": str(object_id),
+        "deleted_at": "2024-01-02T03:04:05",
+    }
+
+
+@pytest.mark.unit
+def test_fast_json_is_switched_per_route(monkeypatch):
+    """Test that only the configured routes use orjson, when installed."""
+    monkeypatch.setattr(serialization, "API_FAST_JSON_ROUTES", ["search"])
+
+    assert uses_fast_json("search")
+    assert not uses_fast_json("id")
+
+    monkeypatch.setattr(serialization, "orjson", None)
+
+    assert not uses_fast_json("search")
+    assert json.loads(json_response("search", CARD).body) == CARD
@@ -0,0 +1,52 @@
+"""Tests for the in-memory set list of GET /sets.
+
+This module tests the loaded set documents, their encoded responses and
+the ETag matching.
+"""
+
+import pytest
+
+from api.helpers.sets import SetsSnapshot, etag_matches, load_sets
+from tests.mocks.mongodb import AsyncMockMongoCollection, MockMongoCollection
+
+SET = {
+    "_id": "lea",
+    "code": "lea",
+    "name": "Limited Edition Alpha",
+    "released_at": "1993-08-05",
+    "set_type": "core",
+    "card_count": 4,
+}
+
+
+@pytest.mark.unit
+def test_etag_matches():
+    """Test the If-None-Match forms a client can send."""
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a", "b"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+
+@pytest.mark.unit
+def test_snapshot_etag_per_variant():
+    """Test that the list with details has its own ETag."""
+    snapshot = SetsSnapshot([SET])
+
+    assert snapshot.etags[False] != snapshot.etags[True]
+    assert snapshot.response(False, snapshot.etags[False]).status_code == 304
+    assert snapshot.response(True, snapshot.etags[False]).status_code == 200
+
+
+@pytest.mark.unit
+async def test_load_sets_newest_first():
+    """Test that the set documents are trimmed and sorted by release."""
+    sets = MockMongoCollection(
+        [SET, {**SET, "_id": "m10", "code": "m10", "released_at": "2009-07-17"}]
+    )
+
+    loaded = await load_sets(AsyncMockMongoCollection(sets), None)
+
+    assert [card_set["code"] for card_set in loaded] == ["m10", "lea"]
+    assert "_id" not in loaded[0]
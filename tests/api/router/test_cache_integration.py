@@ -0,0 +1,73 @@
+"""Integration tests for the response cache of the card routes.
+
+This module tests that the card and set endpoints are served from the
+cache on repeated requests and that the hit/miss counts are exposed on
+/cache/stats.
+"""
+
+import pytest
+
+BOLT_ID = "550c74d4-a843-4208-a3c2-c71e84a21979"
+
+
+@pytest.mark.integration
+def test_repeated_request_is_a_hit(test_client, mock_cards_collection):
+    """Test that a second identical request does not reach MongoDB."""
+    first = test_client.get(f"/cards/id/{BOLT_ID}")
+    # Changes in the database are only seen after a data version bump
+    mock_cards_collection._documents.clear()
+    second = test_client.get(f"/cards/id/{BOLT_ID}")
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    stats = test_client.get("/cache/stats").json()
+    assert stats["routes"]["id"] == {"misses": 1, "hits": 1}
+    assert stats["hit_ratio"] == 0.5
+
+
+@pytest.mark.integration
+def test_fast_json_routes_return_the_same_cards(
+    test_client, mock_response_cache, monkeypatch
+):
+    """Test that the orjson and stdlib encodings of a route agree."""
+    mock_response_cache.client = None
+    fast = test_client.get("/cards/Lightning Bolt")
+    monkeypatch.setattr("api.helpers.serialization.API_FAST_JSON_ROUTES", [])
+    slow = test_client.get("/cards/Lightning Bolt")
+
+    assert fast.headers["content-type"] == slow.headers["content-type"]
+    assert fast.json() == slow.json()
+    assert fast.json()["cards"]
+
+
+@pytest.mark.integration
+def test_equivalent_searches_share_an_entry(test_client):
+    """Test that parameter order and case do not split the cache."""
+    test_client.get("/cards/search/Bolt?colors=R&colors=U")
+    test_client.get("/cards/search/bolt?colors=U&colors=R")
+
+    assert test_client.get("/cache/stats").json()["routes"]["search"] == {
+        "misses": 1,
+        "hits": 1,
+    }
+
+
+@pytest.mark.integration
+def test_not_found_is_not_cached(test_client):
+    """Test that 404 responses are computed on every request."""
+    for _ in range(2):
+        assert test_client.get("/cards/id/missing").status_code == 404
+
+    assert test_client.get("/cache/stats").json()["routes"]["id"] == {"misses": 2}
+
+
+@pytest.mark.integration
+def test_sets_served_without_redis(test_client, mock_response_cache):
+    """Test that the routes keep working when Redis is down."""
+    mock_response_cache.client.fail = True
+
+    response = test_client.get("/sets")
+
+    assert response.status_code == 200
+    assert response.json()["sets"]
+    assert test_client.get("/cache/stats").json()["available"] is False
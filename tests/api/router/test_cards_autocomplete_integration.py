@@ -0,0 +1,48 @@
+"""Integration tests for the /cards/autocomplete endpoint.
+
+This module tests the name suggestions served from the in-memory index
+built from the oracle cards.
+"""
+
+import pytest
+
+
+@pytest.mark.integration
+def test_autocomplete_suggests_names(test_client):
+    """Test that the oracle names starting with the prefix are returned."""
+    response = test_client.get("/cards/autocomplete?q=LIGHT")
+
+    assert response.status_code == 200
+    assert response.json()["cards"] == [
+        {
+            "name": "Lightning Bolt",
+            "oracle_id": response.json()["cards"][0]["oracle_id"],
+            "edhrec_rank": None,
+        }
+    ]
+
+
+@pytest.mark.integration
+def test_autocomplete_limit_and_validation(test_client):
+    """Test the number of suggestions and the rejected parameters."""
+    assert len(test_client.get("/cards/autocomplete?q=s&limit=1").json()["cards"]) == 1
+    assert test_client.get("/cards/autocomplete?q=").status_code == 422
+    assert test_client.get("/cards/autocomplete?q=s&limit=1000").status_code == 422
+
+
+@pytest.mark.integration
+def test_autocomplete_index_is_built_once(test_client, mock_oracle_cards_collection):
+    """Test that the index is kept in memory until the data version changes."""
+    test_client.get("/cards/autocomplete?q=sol")
+    mock_oracle_cards_collection._documents.clear()
+
+    cards = test_client.get("/cards/autocomplete?q=sol").json()["cards"]
+
+    assert [card["name"] for card in cards] == ["Sol Ring"]
+
+
+@pytest.mark.integration
+def test_name_search_escapes_regex_characters(test_client):
+    """Test that a name with regex metacharacters does not break the lookup."""
+    assert test_client.get("/cards/Lightning (").status_code == 200
+    assert test_client.get("/cards/.*").json() is None
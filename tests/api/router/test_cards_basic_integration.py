@@ -89,8 +89,9 @@ def test_get_card_by_name_with_set_filter(test_client):
     data = response.json()
     assert data is not None
     assert data["name"] == "Lightning Bolt"
-    # When filtered by set, should return the specific printing
-    # (Note: Aggregation still groups, but only one set's cards are included)
+    # When filtered by set, only that set's printings are included
+    assert data["card_count"] == 1
+    assert [card["set"] for card in data["cards"]] == ["lea"]
 
 
 @pytest.mark.integration
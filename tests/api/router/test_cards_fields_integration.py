@@ -0,0 +1,106 @@
+"""Integration tests for the ``fields`` parameter of the card endpoints.
+
+This module tests that every card endpoint returns only the selected fields
+and the key of each document, and rejects unknown fields.
+"""
+
+import pytest
+
+SCRYFALL_ID = "550c74d4-a843-4208-a3c2-c71e84a21979"
+ORACLE_ID = "b29c8b8a-2c8f-4891-88bc-f35d07a68293"
+
+
+@pytest.mark.integration
+def test_card_by_id_fields(test_client):
+    """Test that a printing keeps its id and the selected fields."""
+    response = test_client.get(
+        f"/cards/id/{SCRYFALL_ID}", params={"fields": "name,mana_cost"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": SCRYFALL_ID,
+        "name": "Lightning Bolt",
+        "mana_cost": "{R}",
+    }
+
+
+@pytest.mark.integration
+def test_oracle_printings_fields(test_client):
+    """Test the repeated form of the parameter on the printings routes."""
+    for path in (f"/cards/oracle/{ORACLE_ID}", f"/cards/oracle/{ORACLE_ID}/printings"):
+        response = test_client.get(path, params={"fields": ["set", "name"]})
+
+        assert response.status_code == 200
+        data = response.json()
+        cards = data if isinstance(data, list) else data["cards"]
+        assert len(cards) == 2
+        assert all(set(card) == {"id", "name", "set"} for card in cards)
+
+
+@pytest.mark.integration
+def test_card_by_name_fields(test_client):
+    """Test that the printings are only returned when selected."""
+    data = test_client.get(
+        "/cards/Lightning Bolt", params={"fields": "name,card_count"}
+    ).json()
+    assert data == {"_id": ORACLE_ID, "name": "Lightning Bolt", "card_count": 2}
+
+    data = test_client.get(
+        "/cards/Lightning Bolt", params={"fields": "name,cards.set"}
+    ).json()
+    assert set(data) == {"_id", "name", "cards"}
+    assert sorted(card["set"] for card in data["cards"]) == ["2xm", "lea"]
+    assert all(set(card) == {"id", "set"} for card in data["cards"])
+
+
+@pytest.mark.integration
+def test_search_fields(test_client, mock_search_client, monkeypatch):
+    """Test that both search backends return the selected summary fields."""
+    mongo = test_client.get(
+        "/cards/search/lightning", params={"fields": "name,thumbnail"}
+    ).json()
+    monkeypatch.setattr("api.router.cards.CARDS_SEARCH_BACKEND", "meilisearch")
+    meili = test_client.get(
+        "/cards/search/lightning", params={"fields": "name,thumbnail"}
+    ).json()
+
+    for data in (mongo, meili):
+        assert data["cards"]
+        assert all(
+            set(card) == {"_id", "name", "thumbnail", "score"} for card in data["cards"]
+        )
+
+    _, params = mock_search_client.index("cards").searches[-1]
+    assert params["attributesToRetrieve"] == ["oracle_id", "name", "thumbnail"]
+
+
+@pytest.mark.integration
+def test_resolve_fields(test_client):
+    """Test that the set of a line still narrows the unselected printings."""
+    data = test_client.post(
+        "/cards/resolve",
+        params={"fields": "card_count"},
+        json={"cards": [{"name": "Lightning Bolt", "set": "2XM"}]},
+    ).json()
+
+    assert data["results"][0]["card"] == {"_id": ORACLE_ID, "card_count": 1}
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize(
+    "path",
+    [
+        f"/cards/id/{SCRYFALL_ID}",
+        f"/cards/oracle/{ORACLE_ID}",
+        f"/cards/oracle/{ORACLE_ID}/printings",
+        "/cards/Lightning Bolt",
+        "/cards/search/lightning",
+    ],
+)
+def test_unknown_fields_are_rejected(test_client, path):
+    """Test that a field outside the allow-list is a 422 error."""
+    response = test_client.get(path, params={"fields": "name,prices"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "Unknown fields: prices"
@@ -0,0 +1,108 @@
+"""Integration tests for the /cards/oracle/{oracle_id}/printings endpoint.
+
+This module tests the paginated printings of an oracle card fetched on
+demand by the clients, and their language and set filters.
+"""
+
+import pytest
+
+from tests.fixtures.sample_cards import get_all_sample_cards
+from tests.mocks.mongodb import MockMongoCollection
+
+ORACLE_ID = "a1b2c3d4-oracle-printings"
+
+
+@pytest.fixture
+def mock_cards_collection():
+    """Sample cards plus five printings of one oracle, one of them French."""
+    printings = [
+        {
+            "id": f"printing-{number}",
+            "oracle_id": ORACLE_ID,
+            "name": "Shock",
+            "lang": "fr" if number == 4 else "en",
+            "set": "aaa" if number < 2 else "bbb",
+            "set_name": "Set A" if number < 2 else "Set B",
+            # Two printings share a release date, ordered by id
+            "released_at": f"202{min(number, 3)}-01-01",
+        }
+        for number in range(5)
+    ]
+    return MockMongoCollection(get_all_sample_cards() + printings)
+
+
+def get_all_pages(test_client, **filters) -> list[dict]:
+    """Follow the cursors of the printings endpoint."""
+    cards, cursor = [], None
+    while True:
+        params = {"page_count": 2, **filters}
+        if cursor:
+            params["cursor"] = cursor
+        data = test_client.get(
+            f"/cards/oracle/{ORACLE_ID}/printings", params=params
+        ).json()
+        cards.extend(data["cards"])
+        cursor = data["cursor"]
+        assert data["has_more"] is (cursor is not None)
+        if cursor is None:
+            return cards
+
+
+@pytest.mark.integration
+def test_printings_pages_are_newest_first(test_client):
+    """Test that the pages cover every printing once, newest first."""
+    cards = get_all_pages(test_client)
+
+    assert [card["id"] for card in cards] == [
+        "printing-3",
+        "printing-4",
+        "printing-2",
+        "printing-1",
+        "printing-0",
+    ]
+
+
+@pytest.mark.integration
+def test_printings_without_release_date_come_last(test_client, mock_cards_collection):
+    """Test that the cursors page through the printings without a date."""
+    mock_cards_collection._documents.extend(
+        [
+            {"id": "undated-b", "oracle_id": ORACLE_ID, "lang": "en"},
+            {"id": "undated-a", "oracle_id": ORACLE_ID, "released_at": None},
+            {"id": "undated-c", "oracle_id": ORACLE_ID, "released_at": None},
+        ]
+    )
+
+    cards = get_all_pages(test_client)
+
+    assert [card["id"] for card in cards][-4:] == [
+        "printing-0",
+        "undated-a",
+        "undated-b",
+        "undated-c",
+    ]
+    assert len(cards) == 8
+
+
+@pytest.mark.integration
+def test_printings_filters(test_client):
+    """Test the language and set filters."""
+    english = get_all_pages(test_client, lang="en")
+    set_b = get_all_pages(test_client, set="BBB")
+
+    assert "printing-4" not in {card["id"] for card in english}
+    assert len(english) == 4
+    assert {card["set"] for card in set_b} == {"bbb"}
+    assert len(set_b) == 3
+
+
+@pytest.mark.integration
+def test_printings_of_unknown_oracle(test_client):
+    """Test that an unknown oracle has an empty first page."""
+    data = test_client.get("/cards/oracle/missing/printings").json()
+
+    assert data == {"cards": [], "cursor": None, "has_more": False}
+    assert (
+        test_client.get("/cards/oracle/missing/printings?page_count=0").status_code
+        == 422
+    )
@@ -0,0 +1,120 @@
+"""Integration tests for the POST /cards/resolve endpoint.
+
+This module tests that a whole deck list is resolved at once, line by line
+like /cards/{name}, with its set and collector number.
+"""
+
+import pytest
+
+from api.router.cards import CardLine, resolve_card_lines
+from tasks.storage import lean_document, storage_fields
+from tests.fixtures.sample_cards import get_all_sample_cards
+from tests.mocks.mongodb import AsyncMockMongoCollection, MockMongoCollection
+
+
+@pytest.mark.integration
+def test_resolve_deck_list(test_client):
+    """Test that every line gets its card, in order, and misses are listed."""
+    response = test_client.post(
+        "/cards/resolve",
+        json={
+            "cards": [
+                {"count": 1, "name": "sol ring", "special": None},
+                {"count": 4, "name": "Missing Card"},
+                {"count": 2, "name": "Delver of Secrets"},
+                {"count": 1, "name": "LIGHTNING BOLT"},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [result["name"] for result in data["results"]] == [
+        "sol ring",
+        "Missing Card",
+        "Delver of Secrets",
+        "LIGHTNING BOLT",
+    ]
+    assert data["results"][0]["card"]["name"] == "Sol Ring"
+    assert data["results"][0]["count"] == 1
+    assert data["results"][1]["card"] is None
+    assert data["results"][2]["card"]["name"].startswith("Delver of Secrets //")
+    assert data["results"][3]["card"]["card_count"] == 2
+    assert data["missing"] == ["Missing Card"]
+
+
+@pytest.mark.integration
+def test_resolve_narrows_printings_to_the_set(test_client):
+    """Test that a set code keeps the printings of that set only."""
+    data = test_client.post(
+        "/cards/resolve",
+        json={
+            "cards": [
+                {"name": "Lightning Bolt", "set": "2XM"},
+                {"name": "Sol Ring", "set": "2XM"},
+            ]
+        },
+    ).json()
+
+    bolt = data["results"][0]["card"]
+    assert [card["set"] for card in bolt["cards"]] == ["2xm"]
+    assert data["missing"] == ["Sol Ring"]
+
+
+@pytest.mark.integration
+def test_resolve_rejects_too_long_deck_lists(test_client):
+    """Test that the number of lines is bounded."""
+    response = test_client.post(
+        "/cards/resolve", json={"cards": [{"name": "Sol Ring"}] * 1000}
+    )
+
+    assert response.status_code == 422
+
+
+@pytest.mark.integration
+async def test_resolve_collector_number(mock_oracle_cards_collection):
+    """Test that a known collector number picks its printing."""
+    cards = MockMongoCollection(
+        [
+            {**card, "collector_number": str(number)}
+            for number, card in enumerate(get_all_sample_cards())
+        ]
+    )
+    bolts = [card for card in cards.find({"name": "Lightning Bolt"})]
+
+    result = await resolve_card_lines(
+        AsyncMockMongoCollection(cards),
+        AsyncMockMongoCollection(mock_oracle_cards_collection),
+        [
+            CardLine(name="Lightning Bolt", num=bolts[1]["collector_number"]),
+            CardLine(name="Lightning Bolt", num="999"),
+        ],
+        "en",
+    )
+
+    exact, unknown = (line["card"]["cards"] for line in result["results"])
+    assert [card["id"] for card in exact] == [bolts[1]["id"]]
+    assert len(unknown) == 2
+
+
+@pytest.mark.integration
+async def test_resolve_collector_number_of_lean_cards(mock_oracle_cards_collection):
+    """Test that the lean storage profile keeps the collector numbers."""
+    fields = storage_fields("api-minimal")
+    cards = MockMongoCollection(
+        [
+            lean_document({**card, "collector_number": str(number)}, fields)
+            for number, card in enumerate(get_all_sample_cards())
+        ]
+    )
+    bolts = [card for card in cards.find({"name": "Lightning Bolt"})]
+
+    result = await resolve_card_lines(
+        AsyncMockMongoCollection(cards),
+        AsyncMockMongoCollection(mock_oracle_cards_collection),
+        [CardLine(name="Lightning Bolt", num=bolts[0]["collector_number"])],
+        "en",
+    )
+
+    [line] = result["results"]
+    assert [card["id"] for card in line["card"]["cards"]] == [bolts[0]["id"]]
@@ -437,7 +437,7 @@ def test_search_filter_sets(test_client):
     This validates:
     - sets parameter filters by set_name field
     - Cards from ANY of the specified sets are returned
-    - set_name is in the individual card printings (cards array)
+    - The printings of each result in the set are fetched on demand
     """
     response = test_client.get(
         "/cards/search/a?sets=Limited Edition Alpha&page_count=20"
@@ -449,16 +449,23 @@ def test_search_filter_sets(test_client):
     assert len(data["cards"]) > 0
 
     # Verify all returned oracle cards have at least one printing from Alpha
-    # (set_name is in the cards array, not at the top level after $group)
     for oracle_card in data["cards"]:
-        cards = oracle_card.get("cards", [])
-        assert len(cards) > 0, f"Oracle card {oracle_card['name']} has no printings"
+        printings = test_client.get(
+            f"/cards/oracle/{oracle_card['_id']}/printings?set=LEA"
+        ).json()["cards"]
+        assert printings, f"Oracle card {oracle_card['name']} has no Alpha printing"
+        assert {card["set_name"] for card in printings} == {"Limited Edition Alpha"}
 
-        # Check that at least one printing is from the filtered set
-        set_names = [c.get("set_name", "") for c in cards]
-        assert "Limited Edition Alpha" in set_names, (
-            f"Card {oracle_card['name']} has printings from {set_names}"
-        )
+
+@pytest.mark.integration
+def test_search_returns_compact_summaries(test_client):
+    """Test that search results hold no printings, only their count."""
+    data = test_client.get("/cards/search/bolt").json()
+
+    bolt = data["cards"][0]
+    assert "cards" not in bolt
+    assert "printings" not in bolt
+    assert bolt["card_count"] == 2
 
 
 @pytest.mark.integration
@@ -484,3 +491,58 @@ def test_search_filter_combined(test_client):
         cmc = card.get("cmc", 0)
         assert "U" in colors, f"Card {card['name']} missing U color: {colors}"
         assert 1 <= cmc <= 3, f"Card {card['name']} has CMC {cmc} (not in 1-3 range)"
+
+
+# =============================================================================
+# MEILISEARCH BACKEND TESTS
+# =============================================================================
+
+
+@pytest.fixture
+def meilisearch_backend(monkeypatch):
+    """Serve the search from the Meilisearch cards index."""
+    monkeypatch.setattr("api.router.cards.CARDS_SEARCH_BACKEND", "meilisearch")
+
+
+@pytest.mark.integration
+def test_search_meilisearch_backend(
+    test_client, mock_search_client, meilisearch_backend
+):
+    """Test that the Meilisearch backend returns oracle cards and printings.
+
+    Expected: Lightning Bolt with its two printings, searched with the
+    filters translated to a Meilisearch filter expression
+    """
+    response = test_client.get(
+        "/cards/search/lightning",
+        params={"colors": ["R"], "types": ["Instant"], "cmc_max": 1},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [card["name"] for card in data["cards"]] == ["Lightning Bolt"]
+    assert data["cards"][0]["card_count"] == 2
+    assert "score" in data["cards"][0]
+    assert data["has_more"] is False
+
+    _, params = mock_search_client.index("cards").searches[-1]
+    assert params["filter"] == [
+        'lang = "en"',
+        'colors IN ["R"]',
+        "cmc <= 1",
+        ['types = "Instant"'],
+    ]
+
+
+@pytest.mark.integration
+def test_search_meilisearch_backend_pagination(test_client, meilisearch_backend):
+    """Test that the Meilisearch cursor is the offset of the next page."""
+    first = test_client.get("/cards/search/a", params={"page_count": 1}).json()
+
+    assert first["has_more"] is True
+    assert first["cursor"] == "1"
+
+    second = test_client.get(
+        "/cards/search/a", params={"page_count": 1, "cursor": first["cursor"]}
+    ).json()
+    assert second["cards"][0]["_id"] != first["cards"][0]["_id"]
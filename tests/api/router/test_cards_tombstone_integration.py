@@ -0,0 +1,57 @@
+"""Integration tests for the printings tombstoned by a sync.
+
+This module tests that the card routes do not return the printings flagged
+with ``deleted_at`` (INGEST_DELETE_MODE=tombstone).
+"""
+
+from datetime import datetime
+
+import pytest
+
+from tests.fixtures.sample_cards import get_all_sample_cards
+from tests.mocks.mongodb import MockMongoCollection
+
+BOLT_ORACLE_ID = "b29c8b8a-2c8f-4891-88bc-f35d07a68293"
+
+
+@pytest.fixture
+def deleted_id():
+    """Id of the Lightning Bolt printing removed from the bulk file."""
+    return next(
+        card["id"]
+        for card in get_all_sample_cards()
+        if card.get("oracle_id") == BOLT_ORACLE_ID and card["set"] == "2xm"
+    )
+
+
+@pytest.fixture
+def mock_cards_collection(deleted_id):
+    """Sample cards with one Lightning Bolt printing tombstoned."""
+    return MockMongoCollection(
+        [
+            {**card, "deleted_at": datetime(2025, 1, 2)}
+            if card["id"] == deleted_id
+            else card
+            for card in get_all_sample_cards()
+        ]
+    )
+
+
+@pytest.mark.integration
+def test_tombstoned_printing_is_not_found_by_id(test_client, deleted_id):
+    """Test that /cards/id/{id} answers 404 for a tombstoned printing."""
+    assert test_client.get(f"/cards/id/{deleted_id}").status_code == 404
+
+
+@pytest.mark.integration
+def test_tombstoned_printing_is_not_listed(test_client, deleted_id):
+    """Test that the printings of an oracle card exclude the tombstones."""
+    by_oracle = test_client.get(f"/cards/oracle/{BOLT_ORACLE_ID}").json()
+    by_name = test_client.get("/cards/Lightning Bolt").json()
+    resolved = test_client.post(
+        "/cards/resolve", json={"cards": [{"name": "Lightning Bolt"}]}
+    ).json()["results"][0]["card"]
+
+    for cards in (by_oracle, by_name["cards"], resolved["cards"]):
+        assert [card["set"] for card in cards] == ["lea"]
+    assert by_name["card_count"] == 1
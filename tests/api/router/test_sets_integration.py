@@ -97,3 +97,44 @@ def test_get_sets_returns_alphabetically_sorted_descending(test_client):
 
     # Alternative verification: ensure list is sorted in descending order
     assert sets == sorted(sets, reverse=True)
+
+
+@pytest.mark.integration
+def test_get_sets_details(test_client):
+    """Test that the set metadata is returned on request, newest first."""
+    data = test_client.get("/sets?details=true").json()
+
+    assert len(data["details"]) == 7
+    assert {card_set["name"] for card_set in data["details"]} == set(data["sets"])
+    released = [card_set["released_at"] for card_set in data["details"]]
+    assert released == sorted(released, reverse=True)
+    alpha = next(s for s in data["details"] if s["code"] == "lea")
+    assert alpha["name"] == "Limited Edition Alpha"
+    assert alpha["card_count"] >= 4
+    assert "details" not in test_client.get("/sets").json()
+
+
+@pytest.mark.integration
+def test_get_sets_not_modified(test_client):
+    """Test that a client holding the current list gets an empty 304."""
+    etag = test_client.get("/sets").headers["etag"]
+
+    response = test_client.get("/sets", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert test_client.get("/sets", headers={"If-None-Match": '"old"'}).json()["sets"]
+
+
+@pytest.mark.integration
+def test_get_sets_before_the_sets_collection_is_built(
+    test_client, mock_sets_collection
+):
+    """Test that the sets are grouped from the cards until an ingest built them."""
+    mock_sets_collection._documents.clear()
+
+    data = test_client.get("/sets?details=true").json()
+
+    assert len(data["sets"]) == 7
+    assert {card_set["code"] for card_set in data["details"]} >= {"lea", "2xm"}
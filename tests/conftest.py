@@ -7,10 +7,23 @@ MongoDB collections and FastAPI TestClient with dependency overrides.
 import pytest
 from fastapi.testclient import TestClient
 
-from api.helpers.database import get_cards_collection
+from api.depedencies.embedding import get_meilisearch_client
+from api.helpers.autocomplete import get_name_index
+from api.helpers.cache import DataSnapshot, ResponseCache, get_response_cache
+from api.helpers.database import (
+    get_async_cards_collection,
+    get_async_oracle_cards_collection,
+    get_async_sets_collection,
+)
+from api.helpers.sets import get_sets_catalog
 from api.main import app
+from tasks.oracle_cards import build_oracle_documents
+from tasks.search_index import CARDS_INDEX_SETTINGS, search_document
+from tasks.sets import build_set_documents
 from tests.fixtures.sample_cards import get_all_sample_cards
-from tests.mocks.mongodb import MockMongoCollection
+from tests.mocks.meilisearch import MockMeilisearchClient
+from tests.mocks.mongodb import AsyncMockMongoCollection, MockMongoCollection
+from tests.mocks.redis import MockRedis
 
 
 @pytest.fixture
@@ -23,6 +36,61 @@ def mock_cards_collection():
     return MockMongoCollection(get_all_sample_cards())
 
 
+@pytest.fixture
+def mock_oracle_cards_collection():
+    """Mock oracle_cards collection built from the sample cards.
+
+    Returns:
+        MockMongoCollection with one document per oracle and language, as
+        maintained by the ingest.
+    """
+    return MockMongoCollection(build_oracle_documents(get_all_sample_cards()))
+
+
+@pytest.fixture
+def mock_sets_collection():
+    """Mock sets collection built from the sample cards.
+
+    Returns:
+        MockMongoCollection with one document per set, as maintained by the
+        ingest.
+    """
+    return MockMongoCollection(
+        build_set_documents(MockMongoCollection(get_all_sample_cards()))
+    )
+
+
+@pytest.fixture
+def mock_search_client():
+    """Mock Meilisearch client with the cards index of the sample cards.
+
+    Returns:
+        MockMeilisearchClient whose ``cards`` index holds one document per
+        oracle card, as pushed by the ingest.
+    """
+    client = MockMeilisearchClient()
+    index = client.index("cards")
+    index.update_settings(CARDS_INDEX_SETTINGS)
+    index.add_documents(
+        [
+            search_document(oracle)
+            for oracle in build_oracle_documents(get_all_sample_cards())
+        ],
+        primary_key="id",
+    )
+    return client
+
+
+@pytest.fixture
+def mock_response_cache():
+    """Response cache backed by an empty in-memory Redis.
+
+    Returns:
+        ResponseCache whose ``client`` is a MockRedis.
+    """
+    return ResponseCache(MockRedis())
+
+
 @pytest.fixture
 def empty_collection():
     """Empty MongoDB collection for testing empty states.
@@ -34,20 +102,44 @@ def empty_collection():
 
 
 @pytest.fixture
-def test_client(mock_cards_collection):
-    """FastAPI TestClient with mocked MongoDB collection.
-
-    This fixture overrides the database dependency to use the mock
-    collection instead of connecting to a real MongoDB instance.
+def test_client(
+    mock_cards_collection,
+    mock_oracle_cards_collection,
+    mock_sets_collection,
+    mock_search_client,
+    mock_response_cache,
+):
+    """FastAPI TestClient with mocked MongoDB collections.
+
+    This fixture overrides the database dependencies to use the mock
+    collections instead of connecting to a real MongoDB instance.
 
     Args:
         mock_cards_collection: Fixture providing mock collection.
+        mock_oracle_cards_collection: Fixture providing mock oracle cards.
+        mock_sets_collection: Fixture providing mock sets.
+        mock_search_client: Fixture providing mock Meilisearch client.
+        mock_response_cache: Fixture providing the response cache.
 
     Yields:
         TestClient instance with overridden dependencies.
     """
-    # Override the dependency to return our mock collection
-    app.dependency_overrides[get_cards_collection] = lambda: mock_cards_collection
+    # Override the dependencies to return our mock collections
+    app.dependency_overrides[get_async_cards_collection] = lambda: (
+        AsyncMockMongoCollection(mock_cards_collection)
+    )
+    app.dependency_overrides[get_async_oracle_cards_collection] = lambda: (
+        AsyncMockMongoCollection(mock_oracle_cards_collection)
+    )
+    app.dependency_overrides[get_async_sets_collection] = lambda: (
+        AsyncMockMongoCollection(mock_sets_collection)
+    )
+    app.dependency_overrides[get_meilisearch_client] = lambda: mock_search_client
+    app.dependency_overrides[get_response_cache] = lambda: mock_response_cache
+    catalog = DataSnapshot("sets")
+    app.dependency_overrides[get_sets_catalog] = lambda: catalog
+    names = DataSnapshot("autocomplete")
+    app.dependency_overrides[get_name_index] = lambda: names
 
     # Create test client
     yield TestClient(app)
@@ -57,17 +149,32 @@ def test_client(mock_cards_collection):
 
 
 @pytest.fixture
-def test_client_empty(empty_collection):
+def test_client_empty(empty_collection, mock_response_cache):
     """FastAPI TestClient with empty MongoDB collection.
 
     Useful for testing endpoints with no data.
 
     Args:
         empty_collection: Fixture providing empty collection.
+        mock_response_cache: Fixture providing the response cache.
 
     Yields:
         TestClient instance with empty collection.
     """
-    app.dependency_overrides[get_cards_collection] = lambda: empty_collection
+    app.dependency_overrides[get_async_cards_collection] = lambda: (
+        AsyncMockMongoCollection(empty_collection)
+    )
+    app.dependency_overrides[get_async_oracle_cards_collection] = lambda: (
+        AsyncMockMongoCollection(empty_collection)
+    )
+    app.dependency_overrides[get_async_sets_collection] = lambda: (
+        AsyncMockMongoCollection(empty_collection)
+    )
+    app.dependency_overrides[get_meilisearch_client] = MockMeilisearchClient
+    app.dependency_overrides[get_response_cache] = lambda: mock_response_cache
+    catalog = DataSnapshot("sets")
+    app.dependency_overrides[get_sets_catalog] = lambda: catalog
+    names = DataSnapshot("autocomplete")
+    app.dependency_overrides[get_name_index] = lambda: names
     yield TestClient(app)
     app.dependency_overrides.clear()
@@ -84,6 +84,22 @@ class TestAPIClient:
             assert response.status_code == 200
             assert response.json() == {"cards": []}
 
+    @pytest.mark.asyncio
+    async def test_post_json(self, httpx_mock: HTTPXMock):
+        """Test POST request with a JSON body."""
+        httpx_mock.add_response(
+            method="POST",
+            url="http://test:8000/cards/resolve",
+            match_json={"cards": [{"name": "Sol Ring"}]},
+            json={"results": [], "missing": []},
+        )
+
+        async with APIClient(base_url="http://test:8000") as client:
+            response = await client.post(
+                "/cards/resolve", json={"cards": [{"name": "Sol Ring"}]}
+            )
+            assert response.json() == {"results": [], "missing": []}
+
     @pytest.mark.asyncio
     async def test_get_404_error(self, httpx_mock: HTTPXMock):
         """Test 404 error handling."""
@@ -46,3 +46,11 @@ class TestMCPServer:
 
         assert inspect.iscoroutinefunction(cards.get_card_by_scryfall_id.fn)
         assert inspect.iscoroutinefunction(cards.get_cards_by_oracle_id.fn)
+
+    def test_server_has_card_tools(self):
+        """Test the deck list tool is registered."""
+        import inspect
+
+        from mcp_server.tools import cards
+
+        assert inspect.iscoroutinefunction(cards.resolve_deck_list.fn)
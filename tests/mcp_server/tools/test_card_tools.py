@@ -0,0 +1,76 @@
+"""Unit tests for MCP card tools."""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+
+# Add project root to path
+project_root = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture
+def mock_api_client():
+    """Mock APIClient for testing."""
+    client = Mock()
+    client.post = AsyncMock()
+    return client
+
+
+class TestResolveDeckListTool:
+    """Test suite for the resolve_deck_list tool."""
+
+    @pytest.mark.asyncio
+    async def test_tool_posts_the_deck_list(self, mock_api_client):
+        """Test that the whole deck list is sent in one request."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"results": [], "missing": ["Nope"]}
+        mock_api_client.post.return_value = mock_response
+        cards = [{"name": "Sol Ring", "count": 1}, {"name": "Nope"}]
+
+        with patch("mcp_server.tools.cards.get_client", return_value=mock_api_client):
+            from mcp_server.tools.cards import resolve_deck_list
+
+            result = await resolve_deck_list.fn(cards, lang=None)
+
+        mock_api_client.post.assert_called_once_with(
+            "/cards/resolve", params=None, json={"cards": cards, "lang": "en"}
+        )
+        assert result["missing"] == ["Nope"]
+
+    @pytest.mark.asyncio
+    async def test_tool_sends_the_fields(self, mock_api_client):
+        """Test that the selected fields narrow the returned cards."""
+        mock_api_client.post.return_value = Mock()
+        cards = [{"name": "Sol Ring"}]
+
+        with patch("mcp_server.tools.cards.get_client", return_value=mock_api_client):
+            from mcp_server.tools.cards import resolve_deck_list
+
+            await resolve_deck_list.fn(cards, fields=["name", "mana_cost"])
+
+        mock_api_client.post.assert_called_once_with(
+            "/cards/resolve",
+            params={"fields": ["name", "mana_cost"]},
+            json={"cards": cards, "lang": "en"},
+        )
+
+    @pytest.mark.asyncio
+    async def test_tool_422_error(self, mock_api_client):
+        """Test that an invalid deck list error propagates."""
+        mock_response = Mock()
+        mock_response.status_code = 422
+        mock_api_client.post.side_effect = httpx.HTTPStatusError(
+            "Unprocessable", request=Mock(), response=mock_response
+        )
+
+        with patch("mcp_server.tools.cards.get_client", return_value=mock_api_client):
+            from mcp_server.tools.cards import resolve_deck_list
+
+            with pytest.raises(httpx.HTTPStatusError) as exc_info:
+                await resolve_deck_list.fn([{"count": 1}])
+
+        assert exc_info.value.response.status_code == 422
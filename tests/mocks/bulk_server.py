@@ -0,0 +1,115 @@
+"""Local HTTP stand-in for the Scryfall bulk data download.
+
+This module serves a fixture file over real HTTP on localhost so streaming
+downloads can be tested end to end, including gzip Content-Encoding, Range
+requests and connections dropped mid-body.
+"""
+
+import gzip
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+
+class BulkFileServer:
+    """Serve a single file at /bulk.json on a random local port.
+
+    Usage:
+        with BulkFileServer(payload, gzip_encoding=True) as server:
+            stream = open_bulk_stream(server.url)
+    """
+
+    def __init__(
+        self,
+        payload: bytes,
+        gzip_encoding: bool = False,
+        fail_after: Optional[int] = None,
+        failures: int = 1,
+        support_range: bool = True,
+        etag: Optional[str] = '"fixture"',
+    ):
+        """Initialize server state.
+
+        Args:
+            payload: Bytes of the fixture file.
+            gzip_encoding: Serve the payload gzip compressed with
+                Content-Encoding: gzip.
+            fail_after: Drop the connection after this many body bytes.
+            failures: Number of responses that are cut at fail_after.
+            support_range: Answer Range requests with 206 Partial Content.
+            etag: ETag of the file, None to send no validator. A Range
+                request whose If-Range differs gets the whole file.
+        """
+        self.body = gzip.compress(payload) if gzip_encoding else payload
+        self.gzip_encoding = gzip_encoding
+        self.fail_after = fail_after
+        self.failures = failures
+        self.support_range = support_range
+        self.etag = etag
+        self.requests: list[dict] = []  # Headers of each request received
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+
+    @property
+    def url(self) -> str:
+        """URL of the served file."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bulk.json"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                start = 0
+                range_header = self.headers.get("Range")
+                if_range = self.headers.get("If-Range")
+                if (
+                    range_header
+                    and server.support_range
+                    and (if_range is None or if_range == server.etag)
+                ):
+                    start = int(range_header.removeprefix("bytes=").split("-")[0])
+                    self.send_response(206)
+                    self.send_header(
+                        "Content-Range",
+                        f"bytes {start}-{len(server.body) - 1}/{len(server.body)}",
+                    )
+                else:
+                    self.send_response(200)
+
+                body = server.body[start:]
+                self.send_header("Content-Length", str(len(body)))
+                if server.etag:
+                    self.send_header("ETag", server.etag)
+                if server.gzip_encoding:
+                    self.send_header("Content-Encoding", "gzip")
+                self.end_headers()
+
+                if server.fail_after is not None and server.failures > 0:
+                    server.failures -= 1
+                    self.wfile.write(body[: server.fail_after])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+
+                self.wfile.write(body)
+
+        return Handler
+
+    def __enter__(self) -> "BulkFileServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,137 @@
+"""In-memory stand-in for the Meilisearch client.
+
+Tasks are processed as soon as they are enqueued, like a Meilisearch
+instance with an empty queue. Search matches every query word in the
+searchable attributes and ignores filters, which are recorded in
+``searches`` for assertions.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Optional
+
+
+class MockMeilisearchIndex:
+    """Mock Meilisearch index holding documents by primary key."""
+
+    def __init__(self, client: "MockMeilisearchClient", uid: str):
+        """Initialize an empty index.
+
+        Args:
+            client: Client owning the task queue.
+            uid: Index name.
+        """
+        self.client = client
+        self.uid = uid
+        self.documents: dict[str, dict] = {}
+        self.settings: dict = {}
+        self.searches: list[tuple[str, dict]] = []
+
+    def add_documents(self, documents: list[dict], primary_key: Optional[str] = None):
+        """Add or replace documents."""
+        for document in documents:
+            self.documents[document[primary_key or "id"]] = dict(document)
+        return self.client.enqueue(self.uid, "documentAdditionOrUpdate")
+
+    def delete_documents(self, ids: list[str]):
+        """Delete documents by id, unknown ids are ignored."""
+        for id_ in ids:
+            self.documents.pop(id_, None)
+        return self.client.enqueue(self.uid, "documentDeletion")
+
+    def update_settings(self, body: dict):
+        """Replace the index settings."""
+        self.settings.update(body)
+        return self.client.enqueue(self.uid, "settingsUpdate")
+
+    def get_stats(self):
+        """Index stats, only the document count."""
+        return SimpleNamespace(number_of_documents=len(self.documents))
+
+    def search(self, query: str, opt_params: Optional[dict] = None) -> dict[str, Any]:
+        """Match every query word in the searchable attributes.
+
+        Hits are ranked by the number of attributes matching, then by id.
+        """
+        params = opt_params or {}
+        self.searches.append((query, params))
+        attributes = self.settings.get("searchableAttributes", ["name"])
+        words = query.lower().split()
+
+        hits = []
+        for document in self.documents.values():
+            text = [
+                str(document.get(attribute) or "").lower() for attribute in attributes
+            ]
+            if all(any(word in value for value in text) for word in words):
+                matched = sum(any(word in value for word in words) for value in text)
+                hits.append((matched, document))
+        hits.sort(key=lambda hit: (-hit[0], hit[1]["id"]))
+
+        offset = params.get("offset", 0)
+        limit = params.get("limit", 20)
+        page = []
+        for matched, document in hits[offset : offset + limit]:
+            hit = dict(document)
+            if params.get("showRankingScore"):
+                hit["_rankingScore"] = matched / len(attributes)
+            page.append(hit)
+        return {"hits": page, "offset": offset, "limit": limit}
+
+
+class MockMeilisearchClient:
+    """Mock Meilisearch client with synchronously processed tasks."""
+
+    def __init__(self, fail: bool = False):
+        """Initialize the client.
+
+        Args:
+            fail: Report every task as failed.
+        """
+        self.fail = fail
+        self.indexes: dict[str, MockMeilisearchIndex] = {}
+        self.tasks: dict[int, SimpleNamespace] = {}
+
+    def enqueue(self, index_uid: str, type_: str, error: Optional[dict] = None):
+        """Record a processed task and return its summary."""
+        if self.fail:
+            error = {"code": "internal", "message": "Mock failure"}
+        uid = len(self.tasks)
+        self.tasks[uid] = SimpleNamespace(
+            uid=uid,
+            index_uid=index_uid,
+            type=type_,
+            status="failed" if error else "succeeded",
+            error=error,
+        )
+        return SimpleNamespace(task_uid=uid, index_uid=index_uid, status="enqueued")
+
+    def index(self, uid: str) -> MockMeilisearchIndex:
+        """Get an index, created on first use like Meilisearch does."""
+        if uid not in self.indexes:
+            self.indexes[uid] = MockMeilisearchIndex(self, uid)
+        return self.indexes[uid]
+
+    def create_index(self, uid: str, options: Optional[dict] = None):
+        """Create an index, failing if it already exists."""
+        if uid in self.indexes:
+            return self.enqueue(uid, "indexCreation", {"code": "index_already_exists"})
+        self.index(uid)
+        return self.enqueue(uid, "indexCreation")
+
+    def delete_index(self, uid: str):
+        """Delete an index, failing if it does not exist."""
+        if self.indexes.pop(uid, None) is None:
+            return self.enqueue(uid, "indexDeletion", {"code": "index_not_found"})
+        return self.enqueue(uid, "indexDeletion")
+
+    def swap_indexes(self, parameters: list[dict]):
+        """Swap the documents and settings of pairs of indexes."""
+        for swap in parameters:
+            first, second = (self.index(uid) for uid in swap["indexes"])
+            first.documents, second.documents = second.documents, first.documents
+            first.settings, second.settings = second.settings, first.settings
+        return self.enqueue(None, "indexSwap")
+
+    def wait_for_task(self, uid: int, timeout_in_ms: int = 5000, **kwargs):
+        """Get a processed task."""
+        return self.tasks[uid]
@@ -4,13 +4,23 @@ This module provides in-memory mock implementations of MongoDB cursor and
 collection classes, enabling fast integration tests without external dependencies.
 
 Supports MongoDB query operators: $regex, $in, $nin, $all, $size, $gte, $lte, $text, $search, $or, $and, $exists, $eq
-Supports aggregation stages: $match, $project, $group, $sort, $limit
+Supports aggregation stages: $match, $project, $group, $sort, $limit, $indexStats
+Supports write operations through bulk_write: InsertOne (dict or RawBSONDocument), UpdateOne ($set, $unset,
+$setOnInsert, $inc, upsert), ReplaceOne, DeleteOne
+
+AsyncMockMongoCollection exposes a MockMongoCollection with the interface of
+pymongo's AsyncCollection for the async routes.
 """
 
 import re
 from copy import deepcopy
 from typing import Any, Optional
 
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
+
 
 class MockMongoCursor:
     """Mock MongoDB cursor supporting sort, limit, and iteration."""
@@ -24,18 +34,27 @@ class MockMongoCursor:
         self._documents = deepcopy(documents)
         self._position = 0
 
-    def sort(self, field: str, direction: int) -> "MockMongoCursor":
+    def sort(self, field, direction: Optional[int] = None) -> "MockMongoCursor":
         """Sort documents by field.
 
         Args:
-            field: Field name to sort by.
+            field: Field name to sort by, or list of (field, direction).
             direction: 1 for ascending, -1 for descending.
 
         Returns:
             Self for method chaining.
         """
-        reverse = direction == -1
-        self._documents.sort(key=lambda doc: doc.get(field, ""), reverse=reverse)
+        keys = field if isinstance(field, list) else [(field, direction)]
+        # Stable sorts from the last key to the first, missing and null
+        # values sort first like in MongoDB
+        for name, key_direction in reversed(keys):
+            self._documents.sort(
+                key=lambda doc: (
+                    doc.get(name) is not None,
+                    doc.get(name) if doc.get(name) is not None else "",
+                ),
+                reverse=key_direction == -1,
+            )
         return self
 
     def limit(self, count: int) -> "MockMongoCursor":
@@ -50,6 +69,17 @@ class MockMongoCursor:
         self._documents = self._documents[:count]
         return self
 
+    def hint(self, index: Any) -> "MockMongoCursor":
+        """Accept an index hint, ignored by the mock.
+
+        Args:
+            index: Index name or specification.
+
+        Returns:
+            Self for method chaining.
+        """
+        return self
+
     def __iter__(self):
         """Make cursor iterable."""
         self._position = 0
@@ -67,14 +97,19 @@ class MockMongoCursor:
 class MockMongoCollection:
     """Mock MongoDB collection supporting find, find_one, and aggregate."""
 
-    def __init__(self, documents: list[dict]):
+    def __init__(self, documents: list[dict], name: str = "mock"):
         """Initialize collection with documents.
 
         Args:
             documents: List of document dictionaries.
+            name: Collection name, mirrors Collection.name.
         """
         self._documents = deepcopy(documents)
         self._last_search_text = None  # Track last text search for scoring
+        self.name = name
+        self.bulk_write_calls: list[list] = []  # Track batches for assertions
+        self.indexes: dict[str, Any] = {}  # Index documents by name
+        self.index_accesses: dict[str, int] = {}  # $indexStats ops by name
 
     def find_one(
         self, query: dict, projection: Optional[dict] = None
@@ -95,7 +130,9 @@ class MockMongoCollection:
                 return deepcopy(doc)
         return None
 
-    def find(self, query: dict, projection: Optional[dict] = None) -> MockMongoCursor:
+    def find(
+        self, query: Optional[dict] = None, projection: Optional[dict] = None
+    ) -> MockMongoCursor:
         """Find all documents matching query.
 
         Args:
@@ -130,6 +167,138 @@ class MockMongoCollection:
 
         return MockMongoCursor(documents)
 
+    def bulk_write(self, requests: list, ordered: bool = True) -> None:
+        """Apply a list of pymongo write operations in order.
+
+        Args:
+            requests: InsertOne, UpdateOne, ReplaceOne or DeleteOne operations.
+            ordered: Accepted for signature compatibility, ignored.
+        """
+        self.bulk_write_calls.append(list(requests))
+        for request in requests:
+            if isinstance(request, InsertOne):
+                document = (
+                    bson.decode(request._doc.raw)
+                    if isinstance(request._doc, RawBSONDocument)
+                    else deepcopy(request._doc)
+                )
+                document.setdefault("_id", ObjectId())
+                self._documents.append(document)
+            elif isinstance(request, UpdateOne):
+                self._update_one(request._filter, request._doc, request._upsert)
+            elif isinstance(request, ReplaceOne):
+                self._replace_one(request._filter, request._doc, request._upsert)
+            elif isinstance(request, DeleteOne):
+                for index, doc in enumerate(self._documents):
+                    if self._matches_query(doc, request._filter):
+                        del self._documents[index]
+                        break
+
+    def create_indexes(self, indexes: list, **kwargs) -> list[str]:
+        """Record index models, indexes are not used for querying.
+
+        Args:
+            indexes: IndexModel instances.
+            **kwargs: Index options such as name and weights.
+
+        Returns:
+            Names of the created indexes.
+        """
+        names = []
+        for index in indexes:
+            document = dict(index.document, **kwargs)
+            self.indexes[document["name"]] = document
+            names.append(document["name"])
+        return names
+
+    def index_information(self) -> dict[str, dict]:
+        """Describe the recorded indexes like Collection.index_information.
+
+        Returns:
+            Index info by name, including the default _id index.
+        """
+        information = {"_id_": {"key": [("_id", 1)]}}
+        for name, document in self.indexes.items():
+            information[name] = {
+                "key": list(document["key"].items()),
+                **{
+                    option: value
+                    for option, value in document.items()
+                    if option not in ("key", "name")
+                },
+            }
+        return information
+
+    def drop_index(self, name: str) -> None:
+        """Drop a recorded index by name."""
+        del self.indexes[name]
+
+    def insert_one(self, document: dict) -> None:
+        """Insert a single document."""
+        self._documents.append(deepcopy(document))
+
+    def update_one(self, query: dict, update: dict, upsert: bool = False) -> None:
+        """Update the first document matching query."""
+        self._update_one(query, update, upsert)
+
+    def _update_one(self, query: dict, update: dict, upsert: bool) -> None:
+        """Apply an update document to the first match, or upsert it."""
+        for doc in self._documents:
+            if self._matches_query(doc, query):
+                self._apply_update(doc, update, inserting=False)
+                return
+
+        if upsert:
+            doc = {
+                field: deepcopy(value)
+                for field, value in query.items()
+                if not field.startswith("$") and not isinstance(value, dict)
+            }
+            self._apply_update(doc, update, inserting=True)
+            self._documents.append(doc)
+
+    def _replace_one(self, query: dict, replacement: dict, upsert: bool) -> None:
+        """Replace the first match, or insert the replacement when upserting."""
+        for index, doc in enumerate(self._documents):
+            if self._matches_query(doc, query):
+                new_doc = deepcopy(replacement)
+                if "_id" in doc:
+                    new_doc.setdefault("_id", doc["_id"])
+                self._documents[index] = new_doc
+                return
+
+        if upsert:
+            # Like MongoDB, the _id of an equality filter is kept
+            new_doc = deepcopy(replacement)
+            if "_id" in query and not isinstance(query["_id"], dict):
+                new_doc.setdefault("_id", query["_id"])
+            self._documents.append(new_doc)
+
+    def _apply_update(self, doc: dict, update: dict, inserting: bool) -> None:
+        """Apply update operators (dotted paths supported) to a document."""
+        for operator, fields in update.items():
+            if operator == "$setOnInsert" and not inserting:
+                continue
+            for path, value in fields.items():
+                *parents, last = path.split(".")
+                target = doc
+                for part in parents:
+                    if isinstance(target, list):
+                        target = target[int(part)]
+                    else:
+                        target = target.setdefault(part, {})
+
+                if operator in ("$set", "$setOnInsert"):
+                    if isinstance(target, list):
+                        target[int(last)] = deepcopy(value)
+                    else:
+                        target[last] = deepcopy(value)
+                elif operator == "$unset":
+                    if isinstance(target, dict):
+                        target.pop(last, None)
+                elif operator == "$inc":
+                    target[last] = target.get(last, 0) + value
+
     def _matches_query(self, doc: dict, query: dict) -> bool:
         """Check if document matches query.
 
@@ -214,8 +383,11 @@ class MockMongoCollection:
                         if field_value != value:
                             return False
             else:
-                # Direct field match
-                if doc.get(field) != condition:
+                # Direct field match, an array matches if it contains the value
+                field_value = doc.get(field)
+                if field_value != condition and not (
+                    isinstance(field_value, list) and condition in field_value
+                ):
                     return False
 
         return True
@@ -248,6 +420,10 @@ class MockMongoCollection:
             for field in projection:
                 if projection[field] == 1 and field in doc:
                     result[field] = deepcopy(doc[field])
+                elif projection[field] == 1 and "." in field:
+                    nested = self._project_path(doc, field.split("."))
+                    if nested:
+                        self._merge_projection(result, nested)
 
         # Handle _id special case (included by default unless explicitly excluded)
         if "_id" not in projection or projection.get("_id") != 0:
@@ -256,6 +432,37 @@ class MockMongoCollection:
 
         return result
 
+    def _project_path(self, value: Any, parts: list[str]) -> Any:
+        """Project a dotted inclusion path, traversing arrays like MongoDB.
+
+        Args:
+            value: Document, sub-document or array.
+            parts: Remaining path components.
+
+        Returns:
+            Projected sub-document or array, None when the path is missing.
+        """
+        if isinstance(value, list):
+            return [
+                self._project_path(item, parts) or {}
+                for item in value
+                if isinstance(item, dict)
+            ]
+        if not isinstance(value, dict) or parts[0] not in value:
+            return None
+        if len(parts) == 1:
+            return {parts[0]: deepcopy(value[parts[0]])}
+        nested = self._project_path(value[parts[0]], parts[1:])
+        return None if nested is None else {parts[0]: nested}
+
+    def _merge_projection(self, result: dict, projected: dict) -> None:
+        """Merge a projected dotted path into the projection result."""
+        for key, value in projected.items():
+            if isinstance(value, dict) and isinstance(result.get(key), dict):
+                self._merge_projection(result[key], value)
+            else:
+                result[key] = value
+
     def _execute_aggregation_stage(
         self, documents: list[dict], stage: dict
     ) -> list[dict]:
@@ -271,7 +478,14 @@ class MockMongoCollection:
         stage_type = list(stage.keys())[0]
         stage_spec = stage[stage_type]
 
-        if stage_type == "$match":
+        if stage_type == "$indexStats":
+            # One document per index, ignoring the input documents
+            return [
+                {"name": name, "accesses": {"ops": self.index_accesses.get(name, 0)}}
+                for name in self.index_information()
+            ]
+
+        elif stage_type == "$match":
             # Filter documents
             return [doc for doc in documents if self._matches_query(doc, stage_spec)]
 
@@ -282,7 +496,10 @@ class MockMongoCollection:
                 projected_doc = self._apply_projection(doc, stage_spec)
 
                 # Add text search score if requested
-                if stage_spec.get("score") == 1 and self._last_search_text:
+                if (
+                    stage_spec.get("score") in (1, {"$meta": "textScore"})
+                    and self._last_search_text
+                ):
                     projected_doc["score"] = self._calculate_text_score(
                         doc, self._last_search_text
                     )
@@ -421,6 +638,18 @@ class MockMongoCollection:
                             ):
                                 groups[key][field] = current_value
 
+                    elif acc_type == "$min":
+                        field_name = (
+                            acc_value[1:] if acc_value.startswith("$") else acc_value
+                        )
+                        current_value = doc.get(field_name)
+                        if current_value is not None:
+                            if (
+                                field not in groups[key]
+                                or current_value < groups[key][field]
+                            ):
+                                groups[key][field] = current_value
+
                     elif acc_type == "$addToSet":
                         if field not in groups[key]:
                             groups[key][field] = []
@@ -471,3 +700,65 @@ class MockMongoCollection:
             return 0.6  # Match in card text
         else:
             return 0.3  # Weak/generic match
+
+
+class AsyncMockMongoCursor:
+    """Async iteration over a MockMongoCursor, like pymongo's AsyncCursor."""
+
+    def __init__(self, cursor: MockMongoCursor):
+        """Wrap a cursor of the sync mock.
+
+        Args:
+            cursor: Cursor returned by the MockMongoCollection.
+        """
+        self._cursor = iter(cursor)
+
+    def sort(self, field, direction: Optional[int] = None) -> "AsyncMockMongoCursor":
+        """Sort documents by field, see MockMongoCursor.sort."""
+        self._cursor.sort(field, direction)
+        return self
+
+    def limit(self, count: int) -> "AsyncMockMongoCursor":
+        """Limit number of documents, see MockMongoCursor.limit."""
+        self._cursor.limit(count)
+        return self
+
+    def __aiter__(self):
+        """Make cursor async iterable."""
+        return self
+
+    async def __anext__(self):
+        """Get next document in async iteration."""
+        try:
+            return next(self._cursor)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length: Optional[int] = None) -> list[dict]:
+        """Get the remaining documents, at most ``length``."""
+        documents = list(self._cursor)
+        return documents if length is None else documents[:length]
+
+
+class AsyncMockMongoCollection:
+    """Awaitable interface of a MockMongoCollection for the async routes."""
+
+    def __init__(self, collection: MockMongoCollection):
+        """Wrap a collection of the sync mock.
+
+        Args:
+            collection: Collection holding the documents.
+        """
+        self.collection = collection
+
+    def find(self, *args, **kwargs) -> AsyncMockMongoCursor:
+        """Find documents, the cursor is iterated with ``async for``."""
+        return AsyncMockMongoCursor(self.collection.find(*args, **kwargs))
+
+    async def find_one(self, *args, **kwargs) -> Optional[dict]:
+        """Find a single document."""
+        return self.collection.find_one(*args, **kwargs)
+
+    async def aggregate(self, pipeline: list[dict]) -> AsyncMockMongoCursor:
+        """Run an aggregation pipeline, awaited like pymongo's."""
+        return AsyncMockMongoCursor(self.collection.aggregate(pipeline))
@@ -0,0 +1,53 @@
+"""In-memory stand-in for the async Redis client.
+
+Values are stored as bytes like Redis returns them, expirations are
+recorded in ``ttls`` but never applied. With ``fail`` every command raises
+a ``ConnectionError``, like an unreachable server.
+"""
+
+from typing import Optional
+
+from redis.exceptions import ConnectionError
+
+
+class MockRedis:
+    """Mock async Redis client supporting get, set and incr."""
+
+    def __init__(self, fail: bool = False):
+        """Initialize an empty store.
+
+        Args:
+            fail: Raise ConnectionError on every command.
+        """
+        self.fail = fail
+        self.store: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.commands = 0
+
+    def _command(self) -> None:
+        self.commands += 1
+        if self.fail:
+            raise ConnectionError("Error 111 connecting to cache:6379.")
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get the value of a key."""
+        self._command()
+        return self.store.get(key)
+
+    async def set(self, key: str, value, ex: Optional[int] = None) -> bool:
+        """Set the value of a key, with an expiration in seconds."""
+        self._command()
+        self.store[key] = value if isinstance(value, bytes) else str(value).encode()
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    async def incr(self, key: str) -> int:
+        """Increment the integer value of a key."""
+        self._command()
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode()
+        return value
+
+    async def aclose(self) -> None:
+        """Close the client."""
@@ -5,6 +5,7 @@ correctly simulate MongoDB operations for integration testing.
 """
 
 import pytest
+from pymongo import DeleteOne, InsertOne, ReplaceOne, UpdateOne
 
 from tests.mocks.mongodb import MockMongoCollection, MockMongoCursor
 
@@ -516,3 +517,44 @@ def test_text_search_score_sorting():
     # Verify scores are in descending order
     scores = [r["score"] for r in results]
     assert scores == sorted(scores, reverse=True)
+
+
+@pytest.mark.unit
+def test_bulk_write_insert_update_delete():
+    """Test that bulk_write applies inserts, updates and deletes in order."""
+    collection = MockMongoCollection([])
+
+    collection.bulk_write(
+        [
+            InsertOne({"id": "1", "name": "Shock", "legalities": {"modern": "legal"}}),
+            InsertOne({"id": "2", "name": "Opt"}),
+            UpdateOne(
+                {"id": "1"},
+                {"$set": {"legalities.modern": "banned"}, "$unset": {"name": ""}},
+            ),
+            DeleteOne({"id": "2"}),
+        ]
+    )
+
+    assert list(collection.find({}, {"_id": 0})) == [
+        {"id": "1", "legalities": {"modern": "banned"}}
+    ]
+    assert len(collection.bulk_write_calls) == 1
+
+
+@pytest.mark.unit
+def test_bulk_write_upserts():
+    """Test UpdateOne/ReplaceOne upserts and $setOnInsert/$inc handling."""
+    collection = MockMongoCollection([])
+
+    update = {"$setOnInsert": {"created": True}, "$inc": {"count": 1}}
+    collection.bulk_write([UpdateOne({"_id": "a"}, update, upsert=True)])
+    collection.bulk_write([UpdateOne({"_id": "a"}, update, upsert=True)])
+    collection.bulk_write([ReplaceOne({"_id": "b"}, {"_id": "b", "v": 1}, upsert=True)])
+
+    assert collection.find_one({"_id": "a"}) == {
+        "_id": "a",
+        "created": True,
+        "count": 2,
+    }
+    assert collection.find_one({"_id": "b"}) == {"_id": "b", "v": 1}
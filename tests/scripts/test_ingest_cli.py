@@ -0,0 +1,360 @@
+"""
+Unit tests for scripts.ingest CLI.
+
+Tests the run command options and summary output.
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from scripts.ingest import app  # noqa: E402
+from tasks.history import bucket_update  # noqa: E402
+from tasks.indexes import INDEX_PROFILES  # noqa: E402
+from tests.mocks.meilisearch import MockMeilisearchClient  # noqa: E402
+from tests.mocks.mongodb import MockMongoCollection  # noqa: E402
+
+
+class TestIngestCLI:
+    """Tests for the ingest CLI."""
+
+    @pytest.fixture
+    def runner(self):
+        """Create CLI test runner."""
+        return CliRunner()
+
+    def test_run_prints_summary(self, runner):
+        """Test that a completed run prints its counts."""
+        summary = {
+            "status": "success",
+            "duration": 12.0,
+            "peak_rss_mb": 812.4,
+            "counts": {"inserted": 1, "updated": 2, "unchanged": 3},
+        }
+        with patch("scripts.ingest.i_fetch_dataset", return_value=summary) as ingest:
+            result = runner.invoke(app, ["run"])
+
+        assert result.exit_code == 0
+        ingest.assert_called_once_with(force=False, replay_path=None, bulk_load=False)
+        assert "1 inserted, 2 updated, 3 unchanged" in result.output
+        assert "peak memory 812 MB" in result.output
+
+    def test_run_force(self, runner):
+        """Test that --force is forwarded to the ingest."""
+        with patch("scripts.ingest.i_fetch_dataset", return_value=None) as ingest:
+            result = runner.invoke(app, ["run", "--force", "--bulk-load"])
+
+        assert result.exit_code == 0
+        ingest.assert_called_once_with(force=True, replay_path=None, bulk_load=True)
+
+    def test_run_skipped(self, runner):
+        """Test the message when the bulk file was already ingested."""
+        with patch("scripts.ingest.i_fetch_dataset", return_value=None):
+            result = runner.invoke(app, ["run"])
+
+        assert result.exit_code == 0
+        assert "already ingested" in result.output
+
+    def test_runs_lists_recent_runs(self, runner):
+        """Test that recorded runs are printed."""
+        ingest_runs = MockMongoCollection(
+            [
+                {
+                    "started_at": datetime(2025, 1, 1, 12),
+                    "source": "all_cards",
+                    "updated_at": datetime(2025, 1, 1, 9),
+                    "status": "success",
+                    "duration": 42.0,
+                    "counts": {"inserted": 7},
+                }
+            ]
+        )
+        with patch(
+            "scripts.ingest.get_database", return_value={"ingest_runs": ingest_runs}
+        ):
+            result = runner.invoke(app, ["runs"])
+
+        assert result.exit_code == 0
+        assert "success" in result.output
+        assert "inserted=7" in result.output
+
+    def test_rebuild_oracles(self, runner):
+        """Test that every oracle is rebuilt from the cards collection."""
+        db = {
+            "cards": MockMongoCollection(
+                [
+                    {"id": "1", "oracle_id": "o1", "name": "Shock", "lang": "en"},
+                    {"id": "2", "oracle_id": "o2", "name": "Opt", "lang": "en"},
+                ]
+            ),
+            "oracle_cards": MockMongoCollection(
+                [{"_id": "o1:en", "oracle_id": "o1", "printings": []}]
+            ),
+        }
+        with (
+            patch("scripts.ingest.get_database", return_value=db),
+            patch("scripts.ingest.bump_data_version") as bump_data_version,
+        ):
+            result = runner.invoke(app, ["rebuild-oracles"])
+
+        assert result.exit_code == 0
+        assert "2 oracle cards written" in result.output
+        bump_data_version.assert_called_once()
+        assert db["oracle_cards"].find_one({"_id": "o1:en"})["printings"] == ["1"]
+
+    def test_rebuild_sets(self, runner):
+        """Test that the sets collection is rebuilt from the printings."""
+        db = {
+            "cards": MockMongoCollection(
+                [
+                    {"id": "1", "set": "abc", "set_name": "Abc"},
+                    {"id": "2", "set": "abc", "set_name": "Abc"},
+                ]
+            ),
+            "sets": MockMongoCollection([{"_id": "old", "code": "old"}]),
+        }
+        with (
+            patch("scripts.ingest.get_database", return_value=db),
+            patch("scripts.ingest.bump_data_version") as bump_data_version,
+        ):
+            result = runner.invoke(app, ["rebuild-sets"])
+
+        assert result.exit_code == 0
+        assert "1 sets written" in result.output
+        bump_data_version.assert_called_once()
+        assert db["sets"].find_one({"_id": "abc"})["card_count"] == 2
+        assert db["sets"].find_one({"_id": "old"}) is None
+
+    def test_reindex_search(self, runner):
+        """Test that the search index is rebuilt from the oracle cards."""
+        client = MockMeilisearchClient()
+        db = {
+            "oracle_cards": MockMongoCollection(
+                [{"_id": "o1:en", "oracle_id": "o1", "name": "Shock"}]
+            )
+        }
+        with (
+            patch("scripts.ingest.get_database", return_value=db),
+            patch("scripts.ingest.get_search_client", return_value=client),
+            patch("scripts.ingest.bump_data_version") as bump_data_version,
+        ):
+            result = runner.invoke(app, ["reindex-search"])
+
+        assert result.exit_code == 0
+        bump_data_version.assert_called_once()
+        assert "1 oracle cards indexed" in result.output
+        assert list(client.indexes["cards"].documents) == ["o1_en"]
+
+    def test_reindex_search_failure(self, runner):
+        """Test that a failed Meilisearch task exits with an error."""
+        with (
+            patch(
+                "scripts.ingest.get_database",
+                return_value={"oracle_cards": MockMongoCollection([])},
+            ),
+            patch(
+                "scripts.ingest.get_search_client",
+                return_value=MockMeilisearchClient(fail=True),
+            ),
+        ):
+            result = runner.invoke(app, ["reindex-search"])
+
+        assert result.exit_code == 1
+        assert "Search index not rebuilt" in result.output
+
+    def test_indexes_reports_unused(self, runner):
+        """Test that the audit flags the indexes without accesses."""
+        cards = MockMongoCollection([], "cards")
+        cards.create_indexes(INDEX_PROFILES["api-minimal"])
+        cards.index_accesses = {"id_digest": 12}
+        db = {"cards": cards, "system.profile": MockMongoCollection([])}
+        with patch("scripts.ingest.get_database", return_value=db):
+            result = runner.invoke(app, ["indexes", "-p", "api-minimal"])
+
+        assert result.exit_code == 0
+        assert "id_digest" in result.output
+        assert result.output.count("unused") == 3
+        assert "Unused and not in api-minimal" not in result.output
+
+    def test_indexes_lists_unused_outside_profile(self, runner):
+        """Test that the unused indexes the profile does not need are listed."""
+        cards = MockMongoCollection([], "cards")
+        cards.create_indexes(INDEX_PROFILES["full"])
+        cards.index_accesses = {"id_digest": 12, "artist_1": 4}
+        db = {"cards": cards, "system.profile": MockMongoCollection([])}
+        with patch("scripts.ingest.get_database", return_value=db):
+            result = runner.invoke(app, ["indexes", "-p", "api-minimal"])
+
+        assert result.exit_code == 0
+        summary = result.output[result.output.index("Unused and not in") :]
+        assert "cmc_1" in summary
+        assert "artist_1" not in summary
+        assert "text_index" not in summary
+
+    def test_indexes_unknown_profile(self, runner):
+        """Test that an unknown profile is rejected."""
+        result = runner.invoke(app, ["indexes", "-p", "everything"])
+
+        assert result.exit_code == 1
+        assert "Unknown profile everything" in result.output
+
+    def test_apply_indexes_prunes(self, runner):
+        """Test that applying a profile with --prune drops the other indexes."""
+        cards = MockMongoCollection([], "cards")
+        cards.create_indexes(INDEX_PROFILES["full"])
+        with patch("scripts.ingest.get_database", return_value={"cards": cards}):
+            result = runner.invoke(app, ["apply-indexes", "api-minimal", "--prune"])
+
+        assert result.exit_code == 0
+        assert set(cards.index_information()) == {
+            "_id_",
+            *(model.document["name"] for model in INDEX_PROFILES["api-minimal"]),
+        }
+
+    def test_apply_indexes_unknown_profile(self, runner):
+        """Test that an unknown profile is rejected."""
+        result = runner.invoke(app, ["apply-indexes", "everything"])
+
+        assert result.exit_code == 1
+        assert "Unknown profile" in result.output
+
+    def test_bench_normalize(self, runner, tmp_path):
+        """Test that the benchmark reports one row per worker count."""
+        bulk_file = tmp_path / "cards.json"
+        bulk_file.write_text(
+            json.dumps(
+                [
+                    {"id": str(i), "name": f"Card {i}", "prices": {"usd": "1"}}
+                    for i in range(20)
+                ]
+            )
+        )
+
+        result = runner.invoke(
+            app, ["bench-normalize", str(bulk_file), "-w", "0", "-w", "2", "-n", "10"]
+        )
+
+        assert result.exit_code == 0
+        assert "1.00x" in result.output
+        assert result.output.count(" 10 ") == 2
+
+    def test_bench_diff(self, runner, tmp_path):
+        """Test that the benchmark pairs cards by id across both files."""
+        before_file = tmp_path / "before.json"
+        after_file = tmp_path / "after.json"
+        before_file.write_text(
+            json.dumps([{"id": str(i), "name": f"Card {i}"} for i in range(5)])
+        )
+        after_file.write_text(
+            json.dumps([{"id": "1", "name": "Card 1"}, {"id": "2", "name": "Renamed"}])
+        )
+
+        result = runner.invoke(
+            app, ["bench-diff", str(before_file), str(after_file), "-r", "1"]
+        )
+
+        assert result.exit_code == 0
+        assert "2 card pairs, 1 changed" in result.output
+        assert "recursive" in result.output
+        assert "iterative" in result.output
+
+    def test_generate(self, runner, tmp_path):
+        """Test that a synthetic bulk file is written."""
+        path = tmp_path / "cards.json"
+
+        result = runner.invoke(app, ["generate", str(path), "-n", "12"])
+
+        assert result.exit_code == 0
+        assert "12 cards written" in result.output
+        assert len(json.loads(path.read_text())) == 12
+
+    def test_bench_ingest(self, runner):
+        """Test that the benchmark reports one row per stage."""
+        stage = {
+            "cards_per_second": 2500.0,
+            "duration": 4.0,
+            "write_ops": 10000,
+            "bytes_in": 12_500_000,
+            "stored_bytes": 8_000_000,
+            "peak_rss_mb": 320.0,
+        }
+
+        def benchmark(stages, database, workers):
+            return [{"stage": name, **stage} for name, _ in stages]
+
+        with patch(
+            "scripts.ingest.benchmark_ingest", side_effect=benchmark
+        ) as benchmark_ingest:
+            result = runner.invoke(app, ["bench-ingest", "-n", "20", "-w", "0"])
+
+        assert result.exit_code == 0
+        stages, database, workers = benchmark_ingest.call_args.args
+        assert [name for name, _ in stages] == ["load", "unchanged", "changed"]
+        assert (database, workers) == ("mtg_benchmark", 0)
+        assert "unchanged" in result.output
+        assert "12.5" in result.output
+        assert "+8.0" in result.output
+
+    def test_migrate_history(self, runner):
+        """Test that both daily collections are migrated to their buckets."""
+        db = {
+            "card_stocks_daily": MockMongoCollection(
+                [{"card_id": "c1", "date": datetime(2025, 1, 1), "prices": {}}]
+            ),
+            "edhrec_daily": MockMongoCollection(
+                [{"card_id": "c1", "date": datetime(2025, 1, 1), "edhrec_rank": 1}]
+            ),
+            "card_stocks_monthly": MockMongoCollection([]),
+            "edhrec_monthly": MockMongoCollection([]),
+        }
+        with patch("scripts.ingest.get_database", return_value=db):
+            result = runner.invoke(app, ["migrate-history"])
+
+        assert result.exit_code == 0
+        assert db["edhrec_monthly"].find_one({"_id": "c1:2025-01"})["days"] == {"01": 1}
+        assert "card_stocks_daily: 1 documents migrated" in result.output
+
+    def test_history(self, runner):
+        """Test that the days without a change carry the previous values."""
+        prices = MockMongoCollection([])
+        prices.bulk_write(
+            [bucket_update("c1", datetime(2025, 1, 1), {"usd": "1.50", "eur": None})]
+        )
+        ranks = MockMongoCollection([])
+        ranks.bulk_write(
+            [
+                bucket_update("c1", datetime(2025, 1, 1), 120),
+                bucket_update("c1", datetime(2025, 1, 3), 95),
+            ]
+        )
+        db = {"card_stocks_monthly": prices, "edhrec_monthly": ranks}
+        with patch("scripts.ingest.get_database", return_value=db):
+            result = runner.invoke(
+                app, ["history", "c1", "--days", "3", "--end", "2025-01-03"]
+            )
+
+        assert result.exit_code == 0
+        assert result.output.count("usd 1.50") == 3
+        assert "eur" not in result.output
+        assert result.output.count("120") == 2
+        assert "95" in result.output
+
+    def test_history_unknown_card(self, runner):
+        """Test that a card without history is an error."""
+        db = {
+            "card_stocks_monthly": MockMongoCollection([]),
+            "edhrec_monthly": MockMongoCollection([]),
+        }
+        with patch("scripts.ingest.get_database", return_value=db):
+            result = runner.invoke(app, ["history", "c1"])
+
+        assert result.exit_code == 1
+        assert "No history for c1" in result.output
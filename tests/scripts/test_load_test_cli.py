@@ -0,0 +1,99 @@
+"""
+Unit tests for scripts.load_test CLI.
+
+Tests the concurrent load against the API app and the report.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from typer.testing import CliRunner
+
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from api.main import app as api_app  # noqa: E402
+from scripts.load_test import (  # noqa: E402
+    app,
+    fake_search_page,
+    percentile,
+    run_load,
+    serialization_encoders,
+    time_encoder,
+)
+
+
+@pytest.mark.unit
+def test_percentile():
+    """Test the latency percentiles."""
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile(values, 0.5) == 51.0
+    assert percentile(values, 0.99) == 100.0
+    assert percentile([], 0.5) == 0.0
+
+
+@pytest.mark.integration
+async def test_run_load_against_async_routes(test_client):
+    """Test concurrent searches served by the async card routes."""
+    paths = ["/cards/search/bolt", "/cards/search/missing-card", "/sets"] * 10
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=api_app), base_url="http://test"
+    ) as client:
+        result = await run_load(client, paths, concurrency=8)
+
+    assert result["requests"] == 30
+    assert result["errors"] == 0
+    assert result["requests_per_second"] > 0
+    assert result["p99_ms"] >= result["p50_ms"]
+
+
+@pytest.mark.unit
+def test_search_command_reports_each_api(httpx_mock: HTTPXMock):
+    """Test that every API instance gets a row with its errors."""
+    httpx_mock.add_response(
+        url="http://old/cards/search/bolt", json={"cards": []}, is_reusable=True
+    )
+    httpx_mock.add_response(
+        url="http://new/cards/search/bolt", status_code=500, is_reusable=True
+    )
+
+    result = CliRunner().invoke(
+        app,
+        ["search", "http://old", "http://new", "-c", "4", "-n", "12", "-q", "bolt"],
+    )
+
+    assert result.exit_code == 0
+    rows = [line for line in result.output.splitlines() if "http://" in line]
+    assert "12" in rows[0] and " 0 " in rows[0]
+    assert rows[1].split("│")[3].strip() == "12"
+
+
+@pytest.mark.unit
+def test_time_encoder_on_fake_search_page():
+    """Test that every encoder is timed on the same search page."""
+    page = fake_search_page(page_count=3, printings=2)
+    assert len(page["cards"]) == 3
+    assert len(page["cards"][0]["cards"]) == 2
+
+    for encode in serialization_encoders().values():
+        result = time_encoder(encode, [page], rounds=5)
+        assert json.loads(encode(page)) == page
+        assert result["bytes"] > 0
+        assert result["p99_us"] >= result["p50_us"]
+
+
+@pytest.mark.unit
+def test_serialization_command_reports_each_encoder():
+    """Test that the benchmark prints a row per encoder."""
+    result = CliRunner().invoke(
+        app, ["serialization", "-n", "5", "--page-count", "2", "--printings", "1"]
+    )
+
+    assert result.exit_code == 0
+    assert "orjson" in result.output
+    assert "1.0x" in result.output
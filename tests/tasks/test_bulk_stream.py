@@ -0,0 +1,130 @@
+"""Unit tests for tasks.bulk_stream module.
+
+Tests streaming the bulk file from a local HTTP stand-in: plain and gzip
+payloads, Range resume after a dropped connection and replay copies.
+"""
+
+import json
+
+import ijson
+import pytest
+
+from tasks.bulk_stream import RETRYABLE_ERRORS, open_bulk_stream, open_replay
+from tests.fixtures.sample_cards import get_all_sample_cards
+from tests.mocks.bulk_server import BulkFileServer
+
+
+@pytest.fixture
+def cards():
+    """Sample cards served as the bulk file."""
+    return get_all_sample_cards()
+
+
+@pytest.fixture
+def payload(cards):
+    """Bulk file fixture, a JSON array of cards."""
+    return json.dumps(cards).encode()
+
+
+def parse(stream) -> list[dict]:
+    """Parse the stream incrementally like the ingest does."""
+    with stream:
+        return list(ijson.items(stream, "item", use_float=True))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_streams_plain_json(payload, cards, prefetch):
+    """Test that a plain JSON file is parsed straight from the response."""
+    with BulkFileServer(payload) as server:
+        assert parse(open_bulk_stream(server.url, prefetch=prefetch)) == cards
+
+
+@pytest.mark.unit
+def test_streams_gzip_content_encoding(payload, cards):
+    """Test that gzip Content-Encoding is decompressed transparently."""
+    with BulkFileServer(payload, gzip_encoding=True) as server:
+        assert parse(open_bulk_stream(server.url, chunk_size=64)) == cards
+        assert server.requests[0]["Accept-Encoding"] == "gzip"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("gzip_encoding", [True, False])
+def test_resumes_with_range_after_dropped_connection(payload, cards, gzip_encoding):
+    """Test that a broken download resumes from the wire offset."""
+    with BulkFileServer(
+        payload, gzip_encoding=gzip_encoding, fail_after=300, failures=2
+    ) as server:
+        stream = open_bulk_stream(server.url, chunk_size=100, prefetch=False)
+        assert parse(stream) == cards
+
+    assert len(server.requests) == 3
+    assert server.requests[1]["Range"] == "bytes=300-"
+    assert server.requests[1]["If-Range"] == '"fixture"'
+
+
+@pytest.mark.unit
+def test_resumes_when_range_is_not_supported(payload, cards):
+    """Test that already read bytes are skipped if the server ignores Range."""
+    with BulkFileServer(
+        payload, fail_after=300, support_range=False, etag=None
+    ) as server:
+        stream = open_bulk_stream(server.url, chunk_size=100, prefetch=False)
+        assert parse(stream) == cards
+
+    assert "If-Range" not in server.requests[1]
+
+
+@pytest.mark.unit
+def test_fails_when_file_changed_during_download(payload):
+    """Test that a full response to If-Range is not spliced into the stream."""
+    with BulkFileServer(payload, fail_after=300) as server:
+
+        def publish_new_file(offset: int, total: int) -> None:
+            server.etag = '"new"'
+
+        stream = open_bulk_stream(
+            server.url, chunk_size=100, prefetch=False, progress_hook=publish_new_file
+        )
+        with pytest.raises(IOError, match="changed on the server"):
+            parse(stream)
+
+    assert server.requests[1]["If-Range"] == '"fixture"'
+
+
+@pytest.mark.unit
+def test_gives_up_after_max_retries(payload):
+    """Test that the error is raised once retries are exhausted."""
+    with BulkFileServer(payload, fail_after=300, failures=10) as server:
+        stream = open_bulk_stream(server.url, chunk_size=100, max_retries=1)
+        with pytest.raises(RETRYABLE_ERRORS):
+            parse(stream)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("gzip_encoding", [True, False])
+def test_keeps_compressed_copy_for_replay(payload, cards, gzip_encoding, tmp_path):
+    """Test that the kept copy is gzip compressed and replays the same cards."""
+    copy_path = tmp_path / "all_cards.json.gz"
+    with BulkFileServer(payload, gzip_encoding=gzip_encoding) as server:
+        parse(open_bulk_stream(server.url, copy_path=str(copy_path)))
+
+    assert copy_path.read_bytes()[:2] == b"\x1f\x8b"
+    assert parse(open_replay(str(copy_path))) == cards
+
+
+@pytest.mark.unit
+def test_reports_download_progress(payload):
+    """Test that the progress hook receives the bytes read and total size."""
+    progress = []
+    with BulkFileServer(payload) as server:
+        parse(
+            open_bulk_stream(
+                server.url,
+                chunk_size=500,
+                prefetch=False,
+                progress_hook=lambda read, total: progress.append((read, total)),
+            )
+        )
+
+    assert progress[-1] == (len(payload), len(payload))
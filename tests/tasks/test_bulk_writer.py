@@ -0,0 +1,79 @@
+"""Unit tests for tasks.bulk_writer module.
+
+Tests batching on size and time, unordered writes and error handling.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+
+from tasks.bulk_writer import BulkWriter
+
+
+@pytest.mark.unit
+def test_flushes_when_batch_is_full():
+    """Test that a full buffer is written in one unordered bulk_write."""
+    collection = MagicMock()
+
+    writer = BulkWriter(collection, batch_size=2, flush_interval=3600)
+    writer.add(InsertOne({"id": 1}))
+    collection.bulk_write.assert_not_called()
+
+    writer.add(InsertOne({"id": 2}))
+    collection.bulk_write.assert_called_once()
+    operations = collection.bulk_write.call_args.args[0]
+    assert len(operations) == 2
+    assert collection.bulk_write.call_args.kwargs == {"ordered": False}
+    assert writer.operations == []
+
+
+@pytest.mark.unit
+def test_flushes_when_interval_elapsed():
+    """Test that a stale buffer is flushed even if not full."""
+    collection = MagicMock()
+
+    writer = BulkWriter(collection, batch_size=1000, flush_interval=0)
+    writer.add(InsertOne({"id": 1}))
+
+    collection.bulk_write.assert_called_once()
+
+
+@pytest.mark.unit
+def test_context_manager_flushes_remaining_operations():
+    """Test that leaving the context writes the partial last batch."""
+    collection = MagicMock()
+
+    with BulkWriter(collection, batch_size=2, flush_interval=3600) as writer:
+        writer.extend([InsertOne({"id": i}) for i in range(5)])
+
+    assert collection.bulk_write.call_count == 3
+    assert writer.batches == 3
+    assert writer.operation_count == 5
+
+
+@pytest.mark.unit
+def test_empty_flush_does_not_write():
+    """Test that flushing an empty buffer is a no-op."""
+    collection = MagicMock()
+
+    with BulkWriter(collection):
+        pass
+
+    collection.bulk_write.assert_not_called()
+
+
+@pytest.mark.unit
+def test_write_errors_are_counted_not_raised():
+    """Test that partial failures of an unordered batch don't abort ingest."""
+    collection = MagicMock()
+    collection.bulk_write.side_effect = BulkWriteError(
+        {"writeErrors": [{"errmsg": "duplicate key"}]}
+    )
+
+    with BulkWriter(collection, batch_size=1) as writer:
+        writer.add(InsertOne({"id": 1}))
+
+    assert writer.write_errors == 1
+    assert writer.batches == 1
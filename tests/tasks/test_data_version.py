@@ -0,0 +1,30 @@
+"""Unit tests for tasks.data_version module.
+
+Tests the bump of the data version read by the API response cache.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from tasks.data_version import DATA_VERSION_KEY, bump_data_version
+
+
+@pytest.mark.unit
+def test_bump_data_version():
+    """Test that the version key is incremented."""
+    client = MagicMock()
+    client.incr.return_value = 4
+
+    assert bump_data_version(client) == 4
+    client.incr.assert_called_once_with(DATA_VERSION_KEY)
+
+
+@pytest.mark.unit
+def test_bump_data_version_without_redis():
+    """Test that an unreachable Redis does not fail the ingest."""
+    client = MagicMock()
+    client.incr.side_effect = ConnectionError("Connection refused")
+
+    assert bump_data_version(client) is None
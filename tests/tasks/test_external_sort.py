@@ -0,0 +1,65 @@
+"""Unit tests for tasks.external_sort module.
+
+Tests the in-memory and spilled sort paths.
+"""
+
+import os
+import random
+
+import pytest
+
+from tasks.external_sort import ExternalSort
+
+
+def make_cards(count: int) -> list[dict]:
+    """Build cards with shuffled ids and nested fields."""
+    cards = [
+        {"id": f"{index:05d}", "name": f"Card {index}", "prices": {"usd": 1.5}}
+        for index in range(count)
+    ]
+    random.Random(42).shuffle(cards)
+    return cards
+
+
+@pytest.mark.unit
+def test_sort_in_memory_without_spilling(tmp_path):
+    """Test that input within the memory limit is not written to disk."""
+    cards = make_cards(50)
+    sorter = ExternalSort("id", directory=str(tmp_path))
+
+    result = list(sorter.sorted(cards))
+
+    assert result == sorted(cards, key=lambda card: card["id"])
+    assert sorter.counts == {"sort_documents": 50}
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.unit
+def test_sort_spills_runs_over_memory_limit(tmp_path):
+    """Test that larger input is merged from sorted runs on disk."""
+    cards = make_cards(500)
+    sorter = ExternalSort("id", memory_limit=10_000, directory=str(tmp_path))
+
+    result = sorter.sorted(cards)
+    first = next(result)
+    assert len(os.listdir(next(tmp_path.iterdir()))) == sorter.counts["sort_runs"]
+    rest = list(result)
+
+    assert [first, *rest] == sorted(cards, key=lambda card: card["id"])
+    assert sorter.counts["sort_documents"] == 500
+    assert sorter.counts["sort_runs"] > 5
+    assert sorter.counts["sort_spilled_bytes"] > 0
+    # Run files are removed once the sort is consumed
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.unit
+def test_closed_sort_removes_runs(tmp_path):
+    """Test that abandoning the iteration still deletes the run files."""
+    sorter = ExternalSort("id", memory_limit=10_000, directory=str(tmp_path))
+
+    result = sorter.sorted(make_cards(500))
+    next(result)
+    result.close()
+
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,229 @@
+"""Unit tests for tasks.history module.
+
+Tests monthly bucket upserts, history reads and the legacy migration.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from tasks.history import (
+    HistoryWriter,
+    bucket_update,
+    latest_update,
+    load_latest_values,
+    migrate_daily_history,
+    read_history,
+    read_step_history,
+    snapshot_digest,
+)
+from tasks.normalize import NormalizedCard
+from tests.mocks.mongodb import MockMongoCollection
+
+DATE = datetime(2025, 1, 2)
+
+
+@pytest.fixture
+def buckets():
+    """Empty monthly bucket collection."""
+    return MockMongoCollection([], "card_stocks_monthly")
+
+
+@pytest.mark.unit
+def test_bucket_update_groups_days_by_month(buckets):
+    """Test that days of the same month share one bucket document."""
+    buckets.bulk_write(
+        [
+            bucket_update("c1", datetime(2025, 1, 1), {"usd": 1.0}),
+            bucket_update("c1", datetime(2025, 1, 2), {"usd": 1.5}),
+            bucket_update("c1", datetime(2025, 2, 1), {"usd": 2.0}),
+        ]
+    )
+
+    january = buckets.find_one({"_id": "c1:2025-01"})
+    assert january == {
+        "_id": "c1:2025-01",
+        "card_id": "c1",
+        "month": datetime(2025, 1, 1),
+        "days": {"01": {"usd": 1.0}, "02": {"usd": 1.5}},
+    }
+    assert len(list(buckets.find({}))) == 2
+
+
+@pytest.mark.unit
+def test_bucket_update_is_idempotent(buckets):
+    """Test that writing the same day twice keeps a single value."""
+    date = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+    buckets.bulk_write([bucket_update("c1", date, 10)])
+    buckets.bulk_write([bucket_update("c1", date, 12)])
+
+    assert read_history(buckets, "c1") == [{"date": datetime(2025, 1, 1), "value": 12}]
+
+
+@pytest.mark.unit
+def test_read_history_range(buckets):
+    """Test that history is ordered and restricted to the requested range."""
+    buckets.bulk_write(
+        [
+            bucket_update("c1", datetime(2025, 2, 3), 3),
+            bucket_update("c1", datetime(2025, 1, 31), 2),
+            bucket_update("c1", datetime(2025, 1, 1), 1),
+            bucket_update("c2", datetime(2025, 1, 15), 99),
+        ]
+    )
+
+    assert [point["value"] for point in read_history(buckets, "c1")] == [1, 2, 3]
+    assert read_history(
+        buckets, "c1", start=datetime(2025, 1, 15), end=datetime(2025, 2, 1)
+    ) == [{"date": datetime(2025, 1, 31), "value": 2}]
+
+
+@pytest.mark.unit
+def test_migrate_daily_history(buckets):
+    """Test that legacy daily documents are copied into buckets."""
+    daily = MockMongoCollection(
+        [
+            {"card_id": "c1", "date": datetime(2025, 1, 1), "edhrec_rank": 5},
+            {"card_id": "c1", "date": datetime(2025, 1, 2), "edhrec_rank": 4},
+            {"card_id": "c2", "date": datetime(2025, 1, 1), "edhrec_rank": None},
+        ]
+    )
+
+    assert migrate_daily_history(daily, buckets, "edhrec_rank", batch_size=2) == 3
+    assert migrate_daily_history(daily, buckets, "edhrec_rank") == 3
+
+    assert [point["value"] for point in read_history(buckets, "c1")] == [5, 4]
+    assert read_history(buckets, "c2") == [
+        {"date": datetime(2025, 1, 1), "value": None}
+    ]
+    assert len(list(buckets.find({}))) == 2
+
+
+@pytest.mark.unit
+def test_snapshot_digest_ignores_key_order():
+    """Test that equal price dicts share a digest and changes don't."""
+    assert snapshot_digest({"usd": 1.0, "eur": None}) == snapshot_digest(
+        {"eur": None, "usd": 1.0}
+    )
+    assert snapshot_digest({"usd": 1.0}) != snapshot_digest({"usd": 1.5})
+
+
+@pytest.mark.unit
+def test_load_latest_values():
+    """Test that the latest values map is built from latest_prices."""
+    latest = MockMongoCollection([])
+    latest.bulk_write(
+        [latest_update("c1", datetime(2025, 1, 1), prices_hash=7, edhrec_rank=3)]
+    )
+
+    assert load_latest_values(latest) == {"c1": (7, 3)}
+
+
+@pytest.mark.unit
+def test_read_step_history_forward_fills(buckets):
+    """Test that days without a change carry the previous value."""
+    buckets.bulk_write(
+        [
+            bucket_update("c1", datetime(2024, 12, 30), 1),
+            bucket_update("c1", datetime(2025, 1, 3), 2),
+        ]
+    )
+
+    history = read_step_history(
+        buckets, "c1", datetime(2025, 1, 1), datetime(2025, 1, 4)
+    )
+
+    assert [point["value"] for point in history] == [1, 1, 2, 2]
+    assert history[0]["date"] == datetime(2025, 1, 1)
+
+
+@pytest.mark.unit
+def test_read_step_history_before_first_value(buckets):
+    """Test that days before the first known value are omitted."""
+    buckets.bulk_write([bucket_update("c1", datetime(2025, 1, 3), 2)])
+
+    history = read_step_history(
+        buckets, "c1", datetime(2025, 1, 1), datetime(2025, 1, 3)
+    )
+
+    assert history == [{"date": datetime(2025, 1, 3), "value": 2}]
+
+
+def card(card_id: str, price: float) -> NormalizedCard:
+    """Normalized card with a price and an EDHREC rank."""
+    prices = {"usd": price}
+    return NormalizedCard(
+        id=card_id,
+        content_hash="hash",
+        document=b"",
+        prices=prices,
+        prices_hash=snapshot_digest(prices),
+        edhrec_rank=10,
+        oracle_id="o1",
+    )
+
+
+class FailingCollection(MockMongoCollection):
+    """Collection whose bulk writes raise ``error``."""
+
+    def __init__(self, error: Exception):
+        super().__init__([], "card_stocks_monthly")
+        self.error = error
+
+    def bulk_write(self, requests: list, ordered: bool = True) -> None:
+        raise self.error
+
+
+@pytest.mark.unit
+def test_history_writer_writes_latest_after_buckets(buckets):
+    """Test that the latest values follow the buckets of the same cards."""
+    edhrec = MockMongoCollection([], "edhrec_monthly")
+    latest = MockMongoCollection([], "latest_prices")
+
+    with HistoryWriter(buckets, edhrec, latest, batch_size=2) as history:
+        for number in range(3):
+            history.add(card(f"c{number}", 1.0), DATE)
+            # Every latest value written has its bucket written
+            assert {doc["_id"] for doc in latest.find({})} <= {
+                doc["card_id"] for doc in buckets.find({})
+            }
+
+    assert len(list(latest.find({}))) == 3
+    assert history.counts == {"prices_written": 3, "edhrec_written": 3}
+
+
+@pytest.mark.unit
+def test_history_writer_crash_between_flushes_keeps_latest():
+    """Test that a failed bucket flush leaves the latest values unchanged.
+
+    The next run then sees the values as changed and writes them again.
+    """
+    edhrec = MockMongoCollection([], "edhrec_monthly")
+    latest = MockMongoCollection([], "latest_prices")
+
+    with pytest.raises(AutoReconnect):
+        with HistoryWriter(
+            FailingCollection(AutoReconnect("connection lost")), edhrec, latest
+        ) as history:
+            history.add(card("c1", 1.0), DATE)
+
+    assert list(latest.find({})) == []
+
+    rerun = HistoryWriter(MockMongoCollection([]), edhrec, latest)
+    rerun.add(card("c1", 1.0), DATE)
+    assert rerun.counts["prices_written"] == 1
+
+
+@pytest.mark.unit
+def test_history_writer_skips_latest_on_bucket_write_errors():
+    """Test that logged bucket write errors also skip the latest values."""
+    prices = FailingCollection(
+        BulkWriteError({"writeErrors": [{"errmsg": "duplicate"}]})
+    )
+    latest = MockMongoCollection([], "latest_prices")
+
+    with HistoryWriter(prices, MockMongoCollection([]), latest) as history:
+        history.add(card("c1", 1.0), DATE)
+
+    assert list(latest.find({})) == []
@@ -0,0 +1,297 @@
+"""Unit tests for tasks.ifetch_dataset module.
+
+Tests the batched card ingestion against the in-memory MongoDB mock.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from tasks.history import read_history, read_step_history
+from tasks.ifetch_dataset import ingest_cards
+from tasks.obj_utils import content_digest
+from tests.mocks.mongodb import MockMongoCollection
+
+DATE = datetime(2025, 1, 1)
+
+
+def make_card(card_id: str, name: str, **fields) -> dict:
+    """Build a minimal Scryfall-like card."""
+    return {
+        "id": card_id,
+        "name": name,
+        "prices": {"usd": "1.50", "eur": None},
+        "edhrec_rank": 100,
+        **fields,
+    }
+
+
+@pytest.fixture(autouse=True)
+def in_process_normalization(monkeypatch):
+    """Normalize in the test process unless a test asks for workers."""
+    monkeypatch.setattr("tasks.ifetch_dataset.WORKERS", 0)
+
+
+@pytest.fixture
+def collections():
+    """Cards, prices and EDHREC mock collections."""
+    return (
+        MockMongoCollection([], "cards"),
+        MockMongoCollection([], "card_stocks_monthly"),
+        MockMongoCollection([], "edhrec_monthly"),
+    )
+
+
+@pytest.mark.unit
+def test_ingest_inserts_new_cards_in_batches(collections):
+    """Test that new cards and snapshots are written in batched bulk writes."""
+    cards, stocks, edhrec = collections
+    new_cards = [make_card(str(i), f"Card {i}") for i in range(5)]
+
+    counts = ingest_cards(new_cards, DATE, cards, stocks, edhrec, batch_size=2)
+
+    assert counts == {
+        "cards": 5,
+        "inserted": 5,
+        "prices_written": 5,
+        "edhrec_written": 5,
+    }
+    stored = list(cards.find({}))
+    assert len(stored) == 5
+    assert all("prices" not in card and "edhrec_rank" not in card for card in stored)
+    assert stored[0]["name_search"] == "card 0"
+    assert [len(batch) for batch in cards.bulk_write_calls] == [2, 2, 1]
+    assert read_history(stocks, "0") == [
+        {"date": DATE, "value": {"usd": 1.5, "eur": None}}
+    ]
+    assert read_history(edhrec, "0") == [{"date": DATE, "value": 100}]
+
+
+@pytest.mark.unit
+def test_ingest_updates_only_changed_fields(collections):
+    """Test that existing cards receive a $set with the changed keys only."""
+    cards, stocks, edhrec = collections
+    cards.insert_one(
+        {"_id": "db-1", "id": "1", "name": "Shock", "name_search": "shock", "cmc": 1}
+    )
+
+    ingest_cards(
+        [make_card("1", "Shock", cmc=2), make_card("2", "Opt")],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        batch_size=10,
+    )
+
+    updated = cards.find_one({"id": "1"})
+    assert updated["_id"] == "db-1"
+    assert updated["cmc"] == 2
+    assert updated["content_hash"] == content_digest(updated)
+    assert cards.find_one({"id": "2"})["name"] == "Opt"
+    assert len(cards.bulk_write_calls) == 1
+
+
+@pytest.mark.unit
+def test_ingest_skips_unchanged_cards(collections):
+    """Test that a second run with identical cards writes no card operation."""
+    cards, stocks, edhrec = collections
+    ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec)
+    cards.bulk_write_calls.clear()
+
+    counts = ingest_cards(
+        [make_card("1", "Shock"), make_card("2", "Opt")], DATE, cards, stocks, edhrec
+    )
+
+    assert counts == {
+        "cards": 2,
+        "inserted": 1,
+        "unchanged": 1,
+        "prices_written": 2,
+        "edhrec_written": 2,
+    }
+    assert [len(batch) for batch in cards.bulk_write_calls] == [1]
+
+
+@pytest.mark.unit
+def test_ingest_restores_tombstoned_cards(collections):
+    """Test that an unchanged card back in the bulk file loses its tombstone."""
+    cards, stocks, edhrec = collections
+    ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec)
+    cards.update_one({"id": "1"}, {"$set": {"deleted_at": DATE}})
+
+    counts = ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec)
+
+    assert counts["updated"] == 1
+    assert "deleted_at" not in cards.find_one({"id": "1"})
+
+
+@pytest.mark.unit
+def test_ingest_counts_changed_cards(collections):
+    """Test that a changed card is diffed and counted as updated."""
+    cards, stocks, edhrec = collections
+    ingest_cards([make_card("1", "Shock", cmc=1)], DATE, cards, stocks, edhrec)
+
+    counts = ingest_cards([make_card("1", "Shock", cmc=2)], DATE, cards, stocks, edhrec)
+
+    assert counts == {
+        "cards": 1,
+        "updated": 1,
+        "prices_written": 1,
+        "edhrec_written": 1,
+    }
+    assert cards.find_one({"id": "1"})["cmc"] == 2
+
+
+@pytest.mark.unit
+def test_ingest_with_worker_processes(collections):
+    """Test that a process pool produces the same documents, in order."""
+    cards, stocks, edhrec = collections
+    new_cards = [make_card(str(i), f"Card {i}") for i in range(7)]
+
+    counts = ingest_cards(
+        new_cards, DATE, cards, stocks, edhrec, batch_size=2, workers=2
+    )
+
+    assert counts == {
+        "cards": 7,
+        "inserted": 7,
+        "prices_written": 7,
+        "edhrec_written": 7,
+    }
+    assert [card["id"] for card in cards.find({})] == [str(i) for i in range(7)]
+
+
+@pytest.mark.unit
+def test_ingest_twice_same_day_does_not_duplicate_history(collections):
+    """Test that history buckets hold one value per card and day."""
+    cards, stocks, edhrec = collections
+
+    ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec)
+    ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec)
+
+    assert len(read_history(stocks, "1")) == 1
+    assert len(list(stocks.find({}))) == 1
+
+
+@pytest.mark.unit
+def test_delta_mode_writes_only_changed_values(collections):
+    """Test that unchanged prices and ranks are not written again."""
+    cards, stocks, edhrec = collections
+    latest = MockMongoCollection([], "latest_prices")
+    next_day = datetime(2025, 1, 2)
+
+    first = ingest_cards(
+        [make_card("1", "Shock"), make_card("2", "Opt")],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        latest,
+    )
+    repriced = make_card("2", "Opt")
+    repriced["prices"]["usd"] = "2.00"
+    second = ingest_cards(
+        [make_card("1", "Shock"), repriced], next_day, cards, stocks, edhrec, latest
+    )
+
+    assert first["prices_written"] == 2
+    assert second["prices_written"] == 1
+    assert second["edhrec_written"] == 0
+    assert [point["date"] for point in read_history(stocks, "1")] == [DATE]
+    assert read_step_history(stocks, "1", DATE, next_day) == [
+        {"date": DATE, "value": {"usd": 1.5, "eur": None}},
+        {"date": next_day, "value": {"usd": 1.5, "eur": None}},
+    ]
+    assert read_history(stocks, "2")[-1] == {
+        "date": next_day,
+        "value": {"usd": 2.0, "eur": None},
+    }
+    assert latest.find_one({"_id": "2"})["prices"] == {"usd": 2.0, "eur": None}
+
+
+@pytest.mark.unit
+def test_ingest_builds_oracle_cards(collections):
+    """Test that oracle cards are built from the written printings."""
+    cards, stocks, edhrec = collections
+    oracle_cards = MockMongoCollection([], "oracle_cards")
+
+    counts = ingest_cards(
+        [
+            make_card("1", "Shock", oracle_id="o1", lang="en", released_at="2001"),
+            make_card("2", "Shock", oracle_id="o1", lang="en", released_at="2020"),
+        ],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        oracle_cards=oracle_cards,
+    )
+
+    assert counts["oracles_written"] == 1
+    oracle = oracle_cards.find_one({"_id": "o1:en"})
+    assert oracle["printings"] == ["2", "1"]
+    assert oracle["edhrec_rank"] == 100
+
+    counts = ingest_cards(
+        [make_card("1", "Shock", oracle_id="o1", lang="en", released_at="2001")],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        oracle_cards=oracle_cards,
+    )
+    assert "oracles_written" not in counts
+
+
+@pytest.mark.unit
+def test_interrupted_ingest_resumes_from_checkpoint(collections):
+    """Test that a resumed ingest skips the checkpointed cards only."""
+    cards, stocks, edhrec = collections
+    oracle_cards = MockMongoCollection([], "oracle_cards")
+    bulk = [make_card(str(i), f"Card {i}", oracle_id=f"o{i}") for i in range(10)]
+    checkpoints = []
+
+    def dying_source():
+        for index, card in enumerate(bulk):
+            if index == 7:
+                raise MemoryError()
+            yield dict(card)
+
+    with pytest.raises(MemoryError):
+        ingest_cards(
+            dying_source(),
+            DATE,
+            cards,
+            stocks,
+            edhrec,
+            oracle_cards=oracle_cards,
+            batch_size=2,
+            on_checkpoint=lambda position, counts: checkpoints.append(
+                (position, dict(counts))
+            ),
+            checkpoint_interval=4,
+        )
+
+    assert checkpoints == [
+        (4, {"cards": 4, "inserted": 4, "prices_written": 4, "edhrec_written": 4})
+    ]
+    counts = ingest_cards(
+        (dict(card) for card in bulk),
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        oracle_cards=oracle_cards,
+        batch_size=2,
+        resume_from=4,
+    )
+
+    # Cards 4 and 5 were flushed when the batch writer exited on the error
+    assert counts["cards"] == 6
+    assert counts["inserted"] == 4
+    assert counts["unchanged"] == 2
+    assert sorted(card["id"] for card in cards.find({})) == [str(i) for i in range(10)]
+    assert len(list(stocks.find({}))) == 10
+    # Oracles touched before the interruption are rebuilt as well
+    assert counts["oracles_written"] == 10
@@ -0,0 +1,123 @@
+"""Unit tests for tasks.index_admin module.
+
+Tests index profiles, bulk load and the usage audit against the MongoDB mock.
+"""
+
+import pytest
+from pymongo import IndexModel
+
+from tasks.index_admin import (
+    apply_index_profile,
+    bulk_load_indexes,
+    index_usage,
+    unused_indexes,
+)
+from tasks.indexes import (
+    DIGEST_INDEX_NAME,
+    INDEX_PROFILES,
+    ORACLE_PRINTINGS_INDEX_NAME,
+)
+from tests.mocks.mongodb import MockMongoCollection
+
+
+def profile_names(profile: str) -> set[str]:
+    return {model.document["name"] for model in INDEX_PROFILES[profile]}
+
+
+@pytest.fixture
+def cards():
+    """Empty cards mock collection."""
+    return MockMongoCollection([], "cards")
+
+
+@pytest.mark.unit
+def test_apply_index_profile_creates_missing(cards):
+    """Test that only the indexes missing from the collection are created."""
+    first = apply_index_profile(cards, "api-minimal")
+    second = apply_index_profile(cards, "api-minimal")
+
+    assert set(first["created"]) == profile_names("api-minimal")
+    assert second == {"created": [], "dropped": []}
+
+
+@pytest.mark.unit
+def test_apply_index_profile_prune(cards):
+    """Test that pruning drops the indexes outside of the profile."""
+    apply_index_profile(cards, "full")
+
+    result = apply_index_profile(cards, "api-minimal", prune=True)
+
+    assert set(result["dropped"]) == profile_names("full") - profile_names(
+        "api-minimal"
+    )
+    assert set(cards.index_information()) == {"_id_", *profile_names("api-minimal")}
+
+
+@pytest.mark.unit
+def test_apply_index_profile_drops_retired_indexes(cards):
+    """Test that a replaced index is dropped even without pruning."""
+    cards.create_indexes(
+        [IndexModel([("id", 1), ("content_hash", 1)], name="id_content_hash")]
+    )
+
+    result = apply_index_profile(cards, "api-minimal")
+
+    assert result["dropped"] == ["id_content_hash"]
+    assert DIGEST_INDEX_NAME in cards.index_information()
+
+
+@pytest.mark.unit
+def test_apply_index_profile_unknown(cards):
+    """Test that an unknown profile raises."""
+    with pytest.raises(ValueError, match="Unknown index profile"):
+        apply_index_profile(cards, "everything")
+
+
+@pytest.mark.unit
+def test_bulk_load_indexes_drops_and_rebuilds(cards):
+    """Test that only the kept indexes exist during the load."""
+    apply_index_profile(cards, "api-minimal")
+
+    with bulk_load_indexes(cards, "api-minimal"):
+        assert set(cards.index_information()) == {
+            "_id_",
+            DIGEST_INDEX_NAME,
+            ORACLE_PRINTINGS_INDEX_NAME,
+        }
+
+    assert set(cards.index_information()) == {"_id_", *profile_names("api-minimal")}
+
+
+@pytest.mark.unit
+def test_bulk_load_indexes_rebuilds_on_error(cards):
+    """Test that a failed load still rebuilds the indexes."""
+    with pytest.raises(RuntimeError):
+        with bulk_load_indexes(cards, "api-minimal"):
+            raise RuntimeError("ingest failed")
+
+    assert set(cards.index_information()) == {"_id_", *profile_names("api-minimal")}
+
+
+@pytest.mark.unit
+def test_index_usage_counts_stats_and_profiled_plans(cards):
+    """Test that an index used in $indexStats or the profiler is not unused."""
+    apply_index_profile(cards, "api-minimal")
+    cards.index_accesses = {DIGEST_INDEX_NAME: 3}
+    profile = MockMongoCollection(
+        [
+            {"ns": "cards", "planSummary": "IXSCAN { name_search: 1 }"},
+            {"ns": "other", "planSummary": "IXSCAN { oracle_id: 1, released_at: -1 }"},
+            {"ns": "cards", "planSummary": "COLLSCAN"},
+        ]
+    )
+
+    usage = {index["name"]: index for index in index_usage(cards, profile)}
+    rows = list(usage.values())
+
+    assert usage[DIGEST_INDEX_NAME]["ops"] == 3
+    assert usage["name_search_1"]["profiled"] == 1
+    assert not usage["name_search_1"]["unused"]
+    assert usage["oracle_id_released_at"]["unused"]
+    assert not usage["_id_"]["unused"]
+    assert unused_indexes(rows) == ["oracle_id_released_at", "text_index"]
+    assert unused_indexes(rows, profile="api-minimal") == []
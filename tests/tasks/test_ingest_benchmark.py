@@ -0,0 +1,79 @@
+"""Unit tests for tasks.ingest_benchmark module.
+
+Tests a benchmark stage against in-memory MongoDB mocks, the server
+counters are patched.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from itertools import count
+from unittest.mock import MagicMock
+
+import pytest
+
+from tasks.ingest_benchmark import benchmark_ingest, ingest_stage, server_counters
+from tasks.synthetic_cards import generate_cards, write_dataset
+from tests.mocks.mongodb import MockMongoCollection
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    """Server counters growing by 10 operations, 1000 bytes received and
+    500 bytes stored per call."""
+    calls = count()
+
+    def server_counters(db):
+        call = next(calls)
+        return {
+            "write_ops": call * 10,
+            "bytes_in": call * 1000,
+            "stored_bytes": call * 500,
+        }
+
+    monkeypatch.setattr("tasks.ingest_benchmark.server_counters", server_counters)
+
+
+@pytest.mark.unit
+def test_ingest_stage_measures_ingest(counters, tmp_path):
+    """Test that a stage ingests the file and reports its metrics."""
+    path = str(tmp_path / "cards.json")
+    write_dataset(path, generate_cards(40))
+    db = defaultdict(lambda: MockMongoCollection([]))
+
+    result = ingest_stage(db, path, datetime(2025, 1, 1), workers=0)
+
+    assert result["cards"] == 40
+    assert result["counts"]["inserted"] == 40
+    assert result["write_ops"] == 10
+    assert result["bytes_in"] == 1000
+    assert result["stored_bytes"] == 500
+    assert result["cards_per_second"] > 0
+    assert result["peak_rss_mb"] > 0
+    assert len(list(db["cards"].find({}))) == 40
+    assert db["oracle_cards"].find_one({}) is not None
+
+
+@pytest.mark.unit
+def test_benchmark_refuses_ingest_database():
+    """Test that the ingest database is never dropped."""
+    with pytest.raises(ValueError, match="Refusing"):
+        benchmark_ingest([], database="mtg")
+
+
+@pytest.mark.unit
+def test_server_counters_reads_network_and_storage():
+    """Test that bytes received come from the network and bytes stored from
+    the data and indexes of the database."""
+    db = MagicMock()
+    db.client.admin.command.return_value = {
+        "opcounters": {"insert": 3, "update": 2, "delete": 1, "query": 50},
+        "network": {"bytesIn": 4096},
+    }
+    db.command.return_value = {"dataSize": 1000, "indexSize": 200}
+
+    assert server_counters(db) == {
+        "write_ops": 6,
+        "bytes_in": 4096,
+        "stored_bytes": 1200,
+    }
+    db.command.assert_called_once_with("dbStats")
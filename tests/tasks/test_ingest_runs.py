@@ -0,0 +1,120 @@
+"""Unit tests for tasks.ingest_runs module.
+
+Tests run bookkeeping and detection of already ingested bulk files.
+"""
+
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+from tasks.ingest_runs import (
+    STATUS_FAILED,
+    STATUS_SUCCESS,
+    IngestRun,
+    is_already_ingested,
+    resumable_run,
+)
+from tests.mocks.mongodb import MockMongoCollection
+
+UPDATED_AT = datetime(2025, 1, 1, 9, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def runs():
+    """Empty ingest_runs collection."""
+    return MockMongoCollection([], "ingest_runs")
+
+
+@pytest.mark.unit
+def test_successful_run_is_recorded(runs):
+    """Test that a run stores its source, counts, duration and status."""
+    with IngestRun(runs, "all_cards", "https://example/all.json", UPDATED_AT) as run:
+        assert runs.find_one({"_id": run.id})["status"] == "running"
+        run.counts.update({"inserted": 2, "unchanged": 3})
+
+    stored = runs.find_one({"_id": run.id})
+    assert stored["status"] == STATUS_SUCCESS
+    assert stored["source_uri"] == "https://example/all.json"
+    assert stored["counts"] == {"inserted": 2, "unchanged": 3}
+    assert stored["duration"] >= 0
+    assert stored["peak_rss_mb"] > 0
+
+
+@pytest.mark.unit
+def test_failed_run_is_recorded_and_reraised(runs):
+    """Test that an exception marks the run failed without swallowing it."""
+    with pytest.raises(ValueError):
+        with IngestRun(runs, "all_cards", "uri", UPDATED_AT) as run:
+            raise ValueError("broken dump")
+
+    stored = runs.find_one({"_id": run.id})
+    assert stored["status"] == STATUS_FAILED
+    assert stored["error"] == "ValueError: broken dump"
+
+
+@pytest.mark.unit
+def test_is_already_ingested(runs):
+    """Test skip detection against the last successful run only."""
+    assert not is_already_ingested(runs, "all_cards", UPDATED_AT)
+
+    with pytest.raises(RuntimeError):
+        with IngestRun(runs, "all_cards", "uri", UPDATED_AT):
+            raise RuntimeError()
+    assert not is_already_ingested(runs, "all_cards", UPDATED_AT)
+
+    with IngestRun(runs, "all_cards", "uri", UPDATED_AT):
+        pass
+    assert is_already_ingested(runs, "all_cards", UPDATED_AT)
+    assert not is_already_ingested(runs, "default_cards", UPDATED_AT)
+    assert not is_already_ingested(
+        runs, "all_cards", datetime(2025, 1, 2, tzinfo=timezone.utc)
+    )
+
+
+@pytest.mark.unit
+def test_is_already_ingested_handles_naive_datetimes(runs):
+    """Test that naive UTC datetimes returned by MongoDB are comparable."""
+    with IngestRun(runs, "all_cards", "uri", UPDATED_AT.replace(tzinfo=None)):
+        pass
+
+    assert is_already_ingested(runs, "all_cards", UPDATED_AT)
+
+
+@pytest.mark.unit
+def test_failed_run_is_resumed_from_checkpoint(runs):
+    """Test that a new run continues the checkpoint of an unfinished one."""
+    with pytest.raises(MemoryError):
+        with IngestRun(runs, "all_cards", "uri", UPDATED_AT) as failed:
+            failed.checkpoint(1000, Counter(cards=1000, inserted=1000))
+            raise MemoryError()
+
+    resume = resumable_run(runs, "all_cards", UPDATED_AT)
+    assert resume["_id"] == failed.id
+
+    with IngestRun(runs, "all_cards", "uri", UPDATED_AT, resume=resume) as run:
+        assert run.position == 1000
+        assert runs.find_one({"_id": run.id})["status"] == "running"
+        run.counts.update(Counter(cards=500, inserted=500))
+
+    stored = runs.find_one({"_id": failed.id})
+    assert run.id == failed.id
+    assert stored["status"] == STATUS_SUCCESS
+    assert stored["resumes"] == 1
+    assert stored["counts"] == {"cards": 1500, "inserted": 1500}
+    assert resumable_run(runs, "all_cards", UPDATED_AT) is None
+
+
+@pytest.mark.unit
+def test_run_without_checkpoint_is_not_resumed(runs):
+    """Test that only runs with a checkpoint of the same bulk file resume."""
+    with pytest.raises(RuntimeError):
+        with IngestRun(runs, "all_cards", "uri", UPDATED_AT):
+            raise RuntimeError()
+    with pytest.raises(RuntimeError):
+        with IngestRun(runs, "all_cards", "uri", UPDATED_AT) as run:
+            run.checkpoint(10, Counter(cards=10))
+            raise RuntimeError()
+
+    assert resumable_run(runs, "all_cards", UPDATED_AT) is not None
+    assert resumable_run(runs, "all_cards", datetime(2025, 2, 1)) is None
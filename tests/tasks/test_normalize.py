@@ -0,0 +1,86 @@
+"""Unit tests for tasks.normalize module.
+
+Tests card normalization and the ordered, optionally multi-process batches.
+"""
+
+import bson
+import pytest
+
+from tasks.normalize import (
+    benchmark_normalization,
+    normalize_card,
+    normalize_prices,
+    normalized_batches,
+)
+from tasks.obj_utils import content_digest
+
+
+def make_card(card_id: str) -> dict:
+    """Build a minimal Scryfall-like card."""
+    return {
+        "id": card_id,
+        "name": "Séance",
+        "prices": {"usd": "1.50", "eur": None},
+        "edhrec_rank": 100,
+    }
+
+
+@pytest.mark.unit
+def test_normalize_prices_converts_to_float():
+    """Test that price strings become floats and missing prices stay None."""
+    assert normalize_prices({"usd": "1.50", "eur": None}) == {
+        "usd": 1.5,
+        "eur": None,
+    }
+
+
+@pytest.mark.unit
+def test_normalize_card_splits_document_and_snapshots():
+    """Test that prices and rank are split off the BSON stored document."""
+    normalized = normalize_card(make_card("1"))
+
+    document = bson.decode(normalized.document)
+    assert document == {
+        "id": "1",
+        "name": "Séance",
+        "name_search": "seance",
+        "content_hash": normalized.content_hash,
+    }
+    assert normalized.content_hash == content_digest(document)
+    assert normalized.prices == {"usd": 1.5, "eur": None}
+    assert normalized.edhrec_rank == 100
+
+
+@pytest.mark.unit
+def test_normalize_card_without_rank():
+    """Test that cards without EDHREC rank are normalized."""
+    card = make_card("1")
+    del card["edhrec_rank"]
+
+    assert normalize_card(card).edhrec_rank is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("workers", [0, 2])
+def test_normalized_batches_preserve_order(workers):
+    """Test that batches come back complete and in input order."""
+    cards = (make_card(str(i)) for i in range(11))
+
+    batches = list(normalized_batches(cards, batch_size=3, workers=workers))
+
+    assert [len(batch) for batch in batches] == [3, 3, 3, 2]
+    assert [card.id for batch in batches for card in batch] == [
+        str(i) for i in range(11)
+    ]
+
+
+@pytest.mark.unit
+def test_benchmark_normalization_reports_throughput():
+    """Test that the benchmark leaves its input untouched and reports counts."""
+    cards = [make_card(str(i)) for i in range(5)]
+
+    result = benchmark_normalization(cards, workers=0, batch_size=2)
+
+    assert result["cards"] == 5
+    assert result["cards_per_second"] > 0
+    assert "prices" in cards[0]
@@ -0,0 +1,125 @@
+"""Unit tests for tasks.obj_utils module.
+
+Tests card content digests and document differences.
+"""
+
+import pytest
+
+from tasks.obj_utils import (
+    MISSING,
+    benchmark_diff,
+    content_digest,
+    diff_update,
+    yield_differences,
+)
+
+
+@pytest.mark.unit
+def test_content_digest_ignores_key_order():
+    """Test that the digest is stable regardless of field order."""
+    a = {
+        "id": "1",
+        "name": "Shock",
+        "legalities": {"modern": "legal", "vintage": "legal"},
+    }
+    b = {
+        "legalities": {"vintage": "legal", "modern": "legal"},
+        "name": "Shock",
+        "id": "1",
+    }
+
+    assert content_digest(a) == content_digest(b)
+
+
+@pytest.mark.unit
+def test_content_digest_ignores_volatile_and_storage_keys():
+    """Test that prices, ranks, _id and the stored hash don't affect the digest."""
+    card = {"id": "1", "name": "Shock"}
+    stored = {
+        **card,
+        "_id": "db-1",
+        "prices": {"usd": 1.0},
+        "edhrec_rank": 10,
+        "content_hash": "abc",
+    }
+
+    assert content_digest(card) == content_digest(stored)
+
+
+@pytest.mark.unit
+def test_content_digest_detects_nested_changes():
+    """Test that a nested change produces a different digest."""
+    before = {"id": "1", "legalities": {"modern": "legal"}}
+    after = {"id": "1", "legalities": {"modern": "banned"}}
+
+    assert content_digest(before) != content_digest(after)
+
+
+@pytest.mark.unit
+def test_yield_differences_nested():
+    """Test that nested dict changes are reported with dotted keys."""
+    before = {"name": "Shock", "legalities": {"modern": "legal"}}
+    after = {"name": "Shock", "legalities": {"modern": "banned"}}
+
+    assert list(yield_differences(before, after)) == [
+        ("legalities.modern", "legal", "banned")
+    ]
+
+
+@pytest.mark.unit
+def test_yield_differences_reports_removed_keys():
+    """Test that keys missing on one side are reported with MISSING."""
+    before = {"name": "Shock", "flavor_text": "Zap"}
+    after = {"name": "Shock", "watermark": "set"}
+
+    assert sorted(yield_differences(before, after), key=lambda diff: diff[0]) == [
+        ("flavor_text", "Zap", MISSING),
+        ("watermark", MISSING, "set"),
+    ]
+
+
+@pytest.mark.unit
+def test_yield_differences_list_length_change():
+    """Test that a list changing length is reported as a whole."""
+    before = {"colors": ["R"], "card_faces": [{"name": "A"}, {"name": "B"}]}
+    after = {"colors": ["R", "G"], "card_faces": [{"name": "A"}, {"name": "C"}]}
+
+    assert sorted(yield_differences(before, after), key=lambda diff: diff[0]) == [
+        ("card_faces.1.name", "B", "C"),
+        ("colors", ["R"], ["R", "G"]),
+    ]
+
+
+@pytest.mark.unit
+def test_yield_differences_type_change():
+    """Test that a value changing type is replaced, not descended into."""
+    assert list(yield_differences({"cmc": 1}, {"cmc": 1.0})) == [("cmc", 1, 1.0)]
+    assert list(yield_differences({"a": {"b": 1}}, {"a": [1]})) == [
+        ("a", {"b": 1}, [1])
+    ]
+
+
+@pytest.mark.unit
+def test_diff_update_set_and_unset():
+    """Test that the update document sets changed keys and unsets removed ones."""
+    before = {"_id": "db-1", "name": "Shock", "legalities": {"modern": "legal"}}
+    after = {"name": "Shock", "legalities": {"modern": "banned", "pauper": "legal"}}
+
+    assert diff_update(before, after) == {
+        "$set": {"legalities.modern": "banned", "legalities.pauper": "legal"}
+    }
+    assert diff_update({"name": "Shock", "deleted_at": 1}, {"name": "Shock"}) == {
+        "$unset": {"deleted_at": ""}
+    }
+    assert diff_update(after, after) == {}
+
+
+@pytest.mark.unit
+def test_benchmark_diff_compares_both_implementations():
+    """Test that the benchmark reports the baseline and the iterative diff."""
+    pairs = [({"id": "1", "cmc": 1}, {"id": "1", "cmc": 2})]
+
+    results = benchmark_diff(pairs, repeat=1)
+
+    assert [result["name"] for result in results] == ["recursive", "iterative"]
+    assert all(result["pairs"] == 1 for result in results)
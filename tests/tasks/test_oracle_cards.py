@@ -0,0 +1,139 @@
+"""Unit tests for tasks.oracle_cards module.
+
+Tests the oracle card documents and their incremental refresh.
+"""
+
+import pytest
+from pymongo import DeleteOne
+
+from tasks.oracle_cards import (
+    OracleCardsWriter,
+    build_oracle_document,
+    build_oracle_documents,
+    card_oracle_id,
+)
+from tests.mocks.mongodb import MockMongoCollection
+
+
+def make_printing(card_id: str, oracle_id: str, released_at: str, **fields) -> dict:
+    """Build a stored printing."""
+    return {
+        "id": card_id,
+        "oracle_id": oracle_id,
+        "name": "Shock",
+        "lang": "en",
+        "released_at": released_at,
+        "set": f"s{card_id}",
+        "set_name": f"Set {card_id}",
+        "rarity": "common",
+        "image_uris": {"normal": f"https://img/{card_id}.jpg"},
+        **fields,
+    }
+
+
+@pytest.mark.unit
+def test_build_oracle_document_uses_latest_printing():
+    """Test that summary fields come from the most recent printing."""
+    document = build_oracle_document(
+        [
+            make_printing("a", "o1", "2001-01-01", rarity="uncommon", penny_rank=5),
+            make_printing("b", "o1", "2020-01-01", penny_rank=9),
+        ],
+        edhrec_rank=42,
+    )
+
+    assert document["_id"] == "o1:en"
+    assert document["printings"] == ["b", "a"]
+    assert document["card_count"] == 2
+    assert document["thumbnail"] == "https://img/b.jpg"
+    assert document["rarity"] == "common"
+    assert document["rarities"] == ["common", "uncommon"]
+    assert document["sets"] == ["sa", "sb"]
+    assert document["edhrec_rank"] == 42
+    assert document["penny_rank"] == 9
+    assert document["name_search"] == "shock"
+
+
+@pytest.mark.unit
+def test_build_oracle_documents_groups_by_oracle_and_lang():
+    """Test that each language of an oracle gets its own document."""
+    documents = build_oracle_documents(
+        [
+            make_printing("a", "o1", "2001-01-01"),
+            make_printing("b", "o1", "2001-01-01", lang="fr"),
+            make_printing("c", "o2", "2001-01-01"),
+        ]
+    )
+
+    assert sorted(document["_id"] for document in documents) == [
+        "o1:en",
+        "o1:fr",
+        "o2:en",
+    ]
+
+
+@pytest.mark.unit
+def test_card_oracle_id_from_faces():
+    """Test that reversible cards use the oracle id of their first face."""
+    assert card_oracle_id({"card_faces": [{"oracle_id": "o1"}, {}]}) == "o1"
+    assert card_oracle_id({"name": "Token"}) is None
+
+
+@pytest.mark.unit
+def test_refresh_rebuilds_only_touched_oracles():
+    """Test that untouched oracles are left alone apart from their rank."""
+    cards = MockMongoCollection(
+        [
+            make_printing("a", "o1", "2001-01-01"),
+            make_printing("b", "o1", "2020-01-01"),
+            make_printing("c", "o2", "2001-01-01"),
+        ]
+    )
+    oracle_cards = MockMongoCollection(
+        build_oracle_documents(cards.find({}), {"o1": 1, "o2": 7})
+    )
+    writer = OracleCardsWriter(cards, oracle_cards)
+
+    cards.bulk_write([DeleteOne({"id": "b"})])
+    writer.touch("o1")
+    writer.rank("o1", 1)
+    writer.rank("o2", 8)
+    counts = writer.refresh()
+
+    assert counts == {"oracles_written": 1, "oracle_ranks_updated": 1}
+    assert oracle_cards.find_one({"_id": "o1:en"})["printings"] == ["a"]
+    assert oracle_cards.find_one({"_id": "o2:en"})["edhrec_rank"] == 8
+
+
+@pytest.mark.unit
+def test_refresh_deletes_oracles_without_printings():
+    """Test that an oracle whose printings are all gone is removed."""
+    cards = MockMongoCollection(
+        [make_printing("a", "o1", "2001-01-01", deleted_at="2025-01-01")]
+    )
+    oracle_cards = MockMongoCollection(
+        build_oracle_documents([make_printing("a", "o1", "2001-01-01")])
+    )
+    writer = OracleCardsWriter(cards, oracle_cards)
+
+    writer.touch("o1")
+    counts = writer.refresh()
+
+    assert counts == {"oracles_deleted": 1}
+    assert list(oracle_cards.find({})) == []
+
+
+@pytest.mark.unit
+def test_refresh_builds_empty_collection():
+    """Test that the first refresh builds every oracle, touched or not."""
+    cards = MockMongoCollection(
+        [
+            make_printing("a", "o1", "2001-01-01"),
+            make_printing("b", "o2", "2001-01-01"),
+        ]
+    )
+    oracle_cards = MockMongoCollection([])
+
+    counts = OracleCardsWriter(cards, oracle_cards).refresh()
+
+    assert counts == {"oracles_written": 2}
@@ -0,0 +1,178 @@
+"""Unit tests for tasks.search_index module.
+
+Tests the Meilisearch cards index against in-memory Meilisearch and MongoDB
+mocks.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from tasks.ifetch_dataset import ingest_cards
+from tasks.oracle_cards import build_oracle_document
+from tasks.search_index import (
+    CARDS_INDEX_SETTINGS,
+    card_types,
+    search_document,
+    sync_search_index,
+)
+from tests.mocks.meilisearch import MockMeilisearchClient
+from tests.mocks.mongodb import MockMongoCollection
+
+DATE = datetime(2025, 1, 1)
+
+
+def make_oracle(oracle_id: str, name: str, **fields) -> dict:
+    """Build an oracle_cards document from a single printing."""
+    return build_oracle_document(
+        [
+            {
+                "id": f"{oracle_id}-1",
+                "oracle_id": oracle_id,
+                "name": name,
+                "lang": "en",
+                "set": "lea",
+                "set_name": "Limited Edition Alpha",
+                **fields,
+            }
+        ]
+    )
+
+
+def make_card(card_id: str, name: str, **fields) -> dict:
+    """Build a minimal Scryfall-like card."""
+    return {
+        "id": card_id,
+        "name": name,
+        "lang": "en",
+        "prices": {"usd": "1.50", "eur": None},
+        "edhrec_rank": 100,
+        **fields,
+    }
+
+
+@pytest.fixture(autouse=True)
+def in_process_normalization(monkeypatch):
+    """Normalize in the test process."""
+    monkeypatch.setattr("tasks.ifetch_dataset.WORKERS", 0)
+
+
+@pytest.mark.unit
+def test_card_types_splits_faces_and_subtypes():
+    """Test that every type of every face is filterable."""
+    assert card_types("Legendary Creature — Elf Druid // Sorcery") == [
+        "Creature",
+        "Druid",
+        "Elf",
+        "Legendary",
+        "Sorcery",
+    ]
+    assert card_types(None) == []
+
+
+@pytest.mark.unit
+def test_search_document_fields():
+    """Test the document built from an oracle card."""
+    document = search_document(
+        make_oracle("o1", "Shock", type_line="Instant", colors=["R"], cmc=1)
+    )
+
+    assert document["id"] == "o1_en"
+    assert document["types"] == ["Instant"]
+    assert document["color_count"] == 1
+    assert document["sets"] == ["lea"]
+    assert document["printings"] == ["o1-1"]
+
+
+@pytest.mark.unit
+def test_sync_rebuilds_empty_index():
+    """Test that an empty index is filled from every oracle card."""
+    client = MockMeilisearchClient()
+    oracle_cards = MockMongoCollection(
+        [make_oracle("o1", "Shock"), make_oracle("o2", "Opt")]
+    )
+
+    counts = sync_search_index(client, oracle_cards, written=set(), deleted=set())
+
+    assert counts == {"search_upserted": 2}
+    index = client.indexes["cards"]
+    assert sorted(index.documents) == ["o1_en", "o2_en"]
+    assert index.settings == CARDS_INDEX_SETTINGS
+    assert "cards_rebuild" not in client.indexes
+
+
+@pytest.mark.unit
+def test_sync_pushes_only_changed_documents():
+    """Test that only the written and deleted oracle cards are sent."""
+    client = MockMeilisearchClient()
+    oracle_cards = MockMongoCollection(
+        [make_oracle("o1", "Shock"), make_oracle("o2", "Opt")]
+    )
+    sync_search_index(client, oracle_cards, written=set(), deleted=set())
+    oracle_cards.update_one({"_id": "o1:en"}, {"$set": {"name": "Shock!"}})
+    task_count = len(client.tasks)
+
+    counts = sync_search_index(
+        client, oracle_cards, written={"o1:en"}, deleted={"o2:en"}
+    )
+
+    assert counts == {"search_upserted": 1, "search_deleted": 1}
+    index = client.indexes["cards"]
+    assert index.documents["o1_en"]["name"] == "Shock!"
+    assert "o2_en" not in index.documents
+    assert [task.type for task in list(client.tasks.values())[task_count:]] == [
+        "indexCreation",
+        "settingsUpdate",
+        "documentAdditionOrUpdate",
+        "documentDeletion",
+    ]
+
+
+@pytest.mark.unit
+def test_sync_failure_does_not_raise():
+    """Test that a failed Meilisearch task is counted instead of raised."""
+    client = MockMeilisearchClient(fail=True)
+    oracle_cards = MockMongoCollection([make_oracle("o1", "Shock")])
+
+    counts = sync_search_index(client, oracle_cards, written={"o1:en"}, deleted=set())
+
+    assert counts == {"search_failed": 1}
+
+
+@pytest.mark.unit
+def test_ingest_pushes_changed_oracles():
+    """Test that an ingest only sends the oracle cards it rebuilt."""
+    client = MockMeilisearchClient()
+    collections = (
+        MockMongoCollection([], "cards"),
+        MockMongoCollection([], "card_stocks_monthly"),
+        MockMongoCollection([], "edhrec_monthly"),
+    )
+    oracle_cards = MockMongoCollection([], "oracle_cards")
+    cards = [
+        make_card("1", "Shock", oracle_id="o1"),
+        make_card("2", "Opt", oracle_id="o2"),
+    ]
+
+    counts = ingest_cards(
+        [dict(card) for card in cards],
+        DATE,
+        *collections,
+        oracle_cards=oracle_cards,
+        search_client=client,
+    )
+    assert counts["search_upserted"] == 2
+
+    cards[0]["oracle_text"] = "Shock deals 2 damage to any target."
+    counts = ingest_cards(
+        [dict(card) for card in cards],
+        DATE,
+        *collections,
+        oracle_cards=oracle_cards,
+        search_client=client,
+    )
+
+    assert counts["search_upserted"] == 1
+    assert client.indexes["cards"].documents["o1_en"]["card_text"] == (
+        "Shock deals 2 damage to any target."
+    )
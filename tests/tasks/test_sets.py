@@ -0,0 +1,66 @@
+"""Unit tests for tasks.sets module.
+
+Tests the set documents grouped from the printings and their refresh.
+"""
+
+import pytest
+
+from tasks.sets import build_set_documents, refresh_sets
+from tests.mocks.mongodb import MockMongoCollection
+
+
+def make_printing(card_id: str, code: str, released_at: str, **fields) -> dict:
+    """Build a stored printing."""
+    return {
+        "id": card_id,
+        "set": code,
+        "set_name": f"Set {code}",
+        "set_type": "expansion",
+        "released_at": released_at,
+        **fields,
+    }
+
+
+@pytest.mark.unit
+def test_build_set_documents_groups_by_code():
+    """Test that each set counts its printings and keeps its first release."""
+    cards = MockMongoCollection(
+        [
+            make_printing("1", "abc", "2020-02-01"),
+            make_printing("2", "abc", "2020-01-01", lang="fr"),
+            make_printing("3", "xyz", "2021-01-01"),
+            make_printing("4", "xyz", "2021-01-01", deleted_at="2021-06-01"),
+        ]
+    )
+
+    documents = {document["_id"]: document for document in build_set_documents(cards)}
+
+    assert documents["abc"] == {
+        "_id": "abc",
+        "code": "abc",
+        "name": "Set abc",
+        "released_at": "2020-01-01",
+        "set_type": "expansion",
+        "card_count": 2,
+    }
+    assert documents["xyz"]["card_count"] == 1
+
+
+@pytest.mark.unit
+def test_refresh_sets_writes_changes_only():
+    """Test that unchanged sets are not rewritten and empty sets are deleted."""
+    cards = MockMongoCollection(
+        [make_printing("1", "abc", "2020-01-01"), make_printing("2", "new", "2022")]
+    )
+    sets = MockMongoCollection(
+        build_set_documents(
+            MockMongoCollection([make_printing("1", "abc", "2020-01-01")])
+        )
+        + [{"_id": "old", "code": "old", "card_count": 3}]
+    )
+
+    counts = refresh_sets(cards, sets)
+
+    assert counts == {"sets_written": 1, "sets_deleted": 1}
+    assert {document["_id"] for document in sets.find({})} == {"abc", "new"}
+    assert refresh_sets(cards, sets) == {}
@@ -0,0 +1,174 @@
+"""Unit tests for tasks.storage module.
+
+Tests the lean storage profile and the cold copy of the untrimmed cards.
+"""
+
+from datetime import datetime
+
+import bson
+import pytest
+
+from api.helpers.cards_mongo import CARD_PROJECTION
+from tasks.ifetch_dataset import ingest_cards
+from tasks.normalize import normalize_card
+from tasks.sets import build_set_documents
+from tasks.storage import lean_document, raw_collection, storage_fields
+from tests.mocks.mongodb import MockMongoCollection
+
+DATE = datetime(2025, 1, 1)
+
+
+def make_card(card_id: str, name: str, **fields) -> dict:
+    """Build a Scryfall-like card with fields the API never serves."""
+    return {
+        "id": card_id,
+        "name": name,
+        "lang": "en",
+        "set": "lea",
+        "prices": {"usd": "1.50", "eur": None},
+        "edhrec_rank": 100,
+        "purchase_uris": {"tcgplayer": f"https://tcg/{card_id}"},
+        "prints_search_uri": f"https://api/{card_id}/prints",
+        **fields,
+    }
+
+
+@pytest.fixture
+def lean(monkeypatch):
+    """Normalize in the test process with the lean profile and a raw copy."""
+    monkeypatch.setattr("tasks.ifetch_dataset.WORKERS", 0)
+    monkeypatch.setattr("tasks.normalize.STORAGE_PROFILE", "lean")
+    monkeypatch.setattr("tasks.normalize.RAW_COPY", True)
+
+
+@pytest.mark.unit
+def test_storage_fields_cover_api_and_indexes():
+    """Test that the lean profile keeps every field the API serves."""
+    fields = storage_fields("api-minimal")
+
+    served = {
+        field.split(".")[0]
+        for field, value in CARD_PROJECTION.items()
+        if field != "_id" and value == 1
+    }
+    served |= {
+        value[1:].split(".")[0]
+        for value in CARD_PROJECTION.values()
+        if isinstance(value, str)
+    }
+    assert served <= fields
+    assert {"card_faces", "printed_text", "content_hash"} <= fields
+    assert "purchase_uris" not in fields
+    assert "multiverse_ids" in storage_fields("full")
+
+
+@pytest.mark.unit
+def test_lean_document_trims_unused_fields():
+    """Test that fields outside the profile are dropped."""
+    card = make_card("1", "Shock")
+
+    assert lean_document(card, frozenset({"id", "name"})) == {
+        "id": "1",
+        "name": "Shock",
+    }
+
+
+@pytest.mark.unit
+def test_normalize_lean_card(lean):
+    """Test that the stored document is trimmed and the raw card kept."""
+    normalized = normalize_card(make_card("1", "Shock"))
+
+    document = bson.decode(normalized.document)
+    raw = bson.decode(normalized.raw)
+    assert "purchase_uris" not in document
+    assert raw["purchase_uris"] == {"tcgplayer": "https://tcg/1"}
+    assert "prices" not in raw
+    assert document["content_hash"].startswith("lean-")
+
+
+@pytest.mark.unit
+def test_raw_collection_selection():
+    """Test that the cold copy is only used with the lean profile."""
+    db = {"cards_raw": MockMongoCollection([])}
+
+    assert raw_collection(db, "lean", True) is db["cards_raw"]
+    assert raw_collection(db, "full", True) is None
+    with pytest.raises(ValueError, match="Storage profile"):
+        raw_collection(db, "tiny", True)
+
+
+@pytest.mark.unit
+def test_lean_ingest_writes_raw_copy_on_change(lean):
+    """Test that the cold copy follows changes of the trimmed fields."""
+    cards, stocks, edhrec, raw = (MockMongoCollection([]) for _ in range(4))
+
+    ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec, raw_cards=raw)
+    counts = ingest_cards(
+        [make_card("1", "Shock")], DATE, cards, stocks, edhrec, raw_cards=raw
+    )
+    assert counts["unchanged"] == 1
+    assert len(raw.bulk_write_calls) == 1
+
+    counts = ingest_cards(
+        [make_card("1", "Shock", purchase_uris={"tcgplayer": "https://tcg/new"})],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        raw_cards=raw,
+    )
+
+    assert counts["updated"] == 1
+    assert "purchase_uris" not in cards.find_one({"id": "1"})
+    assert raw.find_one({"_id": "1"})["purchase_uris"] == {
+        "tcgplayer": "https://tcg/new"
+    }
+
+
+@pytest.mark.unit
+def test_switching_to_lean_trims_stored_cards(lean, monkeypatch):
+    """Test that cards stored with the full profile are trimmed once."""
+    cards, stocks, edhrec = (MockMongoCollection([]) for _ in range(3))
+    monkeypatch.setattr("tasks.normalize.STORAGE_PROFILE", "full")
+    ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec)
+    assert "purchase_uris" in cards.find_one({"id": "1"})
+
+    monkeypatch.setattr("tasks.normalize.STORAGE_PROFILE", "lean")
+    counts = ingest_cards([make_card("1", "Shock")], DATE, cards, stocks, edhrec)
+
+    assert counts["updated"] == 1
+    stored = cards.find_one({"id": "1"})
+    assert "purchase_uris" not in stored
+    assert "prints_search_uri" not in stored
+
+
+@pytest.mark.unit
+def test_sets_rebuilt_from_lean_cards(lean):
+    """Test that lean cards keep the fields the set documents group."""
+    cards, stocks, edhrec = (MockMongoCollection([]) for _ in range(3))
+    ingest_cards(
+        [
+            make_card(
+                "1",
+                "Shock",
+                set_name="Limited Edition Alpha",
+                set_type="core",
+                released_at="1993-08-05",
+            )
+        ],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+    )
+
+    assert build_set_documents(cards) == [
+        {
+            "_id": "lea",
+            "code": "lea",
+            "name": "Limited Edition Alpha",
+            "released_at": "1993-08-05",
+            "set_type": "core",
+            "card_count": 1,
+        }
+    ]
@@ -0,0 +1,201 @@
+"""Unit tests for tasks.sync module.
+
+Tests the merge-join synchronization against the in-memory MongoDB mock.
+"""
+
+from datetime import datetime
+
+import pytest
+from pymongo import DeleteOne
+
+from tasks.history import read_history
+from tasks.normalize import normalize_card
+from tasks.sync import merge_join, sync_cards
+from tests.mocks.mongodb import MockMongoCollection
+
+DATE = datetime(2025, 1, 1)
+NEXT_DATE = datetime(2025, 1, 2)
+
+
+def make_card(card_id: str, name: str, **fields) -> dict:
+    """Build a minimal Scryfall-like card."""
+    return {
+        "id": card_id,
+        "name": name,
+        "prices": {"usd": "1.50", "eur": None},
+        "edhrec_rank": 100,
+        **fields,
+    }
+
+
+def stored_card(card_id: str, name: str, **fields) -> dict:
+    """Build a card as written by a previous sync."""
+    document = make_card(card_id, name, **fields)
+    normalize_card(document)
+    return {"_id": f"db-{card_id}", **document}
+
+
+@pytest.fixture(autouse=True)
+def in_process_normalization(monkeypatch):
+    """Normalize in the test process."""
+    monkeypatch.setattr("tasks.sync.WORKERS", 0)
+
+
+@pytest.fixture
+def collections():
+    """Cards, prices and EDHREC mock collections."""
+    return (
+        MockMongoCollection([], "cards"),
+        MockMongoCollection([], "card_stocks_monthly"),
+        MockMongoCollection([], "edhrec_monthly"),
+    )
+
+
+@pytest.mark.unit
+def test_merge_join_outer_join():
+    """Test that keys missing on either side are paired with None."""
+    pairs = list(
+        merge_join([1, 2, 4], [2, 3, 4, 5], lambda item: item, lambda item: item)
+    )
+
+    assert pairs == [(1, None), (2, 2), (None, 3), (4, 4), (None, 5)]
+
+
+@pytest.mark.unit
+def test_merge_join_rejects_unsorted_input():
+    """Test that an unsorted side raises instead of producing wrong pairs."""
+    with pytest.raises(ValueError, match="left side is not sorted"):
+        list(merge_join([2, 1], [], lambda item: item, lambda item: item))
+
+
+@pytest.mark.unit
+def test_sync_inserts_updates_and_deletes(collections):
+    """Test that each id is inserted, updated, kept or deleted."""
+    cards, stocks, edhrec = collections
+    for document in (
+        stored_card("a", "Kept"),
+        stored_card("b", "Shock", cmc=1),
+        stored_card("c", "Gone"),
+    ):
+        cards.insert_one(document)
+
+    counts = sync_cards(
+        [
+            make_card("a", "Kept"),
+            make_card("b", "Shock", cmc=2),
+            make_card("d", "New"),
+        ],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+    )
+
+    assert counts == {
+        "cards": 3,
+        "inserted": 1,
+        "updated": 1,
+        "unchanged": 1,
+        "deleted": 1,
+        "prices_written": 3,
+        "edhrec_written": 3,
+    }
+    stored = {card["id"]: card for card in cards.find({})}
+    assert sorted(stored) == ["a", "b", "d"]
+    assert stored["b"]["cmc"] == 2
+    assert stored["b"]["_id"] == "db-b"
+    assert read_history(stocks, "d") == [
+        {"date": DATE, "value": {"usd": 1.5, "eur": None}}
+    ]
+
+
+@pytest.mark.unit
+def test_sync_writes_in_fixed_size_batches(collections):
+    """Test that operations are sent once, in batches of batch_size."""
+    cards, stocks, edhrec = collections
+    for index in range(3):
+        cards.insert_one(stored_card(f"old-{index}", "Old"))
+
+    sync_cards(
+        [make_card(f"new-{index}", "New") for index in range(4)],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        batch_size=2,
+    )
+
+    operations = [op for batch in cards.bulk_write_calls for op in batch]
+    assert all(len(batch) <= 2 for batch in cards.bulk_write_calls)
+    assert len(operations) == 7
+    assert sum(isinstance(op, DeleteOne) for op in operations) == 3
+    assert sorted(card["id"] for card in cards.find({})) == [
+        f"new-{index}" for index in range(4)
+    ]
+
+
+@pytest.mark.unit
+def test_sync_tombstones_and_restores(collections):
+    """Test that missing cards are flagged and cleared when they come back."""
+    cards, stocks, edhrec = collections
+    cards.insert_one(stored_card("a", "Shock"))
+
+    counts = sync_cards([], DATE, cards, stocks, edhrec, delete_mode="tombstone")
+    assert counts["tombstoned"] == 1
+    assert cards.find_one({"id": "a"})["deleted_at"] == DATE
+
+    counts = sync_cards([], NEXT_DATE, cards, stocks, edhrec, delete_mode="tombstone")
+    assert counts["tombstoned"] == 0
+    assert cards.find_one({"id": "a"})["deleted_at"] == DATE
+
+    counts = sync_cards(
+        [make_card("a", "Shock")],
+        NEXT_DATE,
+        cards,
+        stocks,
+        edhrec,
+        delete_mode="tombstone",
+    )
+    assert counts["updated"] == 1
+    assert "deleted_at" not in cards.find_one({"id": "a"})
+
+
+@pytest.mark.unit
+def test_sync_rejects_unknown_delete_mode(collections):
+    """Test that an unknown delete mode is refused before writing."""
+    with pytest.raises(ValueError, match="delete_mode"):
+        sync_cards([], DATE, *collections, delete_mode="archive")
+
+
+@pytest.mark.unit
+def test_sync_refreshes_oracle_cards(collections):
+    """Test that the oracles of inserted and deleted printings are rebuilt."""
+    cards, stocks, edhrec = collections
+    oracle_cards = MockMongoCollection([], "oracle_cards")
+    cards.insert_one(stored_card("a", "Shock", oracle_id="o1", lang="en"))
+    sync_cards(
+        [make_card("a", "Shock", oracle_id="o1", lang="en")],
+        DATE,
+        cards,
+        stocks,
+        edhrec,
+        oracle_cards=oracle_cards,
+    )
+    # The first sync builds the empty collection
+    assert oracle_cards.find_one({"_id": "o1:en"})["printings"] == ["a"]
+
+    counts = sync_cards(
+        [
+            make_card("b", "Shock", oracle_id="o1", lang="en"),
+            make_card("c", "Opt", oracle_id="o2", lang="en"),
+        ],
+        NEXT_DATE,
+        cards,
+        stocks,
+        edhrec,
+        oracle_cards=oracle_cards,
+    )
+
+    assert counts["oracles_written"] == 2
+    assert oracle_cards.find_one({"_id": "o1:en"})["printings"] == ["b"]
+    assert oracle_cards.find_one({"_id": "o2:en"})["edhrec_rank"] == 100
@@ -0,0 +1,94 @@
+"""Unit tests for tasks.synthetic_cards module.
+
+Tests the shape, determinism and revisions of the generated datasets.
+"""
+
+from collections import Counter
+
+import ijson
+import pytest
+
+from tasks.bulk_stream import open_replay
+from tasks.normalize import normalize_card
+from tasks.synthetic_cards import (
+    DOUBLE_FACED_LAYOUTS,
+    MULTI_FACED_LAYOUTS,
+    generate_cards,
+    write_dataset,
+)
+
+COUNT = 2000
+
+
+@pytest.fixture(scope="module")
+def cards():
+    """Base revision of a dataset."""
+    return list(generate_cards(COUNT, seed=7))
+
+
+@pytest.mark.unit
+def test_generation_is_deterministic(cards):
+    """Test that the same seed gives the same cards."""
+    assert list(generate_cards(50, seed=7)) == list(generate_cards(50, seed=7))
+    assert list(generate_cards(50, seed=7)) != list(generate_cards(50, seed=8))
+    assert len({card["id"] for card in cards}) == COUNT
+
+
+@pytest.mark.unit
+def test_cards_vary_layouts_and_languages(cards):
+    """Test that layouts, faces and languages are mixed."""
+    layouts = Counter(card["layout"] for card in cards)
+    languages = Counter(card["lang"] for card in cards)
+
+    assert layouts["normal"] > COUNT / 2
+    assert MULTI_FACED_LAYOUTS <= set(layouts)
+    assert len(languages) >= 10
+    for card in cards:
+        assert ("card_faces" in card) == (card["layout"] in MULTI_FACED_LAYOUTS)
+        if card["layout"] in DOUBLE_FACED_LAYOUTS:
+            assert "image_uris" not in card
+            assert all("image_uris" in face for face in card["card_faces"])
+        if card["lang"] != "en":
+            assert "printed_name" in card
+
+
+@pytest.mark.unit
+def test_printings_share_oracle_fields(cards):
+    """Test that printings of an oracle have the same oracle fields."""
+    by_oracle = {}
+    for card in cards:
+        by_oracle.setdefault(card["oracle_id"], set()).add(
+            (card["name"], card["type_line"], card["layout"])
+        )
+
+    assert len(by_oracle) == COUNT // 4
+    assert all(len(fields) == 1 for fields in by_oracle.values())
+
+
+@pytest.mark.unit
+def test_revision_changes_a_fraction_of_cards(cards):
+    """Test that a revision only changes the requested fraction of cards."""
+    revised = list(generate_cards(COUNT, seed=7, revision=1, change_fraction=0.1))
+
+    changed = [
+        (before, after) for before, after in zip(cards, revised) if before != after
+    ]
+    assert 0.07 * COUNT < len(changed) < 0.13 * COUNT
+    for before, after in changed:
+        assert before["id"] == after["id"]
+        assert (
+            normalize_card(dict(before)).content_hash
+            != normalize_card(dict(after)).content_hash
+        )
+
+
+@pytest.mark.unit
+def test_write_dataset_gzip_roundtrip(tmp_path):
+    """Test that a written dataset is read back by the ingest."""
+    path = str(tmp_path / "cards.json.gz")
+
+    assert write_dataset(path, generate_cards(30)) == 30
+    with open_replay(path) as file:
+        read = list(ijson.items(file, "item", use_float=True))
+
+    assert read == list(generate_cards(30))
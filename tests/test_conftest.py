@@ -45,14 +45,14 @@ def test_test_client_fixture_overrides_dependencies(test_client):
 @pytest.mark.integration
 def test_test_client_fixture_clears_overrides(mock_cards_collection):
     """Test that test_client fixture clears dependency overrides after test."""
-    from api.helpers.database import get_cards_collection
+    from api.helpers.database import get_async_cards_collection
     from api.main import app
 
     # Before using fixture, overrides should be empty
     initial_overrides = len(app.dependency_overrides)
 
     # Use test client fixture (simulate what the fixture does)
-    app.dependency_overrides[get_cards_collection] = lambda: mock_cards_collection
+    app.dependency_overrides[get_async_cards_collection] = lambda: mock_cards_collection
     assert len(app.dependency_overrides) == initial_overrides + 1
 
     # Clean up (simulate what fixture does)
@@ -1,10 +1,12 @@
 "use client";
 
 import Image from "next/image";
+import { useEffect, useState } from "react";
 import { Badge } from "@/components/ui/badge";
 import { Dialog, DialogContent, DialogHeader, DialogTitle } from "@/components/ui/dialog";
 import { ScrollArea } from "@/components/ui/scroll-area";
-import type { OracleCard } from "@/lib/api";
+import { Button } from "@/components/ui/button";
+import { getPrintings, type OracleCard, type PrintedCard } from "@/lib/api";
 
 interface CardDetailsDialogProps {
   card: OracleCard;
@@ -14,6 +16,31 @@ interface CardDetailsDialogProps {
 
 export function CardDetailsDialog({ card, open, onOpenChange }: CardDetailsDialogProps) {
   const thumbnail = card.thumbnail || card.faces_thumbnails?.[0];
+  const oracleId = card._id ?? card.id;
+  const [printings, setPrintings] = useState<PrintedCard[]>([]);
+  const [cursor, setCursor] = useState<string | null>(null);
+  const [loadingPrintings, setLoadingPrintings] = useState(false);
+
+  // Search results hold no printings, fetch them when the dialog opens
+  const loadPrintings = async (from: string | null) => {
+    setLoadingPrintings(true);
+    try {
+      const page = await getPrintings(oracleId, from);
+      setPrintings((previous) => (from ? [...previous, ...page.cards] : page.cards));
+      setCursor(page.cursor);
+    } catch (error) {
+      console.error(error);
+    } finally {
+      setLoadingPrintings(false);
+    }
+  };
+
+  // biome-ignore lint/correctness/useExhaustiveDependencies: reload on a new card only
+  useEffect(() => {
+    if (open && oracleId) {
+      loadPrintings(null);
+    }
+  }, [open, oracleId]);
 
   return (
     <Dialog open={open} onOpenChange={onOpenChange}>
@@ -142,14 +169,14 @@ export function CardDetailsDialog({ card, open, onOpenChange }: CardDetailsDialo
               </div>
 
               {/* All Printings */}
-              {card.cards && card.cards.length > 0 && (
+              {printings.length > 0 && (
                 <div>
                   <h3 className="font-semibold text-sm text-muted-foreground mb-2">
-                    All Printings ({card.cards.length})
+                    All Printings ({card.card_count ?? printings.length})
                   </h3>
                   <ScrollArea className="h-48 rounded border p-4">
                     <div className="space-y-3">
-                      {card.cards.map((printing, i) => (
+                      {printings.map((printing, i) => (
                         <div
                           key={`${printing.id}-${i}`}
                           className="flex items-start gap-3 pb-3 border-b last:border-0"
@@ -176,6 +203,16 @@ export function CardDetailsDialog({ card, open, onOpenChange }: CardDetailsDialo
                           </div>
                         </div>
                       ))}
+                      {cursor && (
+                        <Button
+                          variant="outline"
+                          size="sm"
+                          disabled={loadingPrintings}
+                          onClick={() => loadPrintings(cursor)}
+                        >
+                          {loadingPrintings ? "Loading..." : "Load more printings"}
+                        </Button>
+                      )}
                     </div>
                   </ScrollArea>
                 </div>
@@ -1,5 +1,5 @@
 import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
-import { type CardFilter, getAllSets, searchCards } from "./api";
+import { type CardFilter, getAllSets, getPrintings, searchCards } from "./api";
 
 // Mock fetch globally
 const mockFetch = vi.fn();
@@ -167,6 +167,40 @@ describe("api", () => {
     });
   });
 
+  describe("getPrintings", () => {
+    it("should fetch a page of printings of an oracle card", async () => {
+      const mockResponse = {
+        cards: [{ id: "1", name: "Black Lotus", set: "lea", set_name: "Alpha" }],
+        cursor: "1993-08-05|1",
+        has_more: true,
+      };
+
+      mockFetch.mockResolvedValueOnce({
+        ok: true,
+        json: async () => mockResponse,
+      });
+
+      const result = await getPrintings("oracle-1", "1993-08-05|0");
+
+      expect(mockFetch).toHaveBeenCalledWith(
+        "http://localhost:8000/cards/oracle/oracle-1/printings?page_count=20&cursor=1993-08-05%7C0",
+        expect.objectContaining({ method: "GET" })
+      );
+      expect(result).toEqual(mockResponse);
+    });
+
+    it("should throw error when fetch fails", async () => {
+      mockFetch.mockResolvedValueOnce({
+        ok: false,
+        statusText: "Not Found",
+      });
+
+      await expect(getPrintings("missing")).rejects.toThrow(
+        "Failed to fetch printings: Not Found"
+      );
+    });
+  });
+
   describe("getAllSets", () => {
     it("should fetch all sets successfully", async () => {
       const mockResponse = {
@@ -11,6 +11,7 @@ export interface CardFilter {
 }
 
 export interface OracleCard {
+  _id?: string; // Oracle id, as returned by the API
   id: string;
   name: string;
   card_text?: string;
@@ -25,7 +26,6 @@ export interface OracleCard {
   card_count?: number;
   edhrec_rank?: number;
   penny_rank?: number;
-  cards?: PrintedCard[];
 }
 
 export interface PrintedCard {
@@ -47,6 +47,12 @@ export interface SearchResponse {
   has_more: boolean;
 }
 
+export interface PrintingsResponse {
+  cards: PrintedCard[];
+  cursor: string | null;
+  has_more: boolean;
+}
+
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || "http://localhost:8000";
 
 export async function searchCards(
@@ -124,6 +130,33 @@ export async function searchCards(
   return response.json();
 }
 
+export async function getPrintings(
+  oracleId: string,
+  cursor?: string | null
+): Promise<PrintingsResponse> {
+  const params = new URLSearchParams({ page_count: "20" });
+
+  if (cursor) {
+    params.append("cursor", cursor);
+  }
+
+  const response = await fetch(
+    `${API_BASE_URL}/cards/oracle/${encodeURIComponent(oracleId)}/printings?${params.toString()}`,
+    {
+      method: "GET",
+      headers: {
+        "Content-Type": "application/json",
+      },
+    }
+  );
+
+  if (!response.ok) {
+    throw new Error(`Failed to fetch printings: ${response.statusText}`);
+  }
+
+  return response.json();
+}
+
 export async function getAllSets(): Promise<string[]> {
   const response = await fetch(`${API_BASE_URL}/sets`, {
     method: "GET",